@@ -2,6 +2,7 @@ import flet as ft
 import asyncio
 import threading
 import json
+import math
 import os
 import warnings
 from pynput import keyboard
@@ -17,6 +18,7 @@ from utils import (
 
 import sys
 import subprocess
+import multiprocessing
 
 from pathlib import Path
 
@@ -57,6 +59,7 @@ def load_config():
             "yaml": True,
             "uuid": True,
             "cidr": True,
+            "logs": True,
             "regex": True,
             "cert": True,
             "sslaudit": True,
@@ -224,7 +227,7 @@ class SettingsDialog(ft.AlertDialog):
         labels = {
             "epoch": "Epoch Converter", "json": "JSON Tools", "secret": "Secret Decoder",
             "jwt": "JWT Inspector", "cron": "Cron Visualizer", "yaml": "YAML <-> JSON",
-            "uuid": "UUID & Hash", "cidr": "CIDR Calculator", "regex": "Regex Tester",
+            "uuid": "UUID & Hash", "cidr": "CIDR Calculator", "logs": "Log Analytics", "regex": "Regex Tester",
             "cert": "Certificate Decoder", "network": "Network Tools", "sslaudit": "SSL Site Auditor",
             "mac": "MAC Lookup", "k8sarch": "K8s Architect", "diff": "Unified Diff", "tfhcl": "Terraform Formatter",
             "units": "Units Converter", "iam": "IAM Simulator"
@@ -484,7 +487,7 @@ async def main(page: ft.Page):
             ttl_output.color = ft.Colors.BLUE_400
         page.update()
 
-    tab_time = ft.Container(
+    time_single_view = ft.Container(
         content=ft.Column([
             ft.Row([
                 # Col 1: Epoch to Human
@@ -530,7 +533,205 @@ async def main(page: ft.Page):
                 ], expand=True, spacing=10),
             ], spacing=20, vertical_alignment=ft.CrossAxisAlignment.START)
         ]),
-        padding=15
+        padding=0
+    )
+
+    # Log timestamp normalizer: one detected format, one cached parser for the whole stream
+    tn_path = ft.TextField(label="Path to Log File (.gz ok)", expand=True, text_size=12, height=40)
+    tn_text = ft.TextField(label="...or paste log lines", multiline=True, min_lines=4, max_lines=8, text_size=12,
+                           text_style=ft.TextStyle(font_family="monospace"))
+    tn_fmt_dd = ft.Dropdown(label="Format", value="auto", width=150, text_size=12, options=[
+        ft.dropdown.Option("auto", "Auto-detect"), ft.dropdown.Option("iso8601", "ISO-8601"),
+        ft.dropdown.Option("kafka", "Kafka (,mmm)"), ft.dropdown.Option("nginx", "Nginx [dd/Mon]"),
+        ft.dropdown.Option("syslog", "Syslog"), ft.dropdown.Option("epoch", "Epoch s/ms/us/ns"),
+    ])
+    tn_unit_dd = ft.Dropdown(label="Unit", value="ms", width=100, text_size=12,
+                             options=[ft.dropdown.Option(u, u) for u in ("s", "ms", "us", "ns")])
+    tn_mode_dd = ft.Dropdown(label="Output", value="prefix", width=150, text_size=12,
+                             options=[ft.dropdown.Option("prefix", "Prefix epoch"), ft.dropdown.Option("replace", "Replace timestamp")])
+    tn_tz_in = ft.TextField(label="Zone for naive times", value="UTC", width=190, text_size=12, height=40)
+    tn_out_path = ft.TextField(label="Write to (optional)", expand=True, text_size=12, height=40)
+    tn_summary = ft.Text("", size=13, selectable=True)
+    tn_preview = ft.ListView(expand=True, spacing=1)
+
+    async def tn_normalize_click(e):
+        from utils import normalize_log_timestamps
+        path, text = (tn_path.value or "").strip(), tn_text.value
+        if not path and not text: return
+        tn_summary.value = "Normalizing..."
+        tn_summary.color = ft.Colors.GREY_400
+        page.update()
+        res = await asyncio.to_thread(
+            normalize_log_timestamps, text=None if path else text, path=path or None,
+            output_path=(tn_out_path.value or "").strip() or None, mode=tn_mode_dd.value, unit=tn_unit_dd.value,
+            default_tz=(tn_tz_in.value or "UTC").strip(), fmt=None if tn_fmt_dd.value == "auto" else tn_fmt_dd.value, preview=200,
+        )
+        tn_preview.controls.clear()
+        if "error" in res:
+            tn_summary.value = f"Error: {res['error']}"
+            tn_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+        speed = f" | {res['per_line_us']:.2f} µs/line" + (f", {res['speedup']:.0f}x faster than dateutil" if res["speedup"] else "")
+        tn_summary.value = (
+            f"Format: {res['format']} | {res['parsed']:,} of {res['lines']:,} lines stamped"
+            + (f" ({res['fallback']:,} via other formats)" if res["fallback"] else "")
+            + f" | {res['first'] or '-'} .. {res['last'] or '-'}{speed}"
+            + (f" | written to {res['output']}" if res["output"] else "")
+        )
+        tn_summary.color = ft.Colors.GREEN_400
+        for line in res["preview"]:
+            tn_preview.controls.append(ft.Text(line, size=11, font_family="monospace", selectable=True, no_wrap=True))
+        page.update()
+
+    time_normalize_view = ft.Column([
+        ft.Row([tn_path, tn_fmt_dd, tn_unit_dd, tn_mode_dd, tn_tz_in]),
+        tn_text,
+        ft.Row([tn_out_path, ft.Button("Normalize", icon=ft.Icons.SCHEDULE, on_click=tn_normalize_click)]),
+        tn_summary,
+        ft.Container(tn_preview, expand=True, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5),
+    ], spacing=12, expand=True, visible=False)
+
+    # Merge: k-way merge of several logs into one timeline
+    tm_sources = ft.TextField(label="Log Files (one per line: path or glob, optionally '| Zone/Name')", multiline=True,
+                              min_lines=3, max_lines=6, text_size=12, text_style=ft.TextStyle(font_family="monospace"),
+                              hint_text="/var/log/app/app.log\n/var/log/nginx/access.log*\n/var/log/syslog | Europe/Berlin")
+    tm_window_in = ft.TextField(label="Reorder Window (s)", value="5", width=150, text_size=12, height=40)
+    tm_label_cb = ft.Checkbox(label="Tag lines with file name", value=True)
+    tm_year_in = ft.TextField(label="Syslog Year", hint_text="this year", width=120, text_size=12, height=40)
+    tm_out_path = ft.TextField(label="Write merged log to (optional)", expand=True, text_size=12, height=40)
+    tm_summary = ft.Text("", size=13, selectable=True)
+    tm_files = ft.Column(spacing=2)
+    tm_preview = ft.ListView(expand=True, spacing=1)
+    tm_colors = [ft.Colors.CYAN_200, ft.Colors.AMBER_200, ft.Colors.GREEN_200, ft.Colors.PINK_200, ft.Colors.PURPLE_200, ft.Colors.ORANGE_200]
+
+    async def tm_merge_click(e):
+        from utils import merge_logs_by_time
+        sources = []
+        for row in (tm_sources.value or "").splitlines():
+            if row.strip():
+                spec, _, tz = row.partition("|")
+                sources.append((spec.strip(), tz.strip() or None))
+        if not sources: return
+        try:
+            window = float(tm_window_in.value or 0)
+            year = int(tm_year_in.value) if (tm_year_in.value or "").strip() else None
+        except ValueError:
+            tm_summary.value = "Error: the reorder window must be a number of seconds and the year an integer"
+            tm_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+        tm_summary.value = "Merging..."
+        tm_summary.color = ft.Colors.GREY_400
+        page.update()
+        res = await asyncio.to_thread(merge_logs_by_time, sources, output_path=(tm_out_path.value or "").strip() or None,
+                                      window_s=window, label=tm_label_cb.value, year=year, preview=1000)
+        tm_files.controls.clear()
+        tm_preview.controls.clear()
+        if "error" in res:
+            tm_summary.value = f"Error: {res['error']}"
+            tm_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+        tm_summary.value = (
+            f"{res['entries']:,} entries ({res['lines']:,} lines) from {len(res['files'])} file(s) | {res['first'] or '-'} .. {res['last'] or '-'} "
+            f"| {res['elapsed']:.2f}s" + (f" | {res['late']:,} entries later than the {res['window_s']:g}s window" if res["late"] else "")
+            + (f" | written to {res['output']}" if res["output"] else "")
+        )
+        tm_summary.color = ft.Colors.AMBER_300 if res["late"] else ft.Colors.GREEN_400
+        for i, f in enumerate(res["files"]):
+            tm_files.controls.append(ft.Text(
+                f"{os.path.basename(f['path'])}: {f['format']} in {f['tz'] or 'UTC'} | {f['entries']:,} entries, "
+                f"{f['continuations']:,} continuation lines" + (f", {f['late']:,} late" if f["late"] else ""),
+                size=12, color=tm_colors[i % len(tm_colors)]
+            ))
+        for row in res["preview"]:
+            tm_preview.controls.append(ft.Text(row["text"], size=11, font_family="monospace", selectable=True, no_wrap=True,
+                                               color=tm_colors[row["source"] % len(tm_colors)]))
+        page.update()
+
+    time_merge_view = ft.Column([
+        tm_sources,
+        ft.Row([tm_window_in, tm_year_in, tm_label_cb, tm_out_path, ft.Button("Merge", icon=ft.Icons.MERGE, on_click=tm_merge_click)]),
+        tm_summary,
+        tm_files,
+        ft.Container(tm_preview, expand=True, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5),
+    ], spacing=12, expand=True, visible=False)
+
+    # Column: bulk epoch conversion of a pasted column
+    tc_input = ft.TextField(label="Epoch Column (one value per line)", multiline=True, min_lines=12, max_lines=12, width=260,
+                            text_size=12, text_style=ft.TextStyle(font_family="monospace"))
+    tc_tz_in = ft.TextField(label="Local Zone", hint_text="system", width=180, text_size=12, height=40)
+    tc_prec_dd = ft.Dropdown(label="Precision", value="auto", width=120, text_size=12,
+                             options=[ft.dropdown.Option(u, u) for u in ("auto", "s", "ms", "us", "ns")])
+    tc_summary = ft.Text("", size=13, selectable=True)
+    tc_output = ft.TextField(multiline=True, read_only=True, min_lines=12, max_lines=12, expand=True, text_size=12,
+                             text_style=ft.TextStyle(font_family="monospace"))
+    tc_state = {"table": ""}
+
+    async def tc_convert_click(e):
+        from utils import convert_epoch_column
+        if not tc_input.value: return
+        res = await asyncio.to_thread(convert_epoch_column, tc_input.value, (tc_tz_in.value or "").strip() or None, tc_prec_dd.value)
+        if "error" in res:
+            tc_summary.value = f"Error: {res['error']}"
+            tc_summary.color = ft.Colors.RED_400
+            tc_output.value = ""
+            tc_state["table"] = ""
+            page.update()
+            return
+        tc_state["table"] = res["table"]
+        lines = res["table"].split("\n", 2001)
+        tc_output.value = "\n".join(lines[:2001]) + (f"\n... {res['count'] - 2000:,} more rows (use Copy)" if res["count"] > 2000 else "")
+        units = ", ".join(f"{c:,} {u}" for u, c in res["units"].items() if c)
+        tc_summary.value = (
+            f"{res['count']:,} values ({units}) in {res['elapsed'] * 1000:,.0f} ms ({res['engine']}), shown at {res['precision']} precision"
+            + (f" | {res['invalid_count']:,} invalid: {', '.join(res['invalid'][:5])}" if res["invalid_count"] else "")
+        )
+        tc_summary.color = ft.Colors.AMBER_300 if res["invalid_count"] else ft.Colors.GREEN_400
+        page.update()
+
+    async def tc_copy_click(e):
+        await handle_copy_click(e, tc_state["table"])
+
+    time_column_view = ft.Column([
+        ft.Row([tc_tz_in, tc_prec_dd, ft.Button("Convert Column", icon=ft.Icons.TABLE_ROWS, on_click=tc_convert_click),
+                ft.IconButton(ft.Icons.COPY, tooltip="Copy table", on_click=tc_copy_click)]),
+        tc_summary,
+        ft.Row([tc_input, tc_output], vertical_alignment=ft.CrossAxisAlignment.START),
+    ], spacing=12, expand=True, visible=False)
+
+    time_views = {
+        "single": time_single_view,
+        "normalize": time_normalize_view,
+        "merge": time_merge_view,
+        "column": time_column_view,
+    }
+
+    def time_mode_change(e):
+        mode = list(time_mode_toggle.selected)[0]
+        for key, view in time_views.items():
+            view.visible = (key == mode)
+        page.update()
+
+    time_mode_toggle = ft.SegmentedButton(
+        segments=[
+            ft.Segment(value="single", label=ft.Text("Converters"), icon=ft.Icons.ACCESS_TIME),
+            ft.Segment(value="normalize", label=ft.Text("Normalize Log"), icon=ft.Icons.SCHEDULE),
+            ft.Segment(value="merge", label=ft.Text("Merge Logs"), icon=ft.Icons.MERGE),
+            ft.Segment(value="column", label=ft.Text("Epoch Column"), icon=ft.Icons.TABLE_ROWS),
+        ],
+        selected=["single"],
+        allow_multiple_selection=False,
+        on_change=time_mode_change
+    )
+
+    tab_time = ft.Container(
+        content=ft.Column([
+            ft.Row([time_mode_toggle], alignment=ft.MainAxisAlignment.END),
+            *time_views.values(),
+        ], spacing=15, expand=True),
+        padding=15, expand=True
     )
 
     # --- Tab 2: JSON Tools ---
@@ -859,6 +1060,90 @@ async def main(page: ft.Page):
         hash_sha256.value = res['sha256']
         page.update()
 
+    tid_input = ft.TextField(label="Paste log lines / IDs", multiline=True, min_lines=3, max_lines=6, text_size=12, text_style=ft.TextStyle(font_family="monospace"))
+    tid_path = ft.TextField(label="...or Path to Log File", expand=True, text_size=12, height=40)
+    tid_out_path = ft.TextField(label="Export sorted CSV to (optional)", expand=True, text_size=12, height=40)
+    tid_summary = ft.Text("", size=13, selectable=True)
+    tid_res = ft.ListView(spacing=2, height=250)
+
+    async def decode_tid_click(e):
+        from utils import decode_time_ordered_ids
+        if not tid_input.value and not tid_path.value: return
+        tid_summary.value = "Scanning..."
+        tid_summary.color = ft.Colors.GREY_400
+        tid_res.controls.clear()
+        page.update()
+        res = await asyncio.to_thread(
+            decode_time_ordered_ids,
+            text=None if tid_path.value else tid_input.value,
+            path=tid_path.value or None,
+            output_path=tid_out_path.value or None
+        )
+        if "error" in res:
+            tid_summary.value = f"Error: {res['error']}"
+            tid_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        tid_summary.value = (
+            f"{res['count']:,} IDs ({res['ulid']:,} ULID, {res['uuid7']:,} UUIDv7)"
+            + (f", {res['rejected']:,} look-alikes ignored" if res["rejected"] else "") + "\n"
+            f"Earliest: {res['first']}\nLatest:   {res['last']}\n"
+            f"Span: {res['span_ms'] / 1000:,.3f} s"
+            + (f"\nShowing first {len(res['rows'])} (full listing in {res['output']})" if res["output"] else
+               f"\nShowing first {len(res['rows'])}" if res["truncated"] else "")
+        )
+        tid_summary.color = ft.Colors.GREEN_400
+        for r in res["rows"]:
+            tid_res.controls.append(ft.Row([
+                ft.Container(ft.Text(r["iso"], size=11, font_family="monospace"), width=260),
+                ft.Container(ft.Text(r["type"], size=11, color=ft.Colors.TEAL_200), width=60),
+                ft.Container(ft.Text(f"L{r['line']}", size=11, color=ft.Colors.GREY_500), width=70),
+                ft.Text(r["id"], size=11, font_family="monospace", selectable=True),
+            ]))
+        page.update()
+
+    dup_path = ft.TextField(label="Path to ID List (one per line)", expand=True, text_size=12, height=40)
+    dup_mode_dd = ft.Dropdown(
+        label="Mode",
+        options=[
+            ft.dropdown.Option(key="bloom", text="Bloom + Verify"),
+            ft.dropdown.Option(key="sort", text="External Sort (exact)"),
+        ],
+        value="bloom",
+        width=220,
+        text_size=12
+    )
+    dup_summary = ft.Text("", size=13, selectable=True)
+    dup_res = ft.ListView(spacing=2, height=200)
+
+    async def find_dupes_click(e):
+        from utils import find_duplicate_ids
+        if not dup_path.value: return
+        dup_summary.value = "Scanning..."
+        dup_summary.color = ft.Colors.GREY_400
+        dup_res.controls.clear()
+        page.update()
+        res = await asyncio.to_thread(find_duplicate_ids, dup_path.value, dup_mode_dd.value)
+        if "error" in res:
+            dup_summary.value = f"Error: {res['error']}"
+            dup_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        dup_summary.value = (
+            f"{res['total']:,} IDs scanned, {res['duplicate_ids']:,} duplicated ({res['duplicate_lines']:,} lines)\n"
+            f"{res['detail']}"
+        )
+        dup_summary.color = ft.Colors.GREEN_400 if res["duplicate_ids"] == 0 else ft.Colors.AMBER_300
+        for d in res["duplicates"]:
+            dup_res.controls.append(ft.Row([
+                ft.Container(ft.Text(f"x{d['count']}", size=11, color=ft.Colors.AMBER_300), width=50),
+                ft.Container(ft.Text(d["id"], size=11, font_family="monospace", selectable=True), expand=True),
+                ft.Text("lines " + ", ".join(str(n) for n in d["lines"][:10]) + ("..." if d["count"] > 10 else ""), size=11, color=ft.Colors.GREY_500),
+            ]))
+        page.update()
+
     tab_uuid = ft.Container(
         content=ft.Column([
             ft.Text("UUID & Hash Generator", size=20, weight="bold", color=ft.Colors.TEAL_200),
@@ -876,7 +1161,27 @@ async def main(page: ft.Page):
                 hash_input,
                 ft.Button("Calculate", icon=ft.Icons.CALCULATE, on_click=calc_hash_click),
             ]),
-            hash_md5, hash_sha1, hash_sha256
+            hash_md5, hash_sha1, hash_sha256,
+
+            ft.Divider(),
+            ft.Row([
+                ft.Text("Time-Ordered ID Decoder (ULID / UUIDv7):", weight="bold", size=16),
+                ft.Button("Decode & Sort", icon=ft.Icons.SORT, on_click=decode_tid_click),
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            tid_input,
+            ft.Row([tid_path, tid_out_path]),
+            tid_summary,
+            tid_res,
+
+            ft.Divider(),
+            ft.Text("Duplicate-ID Detector:", weight="bold", size=16),
+            ft.Row([
+                dup_path,
+                dup_mode_dd,
+                ft.Button("Find Duplicates", icon=ft.Icons.CONTENT_COPY, on_click=find_dupes_click),
+            ]),
+            dup_summary,
+            dup_res
         ], spacing=10, expand=True, scroll=ft.ScrollMode.AUTO),
         padding=20, expand=True
     )
@@ -891,7 +1196,7 @@ async def main(page: ft.Page):
         net = ipaddress.ip_network(f"0.0.0.0/{i}")
         mask_options.append(ft.dropdown.Option(key=f"/{i}", text=f"{net.netmask} /{i}"))
 
-    cidr_ip_in = ft.TextField(label="IP Address", value="49.206.128.42", expand=True)
+    cidr_ip_in = ft.TextField(label="IP Address (or IPv4/IPv6 CIDR)", value="49.206.128.42", expand=True)
     cidr_mask_in = ft.Dropdown(
         label="Subnet Mask",
         value="/30",
@@ -901,11 +1206,64 @@ async def main(page: ft.Page):
     
     cidr_metadata_grid = ft.Column(spacing=5, visible=False)
     cidr_sibling_table = ft.ListView(expand=True, spacing=2, visible=False)
+    cidr_sibling_page_size = 256
+    cidr_sibling_state = {"res": None, "page": 0}
+    cidr_sibling_page_lbl = ft.Text("", size=12, color=ft.Colors.GREY_400)
+    cidr_sibling_nav = ft.Row([
+        ft.IconButton(ft.Icons.FIRST_PAGE, tooltip="First", on_click=lambda e: show_sibling_page(0)),
+        ft.IconButton(ft.Icons.CHEVRON_LEFT, tooltip="Previous", on_click=lambda e: show_sibling_page(cidr_sibling_state["page"] - 1)),
+        cidr_sibling_page_lbl,
+        ft.IconButton(ft.Icons.CHEVRON_RIGHT, tooltip="Next", on_click=lambda e: show_sibling_page(cidr_sibling_state["page"] + 1)),
+        ft.IconButton(ft.Icons.LAST_PAGE, tooltip="Last", on_click=lambda e: show_sibling_page(-1)),
+    ], spacing=0, visible=False)
+
+    def show_sibling_page(page_no):
+        from utils import iter_sibling_subnets
+        import itertools
+        res = cidr_sibling_state["res"]
+        if not res or not res["sibling_parent"]: return
+        pages = -(-res["sibling_count"] // cidr_sibling_page_size)
+        if page_no < 0: page_no = pages - 1
+        page_no = max(0, min(page_no, pages - 1))
+        cidr_sibling_state["page"] = page_no
+        cidr_sibling_page_lbl.value = f"Page {page_no + 1:,} of {pages:,}"
+
+        prefix = int(res["cidr"][1:])
+        cidr_sibling_table.controls = [
+            ft.Text(f"{res['sibling_count']:,} possible {res['cidr']} networks in {res['sibling_parent']}", weight="bold", size=14, color=ft.Colors.CYAN_200),
+            ft.Container(
+                content=ft.Row([
+                    ft.Container(ft.Text("Network", weight="bold"), expand=2),
+                    ft.Container(ft.Text("Usable Range", weight="bold"), expand=4),
+                    ft.Container(ft.Text("Last" if res["version"] == 6 else "Broadcast", weight="bold"), expand=2),
+                ]),
+                bgcolor=ft.Colors.GREY_900,
+                padding=5
+            )
+        ]
+        # Only the visible page is ever generated
+        siblings = iter_sibling_subnets(res["sibling_parent"], prefix, start=page_no * cidr_sibling_page_size)
+        for sib in itertools.islice(siblings, cidr_sibling_page_size):
+            is_current = sib["net"] == res["network"]
+            cidr_sibling_table.controls.append(
+                ft.Container(
+                    content=ft.Row([
+                        ft.Container(ft.Text(sib["net"], size=12, color=ft.Colors.BLUE_200 if is_current else None), expand=2),
+                        ft.Container(ft.Text(sib["range"], size=12), expand=4),
+                        ft.Container(ft.Text(sib["broadcast"], size=12), expand=2),
+                    ]),
+                    padding=2
+                )
+            )
+        page.update()
     
     async def calc_cidr_click(e):
         from utils import calculate_cidr_advanced, get_ip_ownership
         if not cidr_ip_in.value: return
-        res = calculate_cidr_advanced(cidr_ip_in.value, cidr_mask_in.value)
+        ip_text = cidr_ip_in.value.strip()
+        # The mask dropdown only lists IPv4 prefixes; a bare IPv6 address is analysed as its /64
+        mask = "/64" if ":" in ip_text and "/" not in ip_text else cidr_mask_in.value
+        res = calculate_cidr_advanced(ip_text, mask)
         if "error" in res:
             page.snack_bar = ft.SnackBar(ft.Text(f"Error: {res['error']}"))
             page.snack_bar.open = True
@@ -918,12 +1276,12 @@ async def main(page: ft.Page):
             ("Network Address:", res["network"]),
             ("Usable Range:", res["range"]),
             ("Broadcast:", res["broadcast"]),
-            ("Total Hosts:", str(res["hosts_total"])),
-            ("Usable Hosts:", str(res["hosts_usable"])),
+            ("Total Hosts:", f"{res['hosts_total']:,}"),
+            ("Usable Hosts:", f"{res['hosts_usable']:,}"),
             ("Subnet Mask:", res["netmask"]),
             ("Wildcard Mask:", res["wildcard"]),
             ("Binary Mask:", res["mask_bin"]),
-            ("IP Class:", res["ip_class"]),
+            ("Address Class:" if res["version"] == 6 else "IP Class:", res["ip_class"]),
             ("IP Type:", res["ip_type"]),
         ]
 
@@ -941,74 +1299,742 @@ async def main(page: ft.Page):
             ("Hex ID:", res["hex_id"]),
             ("Binary ID:", res["binary_id"]),
             ("Reverse DNS:", res["reverse_dns"]),
-            ("mapped IPv6:", res["ipv4_mapped"]),
-            ("6to4 Prefix:", res["prefix_6to4"]),
         ])
+        if res["version"] == 6:
+            rows.extend([
+                ("Compressed:", res["compressed"]),
+                ("Exploded:", res["exploded"]),
+                ("EUI-64:", res["eui64"]),
+                ("Embedded IPv4:", res["embedded_ipv4"]),
+            ])
+        else:
+            rows.extend([
+                ("mapped IPv6:", res["ipv4_mapped"]),
+                ("6to4 Prefix:", res["prefix_6to4"]),
+            ])
         
         cidr_metadata_grid.controls = [
             ft.Row([
                 ft.Container(ft.Text(label, weight="bold", size=13), width=150),
-                ft.Text(val, size=13, selectable=True)
+                ft.Text(val, size=13, selectable=True, expand=True)
             ]) for label, val in rows
         ]
         cidr_metadata_grid.visible = True
 
-        # Build Sibling Table
-        cidr_sibling_table.controls = [
-            ft.Text(f"All Possible {res['cidr']} Networks for {res['ip'].rsplit('.', 1)[0]}.*", weight="bold", size=14, color=ft.Colors.CYAN_200),
+        # Build Sibling Table (open on the page holding the current network)
+        cidr_sibling_state["res"] = res
+        if res["sibling_parent"]:
+            cidr_sibling_nav.visible = res["sibling_count"] > cidr_sibling_page_size
+            cidr_sibling_table.visible = True
+            show_sibling_page(res["sibling_index"] // cidr_sibling_page_size)
+        else:
+            cidr_sibling_nav.visible = False
+            cidr_sibling_table.controls = [ft.Text(f"No enclosing parent block for {res['cidr']}", size=12, color=ft.Colors.GREY_500)]
+            cidr_sibling_table.visible = True
+            page.update()
+
+    # --- CIDR: Bulk Membership ---
+    bulk_cidrs_in = ft.TextField(label="CIDR List (allow-list / VPC blocks, one per line)", multiline=True, min_lines=8, max_lines=8, text_size=12, text_style=ft.TextStyle(font_family="monospace"), expand=1)
+    bulk_ip_path = ft.TextField(label="Path to IP List (one IP per line)", expand=True, text_size=12, height=40)
+    bulk_miss_path = ft.TextField(label="Write unmatched IPs to (optional)", expand=True, text_size=12, height=40)
+    bulk_summary = ft.Text("", size=13, selectable=True)
+    bulk_hits = ft.ListView(expand=True, spacing=2)
+    bulk_misses = ft.ListView(expand=True, spacing=2)
+
+    async def bulk_match_click(e):
+        from utils import match_ips_to_cidrs
+        if not bulk_cidrs_in.value or not bulk_ip_path.value: return
+        bulk_summary.value = "Matching..."
+        bulk_summary.color = ft.Colors.GREY_400
+        bulk_hits.controls.clear()
+        bulk_misses.controls.clear()
+        page.update()
+        res = await asyncio.to_thread(match_ips_to_cidrs, bulk_cidrs_in.value, bulk_ip_path.value, bulk_miss_path.value or None)
+        if "error" in res:
+            bulk_summary.value = f"Error: {res['error']}"
+            bulk_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        bulk_summary.value = (
+            f"{res['total']:,} IPs | {res['matched']:,} matched | {res['unmatched']:,} unmatched | {res['invalid']:,} invalid\n"
+            f"{res['cidrs']:,} CIDRs compiled into {res['intervals']:,} intervals ({res['engine']})"
+            + (f"\nSkipped invalid CIDRs: {', '.join(res['invalid_cidrs'][:10])}" if res["invalid_cidrs"] else "")
+        )
+        bulk_summary.color = ft.Colors.GREEN_400
+        for h in res["hits"]:
+            bulk_hits.controls.append(ft.Row([
+                ft.Container(ft.Text(h["cidr"], size=12, font_family="monospace"), expand=True),
+                ft.Text(f"{h['count']:,}", size=12, color=ft.Colors.CYAN_200 if h["count"] else ft.Colors.GREY_600),
+            ]))
+        for ip in res["unmatched_sample"]:
+            bulk_misses.controls.append(ft.Text(ip, size=12, font_family="monospace", selectable=True))
+        page.update()
+
+    # --- CIDR: Prefix List Tools ---
+    pl_list_a = ft.TextField(label="Prefix List A", multiline=True, min_lines=8, max_lines=8, text_size=12, text_style=ft.TextStyle(font_family="monospace"), expand=1)
+    pl_list_b = ft.TextField(label="Prefix List B (optional, for diff)", multiline=True, min_lines=8, max_lines=8, text_size=12, text_style=ft.TextStyle(font_family="monospace"), expand=1)
+    pl_summary = ft.Text("", size=13, selectable=True)
+    pl_aggregated = ft.ListView(expand=True, spacing=1)
+    pl_overlaps = ft.ListView(expand=True, spacing=1)
+    pl_diff = ft.ListView(expand=True, spacing=1)
+    pl_state = {"aggregated": []}
+
+    async def pl_analyze_click(e):
+        from utils import analyze_prefix_lists
+        if not pl_list_a.value: return
+        pl_summary.value = "Analyzing..."
+        pl_summary.color = ft.Colors.GREY_400
+        page.update()
+        res = await asyncio.to_thread(analyze_prefix_lists, pl_list_a.value, pl_list_b.value)
+        pl_aggregated.controls.clear()
+        pl_overlaps.controls.clear()
+        pl_diff.controls.clear()
+        if "error" in res:
+            pl_summary.value = f"Error: {res['error']}"
+            pl_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        pl_state["aggregated"] = res["aggregated"]
+        pl_summary.value = (
+            f"{res['input']:,} prefixes -> {len(res['aggregated']):,} aggregated | {res['overlap_count']:,} overlapping pairs"
+            + (f" | {len(res['invalid'])} invalid skipped" if res["invalid"] else "")
+        )
+        pl_summary.color = ft.Colors.GREEN_400
+        for c in res["aggregated"][:2000]:
+            pl_aggregated.controls.append(ft.Text(c, size=12, font_family="monospace", selectable=True))
+        for o in res["overlaps"]:
+            pl_overlaps.controls.append(ft.Text(f"{o['inner']}  in  {o['outer']}" if o["type"] == "contained" else f"{o['outer']}  ({o['type']})", size=12, font_family="monospace", color=ft.Colors.AMBER_300))
+        if res["diff"]:
+            sections = [
+                ("Added", res["diff"]["added"], ft.Colors.GREEN_400),
+                ("Removed", res["diff"]["removed"], ft.Colors.RED_400),
+                ("Newly Covered", res["diff"]["newly_covered"], ft.Colors.CYAN_300),
+                ("No Longer Covered", res["diff"]["no_longer_covered"], ft.Colors.ORANGE_300),
+            ]
+            for title, items, color in sections:
+                pl_diff.controls.append(ft.Text(f"{title} ({len(items):,})", weight="bold", size=12, color=color))
+                for c in items[:500]:
+                    pl_diff.controls.append(ft.Text(f"  {c}", size=12, font_family="monospace", color=color, selectable=True))
+        else:
+            pl_diff.controls.append(ft.Text("Provide List B to diff", size=12, color=ft.Colors.GREY_500))
+        page.update()
+
+    async def pl_copy_click(e):
+        await handle_copy_click(e, "\n".join(pl_state["aggregated"]))
+
+    def pl_panel(title, body, action=None, expand=1):
+        return ft.Container(
+            content=ft.Column([
+                ft.Row([ft.Text(title, weight="bold", color=ft.Colors.BLUE_200)] + ([action] if action else []), alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                ft.Divider(height=1),
+                body,
+            ], expand=True),
+            expand=expand, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
+        )
+
+    # --- CIDR: IPAM Free-Space Finder ---
+    fs_parent_in = ft.TextField(label="Parent Block", value="10.0.0.0/16", width=220)
+    fs_prefix_in = ft.TextField(label="Place Prefix", value="/24", width=120)
+    fs_used_in = ft.TextField(label="Used IPs / Allocated Subnets (one per line)", multiline=True, min_lines=8, max_lines=8, text_size=12, text_style=ft.TextStyle(font_family="monospace"), expand=1)
+    fs_summary = ft.Text("", size=13, selectable=True)
+    fs_blocks = ft.ListView(expand=True, spacing=2)
+    fs_placement = ft.Column(spacing=8)
+
+    async def fs_find_click(e):
+        from utils import find_free_space
+        if not fs_parent_in.value: return
+        fs_summary.value = "Scanning..."
+        fs_summary.color = ft.Colors.GREY_400
+        page.update()
+        res = await asyncio.to_thread(find_free_space, fs_parent_in.value, fs_used_in.value, fs_prefix_in.value or None)
+        fs_blocks.controls.clear()
+        fs_placement.controls.clear()
+        if "error" in res:
+            fs_summary.value = f"Error: {res['error']}"
+            fs_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        fs_summary.value = (
+            f"{res['parent']} | {res['utilization']:.2f}% used | {res['free']:,} free addresses in {res['free_block_count']:,} blocks "
+            f"| largest {res['largest'] or '-'} | fragmentation {res['fragmentation']:.3f}"
+            + (f"\nIgnored outside parent: {', '.join(res['outside'][:10])}" if res["outside"] else "")
+            + (f"\nSkipped invalid: {', '.join(res['invalid'][:10])}" if res["invalid"] else "")
+        )
+        fs_summary.color = ft.Colors.GREEN_400
+        for b in res["free_blocks"]:
+            fs_blocks.controls.append(ft.Row([
+                ft.Container(ft.Text(b["cidr"], size=12, font_family="monospace", selectable=True), expand=True),
+                ft.Text(f"{b['size']:,}", size=12, color=ft.Colors.CYAN_200),
+            ]))
+        req = res["request"]
+        if req:
+            rows = [
+                ("Requested", f"/{req['prefix']}"),
+                ("Available", f"{req['fit_count']:,}"),
+                ("First-Fit", req["first_fit"] or "No space"),
+                ("Best-Fit", req["best_fit"] or "No space"),
+                ("Best-Fit Block", req["best_fit_block"] or "-"),
+            ]
+            for label, val in rows:
+                fs_placement.controls.append(ft.Row([
+                    ft.Text(label, size=12, color=ft.Colors.GREY_400, width=110),
+                    ft.Text(val, size=14, weight="bold", font_family="monospace", selectable=True),
+                ]))
+        page.update()
+
+    # --- CIDR: VLSM Planner ---
+    vlsm_super_in = ft.TextField(label="Supernet", value="10.0.0.0/16", width=220)
+    vlsm_req_in = ft.TextField(label="Requirements (e.g. 3 subnets of 500 hosts, 12 of 60, 40 of 10 dmz, 2 x /30 links)", multiline=True, min_lines=5, max_lines=5, text_size=12, text_style=ft.TextStyle(font_family="monospace"), expand=1)
+    vlsm_summary = ft.Text("", size=13, selectable=True)
+    vlsm_table = ft.ListView(expand=True, spacing=1)
+    vlsm_leftover = ft.ListView(expand=True, spacing=1)
+    vlsm_state = {"plan": None}
+    vlsm_cols = [("Name", 140), ("Network", 200), ("First Usable", 170), ("Last Usable", 170), ("Broadcast", 130), ("Hosts", 90), ("Usable", 90), ("Util", 60)]
+
+    def vlsm_row(values, color=None, weight=None):
+        return ft.Row([
+            ft.Text(v, size=12, width=w, font_family="monospace", color=color, weight=weight, no_wrap=True, selectable=True)
+            for v, (_, w) in zip(values, vlsm_cols)
+        ], spacing=8)
+
+    async def vlsm_plan_click(e):
+        from utils import plan_vlsm
+        if not vlsm_super_in.value or not vlsm_req_in.value: return
+        vlsm_summary.value = "Planning..."
+        vlsm_summary.color = ft.Colors.GREY_400
+        page.update()
+        res = await asyncio.to_thread(plan_vlsm, vlsm_super_in.value, vlsm_req_in.value)
+        vlsm_table.controls.clear()
+        vlsm_leftover.controls.clear()
+        if "error" in res:
+            vlsm_state["plan"] = None
+            vlsm_summary.value = f"Error: {res['error']}"
+            vlsm_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        vlsm_state["plan"] = res
+        vlsm_summary.value = (
+            f"{res['allocated_count']:,}/{res['requested']:,} subnets placed in {res['supernet']} | "
+            f"supernet {res['supernet_utilization']:.2f}% allocated | host efficiency {res['host_efficiency']:.1f}% | "
+            f"{res['leftover_size']:,} addresses left"
+            + (f"\nDid not fit: {', '.join(f['name'] for f in res['failed'][:10])}" if res["failed"] else "")
+            + (f"\nSkipped invalid: {', '.join(res['invalid'][:10])}" if res["invalid"] else "")
+        )
+        vlsm_summary.color = ft.Colors.ORANGE_300 if res["failed"] else ft.Colors.GREEN_400
+        vlsm_table.controls.append(vlsm_row([c for c, _ in vlsm_cols], ft.Colors.BLUE_200, "bold"))
+        for r in res["rows"][:2000]:
+            vlsm_table.controls.append(vlsm_row([
+                r["name"], r["cidr"], r["first"], r["last"], r["broadcast"] or "-",
+                f"{r['hosts']:,}", f"{r['usable']:,}", f"{r['utilization']:.0f}%",
+            ]))
+        for c in res["leftover"]:
+            vlsm_leftover.controls.append(ft.Text(c, size=12, font_family="monospace", selectable=True))
+        page.update()
+
+    async def vlsm_csv_click(e):
+        from utils import export_vlsm_plan
+        await handle_copy_click(e, export_vlsm_plan(vlsm_state["plan"], "csv") if vlsm_state["plan"] else "")
+
+    async def vlsm_json_click(e):
+        from utils import export_vlsm_plan
+        await handle_copy_click(e, export_vlsm_plan(vlsm_state["plan"], "json") if vlsm_state["plan"] else "")
+
+    # --- CIDR: Reverse Zone Generator ---
+    ptr_prefix_in = ft.TextField(label="Prefix", value="10.1.0.0/16", width=220)
+    ptr_template_in = ft.TextField(label="Hostname Template ({a} {b} {c} {d} {ip} {n}; IPv6: {ip} {hex} {n})", value="host-{ip}.example.com", expand=True)
+    ptr_out_path = ft.TextField(label="Write zone file to (optional)", expand=True, text_size=12, height=40)
+    ptr_ttl_in = ft.TextField(label="TTL", value="3600", width=100)
+    ptr_ns_in = ft.TextField(label="Primary NS (adds SOA/NS)", width=240)
+    ptr_classless_cb = ft.Checkbox(label="RFC 2317 classless", value=False)
+    ptr_summary = ft.Text("", size=13, selectable=True)
+    ptr_preview = ft.ListView(expand=True, spacing=1)
+    ptr_delegation = ft.ListView(expand=True, spacing=1)
+    ptr_state = {"delegation": []}
+
+    async def ptr_generate_click(e):
+        from utils import generate_ptr_zone
+        if not ptr_prefix_in.value or not ptr_template_in.value: return
+        ptr_summary.value = "Generating..."
+        ptr_summary.color = ft.Colors.GREY_400
+        page.update()
+        res = await asyncio.to_thread(
+            generate_ptr_zone, ptr_prefix_in.value, ptr_template_in.value, ptr_out_path.value or None,
+            ptr_ttl_in.value or 3600, ptr_ns_in.value or None, ptr_classless_cb.value
+        )
+        ptr_preview.controls.clear()
+        ptr_delegation.controls.clear()
+        if "error" in res:
+            ptr_state["delegation"] = []
+            ptr_summary.value = f"Error: {res['error']}"
+            ptr_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        # CNAME owners are relative to the parent /24 zone
+        ptr_state["delegation"] = [f"$ORIGIN {res['parent_zone']}."] + res["delegation"] if res["delegation"] else []
+        ptr_summary.value = f"Zone {res['zone']} | {res['records']:,} PTR records" + (
+            f" | written to {res['output']}" if res["output"] else " | preview only (set an output path to write the zone)"
+        )
+        ptr_summary.color = ft.Colors.GREEN_400
+        for line in res["preview"]:
+            ptr_preview.controls.append(ft.Text(line, size=12, font_family="monospace", selectable=True))
+        if res["delegation"]:
+            for line in ptr_state["delegation"]:
+                ptr_delegation.controls.append(ft.Text(line, size=12, font_family="monospace", selectable=True))
+        else:
+            ptr_delegation.controls.append(ft.Text("Enable RFC 2317 for a /25-/32 to get parent-zone CNAMEs", size=12, color=ft.Colors.GREY_500))
+        page.update()
+
+    async def ptr_copy_click(e):
+        await handle_copy_click(e, "\n".join(ptr_state["delegation"]))
+
+    cidr_single_view = ft.Column([
+        ft.Row([
+            cidr_ip_in, 
+            cidr_mask_in,
+            ft.Button("Calculate", icon=ft.Icons.CALCULATE, on_click=calc_cidr_click),
+        ]),
+        ft.Row([
             ft.Container(
-                content=ft.Row([
-                    ft.Container(ft.Text("Network", weight="bold"), width=120),
-                    ft.Container(ft.Text("Usable Range", weight="bold"), expand=True),
-                    ft.Container(ft.Text("Broadcast", weight="bold"), width=120),
-                ]),
-                bgcolor=ft.Colors.GREY_900,
-                padding=5
+                content=ft.Column([
+                    ft.Text("Network Metadata", weight="bold", color=ft.Colors.BLUE_200),
+                    ft.Divider(height=1),
+                    cidr_metadata_grid,
+                ], scroll=ft.ScrollMode.AUTO, alignment=ft.MainAxisAlignment.START),
+                expand=1, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
+            ),
+            ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Text("Subnet Explorer", weight="bold", color=ft.Colors.BLUE_200),
+                        cidr_sibling_nav,
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    ft.Divider(height=1),
+                    cidr_sibling_table,
+                ], alignment=ft.MainAxisAlignment.START),
+                expand=1, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
             )
-        ]
-        
-        for sib in res.get("siblings", []):
-            is_current = sib["net"] == res["network"]
-            cidr_sibling_table.controls.append(
-                ft.Container(
-                    content=ft.Row([
-                        ft.Container(ft.Text(sib["net"], size=12, color=ft.Colors.BLUE_200 if is_current else None), width=120),
-                        ft.Container(ft.Text(sib["range"], size=12), expand=True),
-                        ft.Container(ft.Text(sib["broadcast"], size=12), width=120),
-                    ]),
-                    padding=2
-                )
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+    ], spacing=15, expand=True)
+
+    cidr_bulk_view = ft.Column([
+        ft.Row([
+            bulk_cidrs_in,
+            ft.Column([
+                bulk_ip_path,
+                bulk_miss_path,
+                ft.Button("Match IPs", icon=ft.Icons.FILTER_ALT, on_click=bulk_match_click),
+                bulk_summary,
+            ], expand=1, spacing=10),
+        ], vertical_alignment=ft.CrossAxisAlignment.START),
+        ft.Row([
+            ft.Container(
+                content=ft.Column([
+                    ft.Text("Hits per CIDR (most specific)", weight="bold", color=ft.Colors.BLUE_200),
+                    ft.Divider(height=1),
+                    bulk_hits,
+                ], expand=True),
+                expand=1, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
+            ),
+            ft.Container(
+                content=ft.Column([
+                    ft.Text("Unmatched IPs (sample)", weight="bold", color=ft.Colors.BLUE_200),
+                    ft.Divider(height=1),
+                    bulk_misses,
+                ], expand=True),
+                expand=1, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
             )
-        
-        cidr_sibling_table.visible = True
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+    ], spacing=15, expand=True, visible=False)
+
+    cidr_lists_view = ft.Column([
+        ft.Row([pl_list_a, pl_list_b], vertical_alignment=ft.CrossAxisAlignment.START),
+        ft.Row([
+            ft.Button("Aggregate / Overlaps / Diff", icon=ft.Icons.MERGE_TYPE, on_click=pl_analyze_click),
+            pl_summary,
+        ]),
+        ft.Row([
+            pl_panel("Aggregated", pl_aggregated, ft.IconButton(ft.Icons.COPY, tooltip="Copy", on_click=pl_copy_click)),
+            pl_panel("Overlaps / Containment", pl_overlaps),
+            pl_panel("Diff A -> B", pl_diff),
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+    ], spacing=15, expand=True, visible=False)
+
+    cidr_free_view = ft.Column([
+        ft.Row([
+            fs_used_in,
+            ft.Column([
+                ft.Row([fs_parent_in, fs_prefix_in]),
+                ft.Button("Find Free Space", icon=ft.Icons.SPACE_DASHBOARD, on_click=fs_find_click),
+                fs_summary,
+            ], expand=1, spacing=10),
+        ], vertical_alignment=ft.CrossAxisAlignment.START),
+        ft.Row([
+            pl_panel("Largest Free Blocks", fs_blocks),
+            pl_panel("Placement", fs_placement),
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+    ], spacing=15, expand=True, visible=False)
+
+    cidr_vlsm_view = ft.Column([
+        ft.Row([
+            vlsm_req_in,
+            ft.Column([
+                vlsm_super_in,
+                ft.Row([
+                    ft.Button("Plan", icon=ft.Icons.ACCOUNT_TREE, on_click=vlsm_plan_click),
+                    ft.TextButton("CSV", icon=ft.Icons.COPY, on_click=vlsm_csv_click),
+                    ft.TextButton("JSON", icon=ft.Icons.COPY, on_click=vlsm_json_click),
+                ]),
+            ], spacing=10),
+        ], vertical_alignment=ft.CrossAxisAlignment.START),
+        vlsm_summary,
+        ft.Row([
+            ft.Container(
+                content=ft.Column([
+                    ft.Text("Allocation Table (largest first)", weight="bold", color=ft.Colors.BLUE_200),
+                    ft.Divider(height=1),
+                    vlsm_table,
+                ], expand=True),
+                expand=3, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
+            ),
+            pl_panel("Leftover Space", vlsm_leftover),
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+    ], spacing=15, expand=True, visible=False)
+
+    cidr_ptr_view = ft.Column([
+        ft.Row([ptr_prefix_in, ptr_template_in]),
+        ft.Row([ptr_out_path, ptr_ttl_in, ptr_ns_in, ptr_classless_cb]),
+        ft.Row([
+            ft.Button("Generate Zone", icon=ft.Icons.DNS, on_click=ptr_generate_click),
+            ptr_summary,
+        ]),
+        ft.Row([
+            pl_panel("Zone Preview", ptr_preview, expand=2),
+            pl_panel("Parent Zone CNAMEs (RFC 2317)", ptr_delegation, ft.IconButton(ft.Icons.COPY, tooltip="Copy", on_click=ptr_copy_click)),
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+    ], spacing=15, expand=True, visible=False)
+
+    cidr_views = {
+        "single": cidr_single_view,
+        "bulk": cidr_bulk_view,
+        "lists": cidr_lists_view,
+        "free": cidr_free_view,
+        "vlsm": cidr_vlsm_view,
+        "ptr": cidr_ptr_view,
+    }
+
+    def cidr_mode_change(e):
+        mode = list(cidr_mode_toggle.selected)[0]
+        for key, view in cidr_views.items():
+            view.visible = (key == mode)
         page.update()
 
+    cidr_mode_toggle = ft.SegmentedButton(
+        segments=[
+            ft.Segment(value="single", label=ft.Text("Calculator"), icon=ft.Icons.CALCULATE),
+            ft.Segment(value="bulk", label=ft.Text("Bulk Match"), icon=ft.Icons.FILTER_ALT),
+            ft.Segment(value="lists", label=ft.Text("Prefix Lists"), icon=ft.Icons.MERGE_TYPE),
+            ft.Segment(value="free", label=ft.Text("Free Space"), icon=ft.Icons.SPACE_DASHBOARD),
+            ft.Segment(value="vlsm", label=ft.Text("VLSM"), icon=ft.Icons.ACCOUNT_TREE),
+            ft.Segment(value="ptr", label=ft.Text("PTR Zone"), icon=ft.Icons.DNS),
+        ],
+        selected=["single"],
+        allow_multiple_selection=False,
+        on_change=cidr_mode_change
+    )
+
     tab_cidr = ft.Container(
         content=ft.Column([
-            ft.Text("Advanced IP Subnet Calculator", size=20, weight="bold", color=ft.Colors.CYAN_200),
             ft.Row([
-                cidr_ip_in, 
-                cidr_mask_in,
-                ft.Button("Calculate", icon=ft.Icons.CALCULATE, on_click=calc_cidr_click),
-            ]),
+                ft.Text("Advanced IP Subnet Calculator", size=20, weight="bold", color=ft.Colors.CYAN_200),
+                cidr_mode_toggle,
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            *cidr_views.values(),
+        ], spacing=15, expand=True),
+        padding=20, expand=True
+    )
+
+    # --- Tab: Log Analytics ---
+    la_path = ft.TextField(label="Path to Log File", expand=True, text_size=12, height=40)
+    la_prefix_in = ft.TextField(label="IPv4 Prefix", value="24", width=110)
+    la_prefix6_in = ft.TextField(label="IPv6 Prefix", value="64", width=110)
+    la_topk_in = ft.TextField(label="Top K", value="25", width=90)
+    la_summary = ft.Text("", size=13, selectable=True)
+    la_split = ft.Column(spacing=6)
+    la_prefixes = ft.ListView(expand=True, spacing=2)
+    la_ips = ft.ListView(expand=True, spacing=2)
+    la_class_colors = {"private": ft.Colors.AMBER_300, "public": ft.Colors.GREEN_300, "reserved": ft.Colors.PURPLE_200}
+
+    def la_panel(title, body, expand=1):
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(title, weight="bold", color=ft.Colors.BLUE_200),
+                ft.Divider(height=1),
+                body,
+            ], expand=True),
+            expand=expand, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
+        )
+
+    async def la_analyze_click(e):
+        from utils import analyze_log_ips
+        if not la_path.value: return
+        la_summary.value = "Scanning..."
+        la_summary.color = ft.Colors.GREY_400
+        page.update()
+        try:
+            args = (int(la_prefix_in.value or 24), int(la_prefix6_in.value or 64), int(la_topk_in.value or 25))
+        except ValueError:
+            la_summary.value = "Error: prefix lengths and Top K must be integers"
+            la_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+        res = await asyncio.to_thread(analyze_log_ips, la_path.value.strip(), *args)
+        la_split.controls.clear()
+        la_prefixes.controls.clear()
+        la_ips.controls.clear()
+        if "error" in res:
+            la_summary.value = f"Error: {res['error']}"
+            la_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        la_summary.value = (
+            f"{res['lines']:,} lines, {res['bytes'] / 1e6:,.1f} MB in {res['elapsed']:.2f}s ({res['mb_per_sec']:,.0f} MB/s, {res['engine']}) | "
+            f"IPv4 {res['ipv4']['total']:,} hits / {res['ipv4']['distinct']:,} distinct | "
+            f"IPv6 {res['ipv6']['total']:,} hits / {res['ipv6']['distinct']:,} distinct"
+        )
+        la_summary.color = ft.Colors.GREEN_400
+        total_distinct = max(sum(v["distinct"] for v in res["split"].values()), 1)
+        for name, v in res["split"].items():
+            share = v["distinct"] / total_distinct
+            la_split.controls.append(ft.Row([
+                ft.Text(name.title(), size=12, width=70),
+                ft.Container(width=max(2, 260 * share), height=14, bgcolor=la_class_colors[name], border_radius=3),
+                ft.Text(f"{v['distinct']:,} distinct ({share:.1%}) | {v['hits']:,} hits", size=12, color=ft.Colors.GREY_400),
+            ]))
+        for p in res["top_prefixes"]:
+            la_prefixes.controls.append(ft.Row([
+                ft.Container(ft.Text(p["prefix"], size=12, font_family="monospace", selectable=True), expand=True),
+                ft.Text(f"{p['distinct']:,} IPs", size=12, width=90, color=ft.Colors.GREY_400),
+                ft.Text(f"{p['hits']:,}", size=12, width=90, color=ft.Colors.CYAN_200),
+            ]))
+        for ip in res["top_ips"]:
+            la_ips.controls.append(ft.Row([
+                ft.Container(ft.Text(ip["ip"], size=12, font_family="monospace", selectable=True), expand=True),
+                ft.Text(ip["class"], size=12, width=70, color=la_class_colors[ip["class"]]),
+                ft.Text(f"{ip['hits']:,}", size=12, width=90, color=ft.Colors.CYAN_200),
+            ]))
+        page.update()
+
+    logs_ips_view = ft.Column([
+        ft.Row([
+            la_path, la_prefix_in, la_prefix6_in, la_topk_in,
+            ft.Button("Analyze IPs", icon=ft.Icons.TRAVEL_EXPLORE, on_click=la_analyze_click),
+        ]),
+        la_summary,
+        la_panel("Private / Public / Reserved", la_split, expand=None),
+        ft.Row([
+            la_panel("Top Prefixes (by hits)", la_prefixes),
+            la_panel("Top Client IPs", la_ips),
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+    ], spacing=15, expand=True)
+
+    # Access log: streaming sketches (Space-Saving, Count-Min, HyperLogLog)
+    la_acc_path = ft.TextField(label="Path to Access Log (.gz ok)", expand=True, text_size=12, height=40)
+    la_acc_topk_in = ft.TextField(label="Top K", value="20", width=90)
+    la_acc_cap_in = ft.TextField(label="Sketch Capacity", value="1000", width=130)
+    la_acc_query = ft.TextField(label="Query Paths (comma separated)", expand=True, text_size=12, height=40)
+    la_acc_summary = ft.Text("", size=13, selectable=True)
+    la_acc_status = ft.Column(spacing=4)
+    la_acc_series = ft.ListView(expand=True, spacing=1)
+    la_acc_ips = ft.ListView(expand=True, spacing=2)
+    la_acc_paths = ft.ListView(expand=True, spacing=2)
+    la_acc_agents = ft.ListView(expand=True, spacing=2)
+    la_status_colors = {"1xx": ft.Colors.GREY_400, "2xx": ft.Colors.GREEN_300, "3xx": ft.Colors.BLUE_300, "4xx": ft.Colors.AMBER_300, "5xx": ft.Colors.RED_300}
+
+    def la_top_rows(target, items, extra=None):
+        target.controls.clear()
+        for item in items:
+            target.controls.append(ft.Row([
+                ft.Container(ft.Text(item["key"], size=12, font_family="monospace", selectable=True, no_wrap=True), expand=True),
+                *([extra(item)] if extra else []),
+                ft.Text(f"{item['count']:,}" + (f" ±{item['error']:,}" if item["error"] else ""), size=12, width=110, color=ft.Colors.CYAN_200),
+            ]))
+
+    async def la_access_click(e):
+        from utils import analyze_access_log
+        if not la_acc_path.value: return
+        la_acc_summary.value = "Streaming..."
+        la_acc_summary.color = ft.Colors.GREY_400
+        page.update()
+        try:
+            top_k, capacity = int(la_acc_topk_in.value or 20), int(la_acc_cap_in.value or 1000)
+        except ValueError:
+            la_acc_summary.value = "Error: Top K and capacity must be integers"
+            la_acc_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+        queries = [q.strip() for q in (la_acc_query.value or "").split(",") if q.strip()]
+        res = await asyncio.to_thread(analyze_access_log, la_acc_path.value.strip(), top_k=top_k, capacity=max(capacity, top_k), query_paths=queries)
+        for target in (la_acc_status, la_acc_series, la_acc_ips, la_acc_paths, la_acc_agents):
+            target.controls.clear()
+        if "error" in res:
+            la_acc_summary.value = f"Error: {res['error']}"
+            la_acc_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        sk = res["sketch"]
+        la_acc_summary.value = (
+            f"{res['parsed']:,} of {res['lines']:,} lines parsed, {res['bytes'] / 1e6:,.1f} MB in {res['elapsed']:.2f}s ({res['mb_per_sec']:,.1f} MB/s) | "
+            f"~{res['distinct_clients']:,} clients, ~{res['distinct_paths']:,} paths (HLL ±{sk['hll_error']:.1%}) | "
+            f"{res['body_bytes'] / 1e6:,.1f} MB sent | Count-Min {sk['cm_depth']}x{sk['cm_width']} (overcount ≤ {sk['cm_error']:,.0f})"
+        )
+        if res["path_queries"]:
+            la_acc_summary.value += " | " + ", ".join(f"{p}: ≤{c:,}" for p, c in res["path_queries"].items())
+        la_acc_summary.color = ft.Colors.GREEN_400
+        peak = max([s["count"] for s in res["statuses"]] + [1])
+        for st in res["statuses"]:
+            la_acc_status.controls.append(ft.Row([
+                ft.Text(st["status"], size=12, width=40, font_family="monospace"),
+                ft.Container(width=max(2, 260 * st["count"] / peak), height=12, border_radius=2,
+                             bgcolor=la_status_colors.get(st["status"][0] + "xx", ft.Colors.GREY_400)),
+                ft.Text(f"{st['count']:,}", size=12, color=ft.Colors.GREY_400),
+            ]))
+        peak = max([p["total"] for p in res["series"]] + [1])
+        for point in res["series"]:
+            # Stacked bar per bucket, one segment per status class
+            la_acc_series.controls.append(ft.Row([
+                ft.Text(point["time"], size=11, width=120, font_family="monospace"),
+                ft.Row([
+                    ft.Container(width=320 * point[c] / peak, height=10, bgcolor=color)
+                    for c, color in la_status_colors.items() if point[c]
+                ], spacing=0),
+                ft.Text(f"{point['total']:,}" + (f" ({point['5xx']:,} 5xx)" if point["5xx"] else ""), size=11, color=ft.Colors.GREY_400),
+            ], spacing=8))
+        la_top_rows(la_acc_ips, res["top_ips"])
+        la_top_rows(la_acc_paths, res["top_paths"],
+                    lambda item: ft.Text(f"CM ≤{item['estimate']:,}", size=11, width=100, color=ft.Colors.GREY_500))
+        la_top_rows(la_acc_agents, res["top_agents"])
+        la_acc_series_title.value = f"Requests per {res['bucket_minutes']} min (UTC)"
+        page.update()
+
+    la_acc_series_title = ft.Text("Requests per minute (UTC)", weight="bold", color=ft.Colors.BLUE_200)
+    logs_access_view = ft.Column([
+        ft.Row([
+            la_acc_path, la_acc_topk_in, la_acc_cap_in,
+            ft.Button("Analyze Access Log", icon=ft.Icons.INSIGHTS, on_click=la_access_click),
+        ]),
+        la_acc_query,
+        la_acc_summary,
+        ft.Row([
+            la_panel("Status Codes", la_acc_status),
+            ft.Container(
+                content=ft.Column([la_acc_series_title, ft.Divider(height=1), la_acc_series], expand=True),
+                expand=2, height=220, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
+            ),
+        ], vertical_alignment=ft.CrossAxisAlignment.START),
+        ft.Row([
+            la_panel("Top Client IPs", la_acc_ips),
+            la_panel("Top Paths", la_acc_paths),
+            la_panel("Top User Agents", la_acc_agents),
+        ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START),
+    ], spacing=15, expand=True, visible=False)
+
+    # Stack traces: fingerprint and group multi-line JVM exceptions
+    la_st_path = ft.TextField(label="Path to Application Log (.gz ok)", expand=True, text_size=12, height=40)
+    la_st_frames_in = ft.TextField(label="Top Frames", value="5", width=110)
+    la_st_strip_cb = ft.Checkbox(label="Ignore line numbers", value=True)
+    la_st_summary = ft.Text("", size=13, selectable=True)
+    la_st_groups = ft.ListView(expand=True, spacing=8)
+
+    async def la_stack_click(e):
+        from utils import fingerprint_stack_traces
+        if not la_st_path.value: return
+        la_st_summary.value = "Reassembling traces..."
+        la_st_summary.color = ft.Colors.GREY_400
+        page.update()
+        try:
+            top_frames = int(la_st_frames_in.value or 5)
+        except ValueError:
+            la_st_summary.value = "Error: Top Frames must be an integer"
+            la_st_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+        res = await asyncio.to_thread(fingerprint_stack_traces, path=la_st_path.value.strip(), top_frames=top_frames,
+                                      strip_line_numbers=la_st_strip_cb.value)
+        la_st_groups.controls.clear()
+        if "error" in res:
+            la_st_summary.value = f"Error: {res['error']}"
+            la_st_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+        la_st_summary.value = (
+            f"{res['traces']:,} stack traces in {res['lines']:,} lines -> {res['distinct']:,} distinct fingerprints | "
+            f"{res['bytes'] / 1e6:,.1f} MB in {res['elapsed']:.2f}s ({res['mb_per_sec']:,.1f} MB/s)"
+            + (f" | showing top {len(res['groups'])}" if res["truncated"] else "")
+        )
+        la_st_summary.color = ft.Colors.GREEN_400
+        for g in res["groups"]:
+            seen = f"first {g['first_seen'] or 'line ' + str(g['first_line'])} | last {g['last_seen'] or 'line ' + str(g['last_line'])}"
+            la_st_groups.controls.append(ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Text(f"{g['count']:,}x", weight="bold", width=70, color=ft.Colors.CYAN_200),
+                        ft.Text(g["exception"] + "".join(f" <- {c}" for c in g["causes"]), weight="bold", expand=True, selectable=True),
+                        ft.Text(g["fingerprint"], size=11, font_family="monospace", color=ft.Colors.GREY_500, selectable=True),
+                    ]),
+                    ft.Text(seen, size=11, color=ft.Colors.GREY_400),
+                    ft.Text("\n".join(g["representative"].splitlines()[:15]), size=11, font_family="monospace",
+                            color=ft.Colors.GREY_300, selectable=True),
+                ], spacing=4),
+                padding=8, bgcolor="#111111", border_radius=5
+            ))
+        page.update()
+
+    logs_stack_view = ft.Column([
+        ft.Row([
+            la_st_path, la_st_frames_in, la_st_strip_cb,
+            ft.Button("Fingerprint Traces", icon=ft.Icons.BUG_REPORT, on_click=la_stack_click),
+        ]),
+        la_st_summary,
+        la_st_groups,
+    ], spacing=15, expand=True, visible=False)
+
+    logs_views = {
+        "ips": logs_ips_view,
+        "access": logs_access_view,
+        "stack": logs_stack_view,
+    }
+
+    def logs_mode_change(e):
+        mode = list(logs_mode_toggle.selected)[0]
+        for key, view in logs_views.items():
+            view.visible = (key == mode)
+        page.update()
+
+    logs_mode_toggle = ft.SegmentedButton(
+        segments=[
+            ft.Segment(value="ips", label=ft.Text("IP Analytics"), icon=ft.Icons.TRAVEL_EXPLORE),
+            ft.Segment(value="access", label=ft.Text("Access Log"), icon=ft.Icons.INSIGHTS),
+            ft.Segment(value="stack", label=ft.Text("Stack Traces"), icon=ft.Icons.BUG_REPORT),
+        ],
+        selected=["ips"],
+        allow_multiple_selection=False,
+        on_change=logs_mode_change
+    )
+
+    tab_logs = ft.Container(
+        content=ft.Column([
             ft.Row([
-                ft.Container(
-                    content=ft.Column([
-                        ft.Text("Network Metadata", weight="bold", color=ft.Colors.BLUE_200),
-                        ft.Divider(height=1),
-                        cidr_metadata_grid,
-                    ], scroll=ft.ScrollMode.AUTO, alignment=ft.MainAxisAlignment.START),
-                    expand=1, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
-                ),
-                ft.Container(
-                    content=ft.Column([
-                        ft.Text("Subnet Explorer", weight="bold", color=ft.Colors.BLUE_200),
-                        ft.Divider(height=1),
-                        cidr_sibling_table,
-                    ], alignment=ft.MainAxisAlignment.START),
-                    expand=1, padding=10, border=ft.Border.all(1, ft.Colors.GREY_800), border_radius=5
-                )
-            ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START)
+                ft.Text("Log Analytics", size=20, weight="bold", color=ft.Colors.CYAN_200),
+                logs_mode_toggle,
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            *logs_views.values(),
         ], spacing=15, expand=True),
         padding=20, expand=True
     )
@@ -1018,8 +2044,31 @@ async def main(page: ft.Page):
     # --- TAB: REGEX (FINAL REWRITE) ---
     rx_p = ft.TextField(label="Regex Pattern", expand=True, text_style=ft.TextStyle(font_family="monospace"))
     rx_t = ft.TextField(label="Test String", multiline=True, expand=True, min_lines=8)
-    rx_f = ft.TextField(label="Path to Load", expand=True, text_size=12, height=40)
+    rx_f = ft.TextField(label="Path to Load", hint_text="file, directory, glob or .gz", expand=True, text_size=12, height=40)
     rx_res = ft.ListView(expand=True, spacing=5)
+    rx_state = {"path": None, "multi": False}
+    rx_file_info = ft.Text("", size=12, color=ft.Colors.CYAN_200, expand=True)
+    rx_file_bar = ft.Row([
+        ft.Icon(ft.Icons.DESCRIPTION, size=16, color=ft.Colors.CYAN_200),
+        rx_file_info,
+        ft.TextButton("Use Typed Text", icon=ft.Icons.CLOSE, on_click=lambda e: rx_exit_file_mode()),
+    ], visible=False)
+    rx_display_limit = 500
+    rx_lint = ft.Text("", size=12, color=ft.Colors.AMBER_300, visible=False)
+    rx_cmp = ft.TextField(label="Compare Patterns (one per line)", multiline=True, expand=True, min_lines=1, max_lines=4,
+                          text_style=ft.TextStyle(font_family="monospace", size=12))
+    rx_corpus_cb = ft.Checkbox(label="Benchmark on samples library", value=False)
+    rx_engine_dd = ft.Dropdown(label="Engine", value="re", width=170, text_size=12,
+                               options=[ft.dropdown.Option("re", "re (backtracking)"), ft.dropdown.Option("linear", "Linear (NFA/DFA)")])
+    rx_par_cb = ft.Checkbox(label="Parallel", value=False, tooltip="Search loaded files on all cores in newline-aligned chunks")
+    rx_all_labels_cb = ft.Checkbox(label="All labels (exact, slower)", value=False)
+    rx_group_by = ft.TextField(label="Group By", hint_text="name or g4", width=120, text_size=12, height=40)
+    rx_metric = ft.TextField(label="Metric Column", hint_text="numeric", width=130, text_size=12, height=40)
+    rx_fmt_dd = ft.Dropdown(label="Format", value="csv", width=110, text_size=12,
+                            options=[ft.dropdown.Option("csv", "CSV"), ft.dropdown.Option("ndjson", "NDJSON")])
+    rx_export_path = ft.TextField(label="Export Path (optional)", expand=True, text_size=12, height=40)
+    rx_timeout_in = ft.TextField(label="Timeout (ms)", value="2000", width=120, text_size=12, height=40,
+                                 tooltip="Text: whole run. File: per line.")
 
     rx_data = config.get("regex_samples", {})
     # Safety merge for exhaustive default samples if missing
@@ -1041,12 +2090,25 @@ async def main(page: ft.Page):
         if k not in rx_data:
             rx_data[k] = v
 
+    def rx_exit_file_mode(update=True):
+        rx_state["path"] = None
+        rx_state["multi"] = False
+        rx_file_bar.visible = False
+        rx_t.label = "Test String"
+        rx_t.read_only = False
+        rx_t.value = ""
+        if update:
+            page.update()
+
     def rx_load_sample(e):
         val = rx_dd.value
         if val in rx_data:
+            if rx_state["path"]:
+                rx_exit_file_mode(update=False)
             sample = rx_data[val]
             rx_p.value = sample[0]
             rx_t.value = sample[1]
+            rx_refresh_lint()
             rx_p.update()
             rx_t.update()
         page.update()
@@ -1076,39 +2138,397 @@ async def main(page: ft.Page):
         dlg.open = True
         page.update()
 
+    def rx_warning_rows(res):
+        return [
+            ft.Text(f"Warning: {w}", size=12, color=ft.Colors.AMBER_300)
+            for w in res.get("warnings", [])
+        ]
+
+    def rx_timeout_ms():
+        try:
+            return max(50, int(rx_timeout_in.value or 2000))
+        except ValueError:
+            return 2000
+
+    def rx_refresh_lint():
+        from utils import lint_regex, linear_regex_support
+        if rx_engine_dd.value == "linear":
+            res = linear_regex_support(rx_p.value or "")
+            rx_lint.value = "" if "error" in res or res["supported"] else (
+                "Linear engine can't run this pattern; it needs the backtracking (re) engine for: " + ", ".join(res["unsupported"]))
+        else:
+            res = lint_regex(rx_p.value or "")
+            rx_lint.value = "" if "error" in res else "\n".join(f"Warning: {w}" for w in res["warnings"])
+        rx_lint.visible = bool(rx_lint.value)
+
+    async def rx_pattern_change(e):
+        rx_refresh_lint()
+        page.update()
+
+    def rx_show_parallel(res):
+        multi = len(res["files"]) > 1
+        rx_res.controls.append(ft.Text(
+            f"Matches ({res['matches']:,}) on {res['matching_lines']:,} of {res['lines']:,} lines in {len(res['files'])} file(s) | "
+            f"{res['bytes'] / 1e6:,.1f} MB in {res['elapsed']:.2f}s ({res['mb_per_sec']:,.0f} MB/s, "
+            f"{res['workers']} workers, {res['chunks']} chunks)",
+            weight="bold"
+        ))
+        if multi:
+            for f in res["files"]:
+                rx_res.controls.append(ft.Text(
+                    f"{os.path.basename(f['path'])}: {f['matches']:,} matches on {f['matching_lines']:,} of {f['lines']:,} lines",
+                    size=12, color=ft.Colors.CYAN_200 if f["matches"] else ft.Colors.GREY_500
+                ))
+        if res["line_numbers"]:
+            shown = res["line_numbers"][:200]
+            more = res["matching_lines"] - len(shown)
+            where = [f"{os.path.basename(n['path'])}:{n['line']}" if multi else str(n["line"]) for n in shown]
+            rx_res.controls.append(ft.Text(
+                "Lines: " + ", ".join(where) + (f" ... (+{more:,} more)" if more > 0 else ""),
+                size=12, color=ft.Colors.GREY_400, selectable=True
+            ))
+        for m in res["samples"]:
+            prefix = f"{os.path.basename(m['path'])}:" if multi else "L"
+            rx_res.controls.append(ft.Container(
+                content=ft.Column([
+                    ft.Text(f"{prefix}{m['line']}: '{m['match']}'", color="green", selectable=True),
+                    ft.Text(m["text"], size=11, color=ft.Colors.GREY_500, font_family="monospace", selectable=True),
+                ], spacing=2),
+                padding=5, bgcolor="#111111", border_radius=5
+            ))
+
     async def rx_run_test(e):
-        from utils import test_regex
-        if not rx_p.value or not rx_t.value: return
-        res = test_regex(rx_p.value, rx_t.value)
+        from utils import run_regex_guarded, parallel_search_regex, lint_regex
+        if not rx_p.value: return
+        if not rx_state["path"] and not rx_t.value: return
+        linear = rx_engine_dd.value == "linear"
+        if rx_state["path"] and (rx_state["multi"] or rx_par_cb.value) and not linear:
+            lint = lint_regex(rx_p.value)
+            rx_res.controls.clear()
+            if "error" in lint:
+                rx_res.controls.append(ft.Text(f"Error: {lint['error']}", color="red"))
+                page.update()
+                return
+            rx_res.controls.append(ft.Text("Searching in parallel...", color=ft.Colors.GREY_400))
+            page.update()
+            # The timeout is a per-line stall limit: the pool is killed once no worker advances for that long
+            res = await asyncio.to_thread(parallel_search_regex, rx_p.value, rx_state["path"], stall_ms=rx_timeout_ms())
+            rx_res.controls.clear()
+            if lint["warnings"]:
+                rx_res.controls.extend(rx_warning_rows(lint))
+            if "error" in res:
+                rx_res.controls.append(ft.Text(f"Error: {res['error']}", color="red"))
+            else:
+                rx_show_parallel(res)
+            page.update()
+            return
         rx_res.controls.clear()
+        rx_res.controls.append(ft.Text("Searching file..." if rx_state["path"] else "Running...", color=ft.Colors.GREY_400))
+        page.update()
+        if linear:
+            # Automaton engine: the DFA filters lines and all matches on a line come from one backward pass plus
+            # one Pike VM run per match span, so the time is bounded by input size x pattern size
+            from utils import test_regex_linear, search_file_linear
+            if rx_state["multi"]:
+                res = {"error": "The linear engine searches one file at a time; load a single file"}
+            elif rx_state["path"]:
+                res = await asyncio.to_thread(search_file_linear, rx_p.value, rx_state["path"])
+            else:
+                res = await asyncio.to_thread(test_regex_linear, rx_p.value, rx_t.value, 100_000)
+        # Runs in a killable worker process so catastrophic backtracking can't hang the UI
+        elif rx_state["path"]:
+            res = await asyncio.to_thread(run_regex_guarded, rx_p.value, path=rx_state["path"], timeout_ms=rx_timeout_ms())
+        else:
+            res = await asyncio.to_thread(run_regex_guarded, rx_p.value, rx_t.value, timeout_ms=rx_timeout_ms())
+        rx_res.controls.clear()
+        rx_res.controls.extend(rx_warning_rows(res))
         if "error" in res:
             rx_res.controls.append(ft.Text(f"Error: {res['error']}", color="red"))
-        else:
-            rx_res.controls.append(ft.Text(f"Matches ({res['count']}):", weight="bold"))
-            for m in res['matches']:
+            page.update()
+            return
+        if res.get("budget"):
+            rx_res.controls.append(ft.Text(f"Budget: {res['budget']}", size=12, color=ft.Colors.AMBER_300))
+
+        if linear:
+            rx_res.controls.append(ft.Text(
+                f"Linear engine: {res['dfa_states']:,} DFA states cached, {res['classes']} char classes, "
+                f"{res['cache_flushes']:,} cache flushes, {res['nfa_size']:,} NFA instructions",
+                size=12, color=ft.Colors.CYAN_200
+            ))
+        if rx_state["path"]:
+            counted = f"Matches ({res['matches']:,}) on " if "matches" in res else "Matching lines: "
+            rx_res.controls.append(ft.Text(
+                f"{counted}{res['matching_lines']:,} of {res['lines']:,} lines | "
+                f"{res['bytes'] / 1e6:,.1f} MB in {res['elapsed']:.2f}s",
+                weight="bold"
+            ))
+            if res.get("skipped_long_lines"):
+                rx_res.controls.append(ft.Text(f"Skipped {res['skipped_long_lines']:,} over-long lines", size=12, color=ft.Colors.AMBER_300))
+            if res["line_numbers"]:
+                shown = res["line_numbers"][:200]
+                more = res["matching_lines"] - len(shown)
+                rx_res.controls.append(ft.Text(
+                    "Lines: " + ", ".join(str(n) for n in shown) + (f" ... (+{more:,} more)" if more > 0 else ""),
+                    size=12, color=ft.Colors.GREY_400, selectable=True
+                ))
+            for m in res["samples"]:
                 rx_res.controls.append(ft.Container(
-                    content=ft.Text(f"'{m['match']}'", color="green"),
+                    content=ft.Column([
+                        ft.Text(f"L{m['line']}: '{m['match']}'", color="green", selectable=True),
+                        ft.Text(m["text"], size=11, color=ft.Colors.GREY_500, font_family="monospace", selectable=True),
+                    ], spacing=2),
                     padding=5, bgcolor="#111111", border_radius=5
                 ))
+            page.update()
+            return
+
+        rx_res.controls.append(ft.Text(f"Matches ({res['count']}):", weight="bold"))
+        for m in res['matches'][:rx_display_limit]:
+            groups = ", ".join(f"{i}={g!r}" for i, g in enumerate(m["groups"], 1))
+            rx_res.controls.append(ft.Container(
+                content=ft.Column([
+                    ft.Text(f"'{m['match']}'", color="green", selectable=True),
+                    *([ft.Text(groups, size=11, color=ft.Colors.GREY_500, font_family="monospace", selectable=True)] if groups else []),
+                ], spacing=2),
+                padding=5, bgcolor="#111111", border_radius=5
+            ))
+        if res["count"] > rx_display_limit:
+            rx_res.controls.append(ft.Text(f"... {res['count'] - rx_display_limit:,} more not shown", color=ft.Colors.GREY_500))
+        page.update()
+
+    def rx_source():
+        from utils import sample_corpus
+        if rx_corpus_cb.value:
+            return {"text": sample_corpus(rx_data)}
+        if rx_state["multi"]:
+            rx_res.controls.clear()
+            rx_res.controls.append(ft.Text("Error: this mode works on a single file; load one file instead of a glob/directory/.gz", color="red"))
+            page.update()
+            return None
+        if rx_state["path"]:
+            return {"path": rx_state["path"]}
+        if rx_t.value:
+            return {"text": rx_t.value}
+        return None
+
+    def rx_source_label(source):
+        return "samples library" if rx_corpus_cb.value else ("file" if "path" in source else "test string")
+
+    async def rx_profile_click(e):
+        from utils import run_regex_profile
+        patterns = [rx_p.value] if rx_p.value else []
+        patterns += [l for l in (rx_cmp.value or "").splitlines() if l.strip()]
+        source = rx_source()
+        if not patterns or not source: return
+        rx_res.controls.clear()
+        rx_res.controls.append(ft.Text("Profiling...", color=ft.Colors.GREY_400))
+        page.update()
+        res = await asyncio.to_thread(run_regex_profile, patterns, timeout_ms=rx_timeout_ms(), **source)
+        rx_res.controls.clear()
+        if "error" in res:
+            rx_res.controls.append(ft.Text(f"Error: {res['error']}", color="red"))
+            page.update()
+            return
+        corpus = rx_source_label(source)
+        passes = f" x {res['passes']:,} passes (best per line)" if "text" in source else ""
+        rx_res.controls.append(ft.Text(
+            f"Profile: {res['lines']:,} lines, {res['bytes'] / 1e6:,.2f} MB from {corpus}{passes}",
+            weight="bold"
+        ))
+        for r in res["results"]:
+            if "error" in r:
+                rx_res.controls.append(ft.Text(f"{r['pattern']}\n  Error: {r['error']}", color="red", font_family="monospace", size=12))
+                continue
+            lines = [
+                f"{r['lines_per_sec']:,.0f} lines/s | {r['mb_per_sec']:,.1f} MB/s | avg {r['avg_us']:.2f} us | worst {r['worst_us']:.1f} us",
+                f"{r['matches']:,} matches on {r['matching_lines']:,} lines | {r['relative']:.2f}x the fastest",
+            ]
+            lines += [f"  L{s['line']} {s['us']:.1f} us: {s['text'][:120]}" for s in r["slowest"][:5]]
+            rx_res.controls.append(ft.Container(
+                content=ft.Column([
+                    ft.Text(r["pattern"], color="green" if r["relative"] == 1.0 else ft.Colors.AMBER_200, font_family="monospace", selectable=True),
+                    *[ft.Text(f"Warning: {w}", size=11, color=ft.Colors.AMBER_300) for w in r["warnings"]],
+                    ft.Text("\n".join(lines), size=11, color=ft.Colors.GREY_400, font_family="monospace", selectable=True),
+                ], spacing=2),
+                padding=5, bgcolor="#111111", border_radius=5
+            ))
+        page.update()
+
+    async def rx_classify_click(e):
+        from utils import run_log_classifier
+        source = rx_source()
+        if not source or not rx_data: return
+        rx_res.controls.clear()
+        rx_res.controls.append(ft.Text(f"Classifying with {len(rx_data)} saved samples...", color=ft.Colors.GREY_400))
+        page.update()
+        patterns = {name: sample[0] for name, sample in rx_data.items()}
+        res = await asyncio.to_thread(run_log_classifier, patterns, timeout_ms=rx_timeout_ms(), all_labels=rx_all_labels_cb.value, **source)
+        rx_res.controls.clear()
+        if "error" in res:
+            rx_res.controls.append(ft.Text(f"Error: {res['error']}", color="red"))
+            page.update()
+            return
+        mode = "all labels" if res["all_labels"] else "first match"
+        if res["single_pass"]:
+            scan = "single combined pass"
+        elif res["individual"] < len(res["patterns"]):
+            scan = f"combined pass + {res['individual']} individual"
+        else:
+            scan = "per-pattern checks"
+        rx_res.controls.append(ft.Text(
+            f"Classified {res['lines']:,} lines from {rx_source_label(source)} ({mode}, {scan}) | "
+            f"{res['matched']:,} matched, {res['unmatched']:,} unmatched | {res['mb_per_sec']:,.1f} MB/s",
+            weight="bold"
+        ))
+        peak = max([p["count"] for p in res["patterns"]] + [res["unmatched"], 1])
+        for p in sorted(res["patterns"], key=lambda p: -p["count"]) + [{"name": "(unmatched)", "count": res["unmatched"], "examples": []}]:
+            rx_res.controls.append(ft.Row([
+                ft.Text(p["name"], width=140, size=12, no_wrap=True),
+                ft.Container(width=max(2, 260 * p["count"] / peak), height=12, border_radius=2,
+                             bgcolor=ft.Colors.GREY_700 if p["name"] == "(unmatched)" else ft.Colors.PINK_300),
+                ft.Text(f"{p['count']:,}", size=12, color=ft.Colors.GREY_400),
+            ], spacing=8))
+            if p["examples"]:
+                rx_res.controls.append(ft.Text(f"    L{p['examples'][0]['line']}: {p['examples'][0]['text'][:160]}",
+                                               size=11, color=ft.Colors.GREY_500, font_family="monospace", selectable=True))
+        for m in res["multi_label"]:
+            rx_res.controls.append(ft.Text(f"{' + '.join(m['labels'])}: {m['count']:,} lines", size=12, color=ft.Colors.CYAN_200))
+        if res["unmatched_samples"]:
+            rx_res.controls.append(ft.Text("Unmatched samples:", weight="bold"))
+            for u in res["unmatched_samples"]:
+                rx_res.controls.append(ft.Text(f"L{u['line']}: {u['text'][:200]}", size=11, color=ft.Colors.GREY_400,
+                                               font_family="monospace", selectable=True))
+        page.update()
+
+    async def rx_extract_click(e):
+        from utils import run_regex_extract
+        source = rx_source()
+        if not rx_p.value or not source: return
+        rx_res.controls.clear()
+        rx_res.controls.append(ft.Text("Extracting...", color=ft.Colors.GREY_400))
+        page.update()
+        res = await asyncio.to_thread(
+            run_regex_extract, rx_p.value, timeout_ms=rx_timeout_ms(),
+            group_by=rx_group_by.value or None, metric=rx_metric.value or None,
+            output_path=(rx_export_path.value or "").strip() or None, fmt=rx_fmt_dd.value, **source
+        )
+        rx_res.controls.clear()
+        if "error" in res:
+            rx_res.controls.append(ft.Text(f"Error: {res['error']}", color="red"))
+            page.update()
+            return
+        rx_res.controls.append(ft.Text(
+            f"Extracted {res['rows']:,} rows from {res['lines']:,} lines of {rx_source_label(source)}"
+            + (f" -> {res['output_path']} ({res['format'].upper()})" if res["output_path"] else ""),
+            weight="bold"
+        ))
+        rx_res.controls.append(ft.Text(
+            "Columns: " + ", ".join(f"{c['name']}:{c['type']}" for c in res["columns"]),
+            size=12, color=ft.Colors.CYAN_200
+        ))
+        if "metric" in res:
+            m = res["metric"]
+            if m["count"]:
+                pct = " ".join(f"{k}={m[k]:,.2f}" for k in ("p50", "p90", "p95", "p99") if k in m)
+                rx_res.controls.append(ft.Text(
+                    f"{m['column']}: n={m['count']:,} sum={m['sum']:,} avg={m['avg']:,.2f} min={m['min']:,} max={m['max']:,}\n"
+                    f"{pct}{' (estimated from a sample)' if m['approximate'] else ''}",
+                    size=12, font_family="monospace", selectable=True
+                ))
+            else:
+                rx_res.controls.append(ft.Text(f"{m['column']}: no numeric values", size=12, color=ft.Colors.AMBER_300))
+        if "top" in res:
+            rx_res.controls.append(ft.Text(f"Top {len(res['top'])} of {res['distinct']:,} by {res['group_by']}:", weight="bold"))
+            peak = max([t["count"] for t in res["top"]] + [1])
+            for t in res["top"]:
+                extra = f"  avg {t['avg']:,.2f}" if t.get("avg") is not None else ""
+                rx_res.controls.append(ft.Row([
+                    ft.Text(str(t["value"]), width=160, size=12, no_wrap=True, selectable=True),
+                    ft.Container(width=max(2, 260 * t["count"] / peak), height=12, bgcolor=ft.Colors.PINK_300, border_radius=2),
+                    ft.Text(f"{t['count']:,}{extra}", size=12, color=ft.Colors.GREY_400),
+                ], spacing=8))
+        if res["samples"]:
+            header = " | ".join(c["name"] for c in res["columns"])
+            body = "\n".join(" | ".join("" if v is None else str(v) for v in row) for row in res["samples"][:20])
+            rx_res.controls.append(ft.Text(f"{header}\n{body}", size=11, font_family="monospace", color=ft.Colors.GREY_400, selectable=True))
+        page.update()
+
+    async def rx_engine_bench_click(e):
+        from utils import benchmark_regex_engines
+        if not rx_data: return
+        rx_res.controls.clear()
+        rx_res.controls.append(ft.Text("Benchmarking re vs linear engine on the samples library...", color=ft.Colors.GREY_400))
+        page.update()
+        res = await asyncio.to_thread(benchmark_regex_engines, rx_data)
+        rx_res.controls.clear()
+        rx_res.controls.append(ft.Text(f"Engine benchmark: {res['lines']:,} lines, {res['bytes'] / 1e6:,.2f} MB (samples corpus)", weight="bold"))
+        for r in res["rows"]:
+            if "error" in r:
+                detail, color = f"Error: {r['error']}", "red"
+            elif not r["supported"]:
+                detail, color = "re only: " + ", ".join(r["unsupported"]), ft.Colors.AMBER_300
+            else:
+                agree = "agree" if r["agree"] else "DISAGREE"
+                detail = (f"re {r['re_mb_per_sec']:,.1f} MB/s | linear {r['linear_mb_per_sec']:,.1f} MB/s "
+                          f"({r['slowdown']:.1f}x) | {r['dfa_states']} DFA states | lines {agree}")
+                color = ft.Colors.GREY_400 if r["agree"] else "red"
+            rx_res.controls.append(ft.Row([
+                ft.Text(r["name"], width=140, size=12, no_wrap=True),
+                ft.Text(detail, size=12, color=color, font_family="monospace", selectable=True, expand=True),
+            ]))
+        if res["pathological"]:
+            w = res["pathological"]
+            rx_res.controls.append(ft.Text(
+                f"Pathological {w['pattern']} on {w['input']}: re {w['re_ms']:,.1f} ms vs linear {w['linear_ms']:,.2f} ms",
+                size=12, color=ft.Colors.CYAN_200
+            ))
+        page.update()
+
+    async def rx_engine_change(e):
+        rx_refresh_lint()
         page.update()
 
     async def rx_clear(e):
+        rx_exit_file_mode(update=False)
         rx_p.value = ""
         rx_t.value = ""
         rx_dd.value = None
+        rx_refresh_lint()
         rx_res.controls.clear()
         page.update()
 
     async def rx_load_path(e):
+        from utils import read_file_preview, expand_log_paths
         if not rx_f.value: return
-        try:
-            with open(rx_f.value, "r") as f:
-                rx_t.value = f.read()
+        path = rx_f.value.strip()
+        files = expand_log_paths(path)
+        if files and (len(files) > 1 or files[0] != path or path.endswith(".gz")):
+            # Multi-file mode: globs, directories and .gz files are searched by the parallel pool
+            sizes = [os.path.getsize(f) for f in files]
+            rx_state["path"] = path
+            rx_state["multi"] = True
+            rx_t.value = "\n".join(f"{f}  ({b / 1e6:,.1f} MB)" for f, b in zip(files[:200], sizes))
+            rx_t.label = "Files (Run Test searches all of them in parallel)"
+            rx_t.read_only = True
+            rx_file_info.value = f"Multi-file mode: {len(files)} files ({sum(sizes) / 1e6:,.1f} MB)"
+            rx_file_bar.visible = True
             page.update()
-        except Exception as ex:
+            return
+        rx_state["multi"] = False
+        # File mode: only a preview is shown, Run Test streams the whole file
+        res = read_file_preview(path)
+        if "error" in res:
             rx_res.controls.clear()
-            rx_res.controls.append(ft.Text(f"Error: {ex}", color="red"))
+            rx_res.controls.append(ft.Text(f"Error: {res['error']}", color="red"))
             page.update()
+            return
+        rx_state["path"] = path
+        rx_t.value = res["text"]
+        rx_t.label = "File Preview (Run Test searches the whole file)"
+        rx_t.read_only = True
+        rx_file_info.value = f"File mode: {path} ({res['bytes'] / 1e6:,.1f} MB)"
+        rx_file_bar.visible = True
+        page.update()
 
     rx_dd = ft.Dropdown(
         label="Samples",
@@ -1117,6 +2537,8 @@ async def main(page: ft.Page):
         text_size=12
     )
     rx_dd.on_change = rx_load_sample
+    rx_p.on_change = rx_pattern_change
+    rx_engine_dd.on_change = rx_engine_change
 
     tab_regex = ft.Container(
         content=ft.Column([
@@ -1129,11 +2551,35 @@ async def main(page: ft.Page):
                 ], spacing=0)
             ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
             rx_p,
+            rx_lint,
             rx_t,
+            rx_file_bar,
             ft.Row([rx_f, ft.Button("Load Path", on_click=rx_load_path)]),
             ft.Row([
                 ft.Button("Run Test", icon=ft.Icons.PLAY_ARROW, on_click=rx_run_test),
                 ft.Button("Clear", icon=ft.Icons.DELETE, on_click=rx_clear),
+                rx_timeout_in,
+                rx_par_cb,
+                rx_engine_dd,
+                ft.IconButton(ft.Icons.COMPARE_ARROWS, on_click=rx_engine_bench_click, tooltip="Benchmark re vs linear engine on the samples"),
+            ]),
+            ft.Row([
+                rx_cmp,
+                ft.Column([
+                    ft.Button("Profile", icon=ft.Icons.SPEED, on_click=rx_profile_click),
+                    rx_corpus_cb,
+                ], spacing=2),
+                ft.Column([
+                    ft.Button("Classify", icon=ft.Icons.CATEGORY, on_click=rx_classify_click, tooltip="Label lines with every saved sample in one pass"),
+                    rx_all_labels_cb,
+                ], spacing=2),
+            ], vertical_alignment=ft.CrossAxisAlignment.START),
+            ft.Row([
+                rx_group_by,
+                rx_metric,
+                rx_fmt_dd,
+                rx_export_path,
+                ft.Button("Extract", icon=ft.Icons.TABLE_CHART, on_click=rx_extract_click, tooltip="Groups to typed columns with group-by aggregation"),
             ]),
             ft.Container(content=rx_res, expand=True, padding=10, border=ft.Border.all(1, "#333333"))
         ], spacing=10, expand=True),
@@ -1243,6 +2689,60 @@ async def main(page: ft.Page):
             nw_mss_res.color = ft.Colors.AMBER_300
         page.update()
 
+    fw_rules_in = ft.TextField(
+        label="Rules (Cisco ACL, iptables -A ..., or 'allow tcp 0.0.0.0/0 10.0.0.0/24 443')",
+        multiline=True, min_lines=8, max_lines=8, text_size=12, text_style=ft.TextStyle(font_family="monospace"), expand=True
+    )
+    fw_default_dd = ft.Dropdown(
+        label="Default Action",
+        options=[ft.dropdown.Option("deny", "Implicit Deny"), ft.dropdown.Option("permit", "Default Permit")],
+        value="deny",
+        width=180
+    )
+    fw_summary = ft.Text("", size=14, selectable=True)
+    fw_findings = ft.ListView(height=320, spacing=4)
+    fw_state = {"minimal": []}
+    fw_colors = {"shadowed": ft.Colors.RED_300, "redundant": ft.Colors.AMBER_300, "conflict": ft.Colors.ORANGE_300, "generalization": ft.Colors.BLUE_200}
+
+    async def nw_analyze_fw_click(e):
+        from utils import analyze_firewall_rules
+        if not fw_rules_in.value: return
+        fw_summary.value = "Analyzing..."
+        fw_summary.color = ft.Colors.GREY_400
+        page.update()
+        res = await asyncio.to_thread(analyze_firewall_rules, fw_rules_in.value, fw_default_dd.value)
+        fw_findings.controls.clear()
+        if "error" in res:
+            fw_state["minimal"] = []
+            fw_summary.value = f"Error: {res['error']}"
+            fw_summary.color = ft.Colors.RED_400
+            page.update()
+            return
+
+        fw_state["minimal"] = res["minimal"]
+        c = res["counts"]
+        fw_summary.value = (
+            f"{res['rules']:,} rules in {res['groups']} list(s) | {c['shadowed']} shadowed | {c['redundant']} redundant | "
+            f"{c['conflict']} conflicting | {c['generalization']} generalizations\n"
+            f"Minimal equivalent set: {len(res['minimal']):,} rules ({res['removed']:,} removable)"
+        )
+        fw_summary.color = ft.Colors.GREEN_400
+        for bad in res["invalid"][:50]:
+            fw_findings.controls.append(ft.Text(f"Line {bad['line']}: skipped ({bad['reason']}) {bad['text']}", size=12, color=ft.Colors.GREY_500))
+        for f in res["findings"]:
+            fw_findings.controls.append(ft.Column([
+                ft.Row([
+                    ft.Text(f"Line {f['line']}", size=12, weight="bold", width=80),
+                    ft.Text(f["type"].upper(), size=12, weight="bold", color=fw_colors[f["type"]], width=120),
+                    ft.Text(f"{f['detail']} (by {', '.join(str(b) for b in f['by'][:8])}{'...' if len(f['by']) > 8 else ''})", size=12, color=ft.Colors.GREY_400, expand=True),
+                ]),
+                ft.Text(f["text"], size=12, font_family="monospace", selectable=True),
+            ], spacing=2))
+        page.update()
+
+    async def nw_copy_fw_click(e):
+        await handle_copy_click(e, "\n".join(fw_state["minimal"]))
+
     tab_network = ft.Container(
         content=ft.Column([
             ft.Text("Network Operations Hub", size=20, weight="bold", color=ft.Colors.BLUE_200),
@@ -1257,6 +2757,16 @@ async def main(page: ft.Page):
             ft.Text("SD-WAN / Tunnel MSS Calculator", size=16, weight="bold"),
             ft.Row([nw_mtu_in, nw_tunnel_dd, ft.Button("Calculate", icon=ft.Icons.CALCULATE, on_click=nw_calc_mss_click)]),
             nw_mss_res,
+            ft.Divider(),
+            ft.Text("Firewall / ACL Rule Analyzer", size=16, weight="bold"),
+            fw_rules_in,
+            ft.Row([
+                fw_default_dd,
+                ft.Button("Analyze Rules", icon=ft.Icons.SECURITY, on_click=nw_analyze_fw_click),
+                ft.TextButton("Copy Minimal Set", icon=ft.Icons.COPY, on_click=nw_copy_fw_click),
+            ]),
+            fw_summary,
+            fw_findings,
         ], spacing=15, scroll=ft.ScrollMode.AUTO, expand=True),
         padding=20, expand=True
     )
@@ -1666,6 +3176,192 @@ async def main(page: ft.Page):
         u_tp_res.value = "Max Throughput: -"
         page.update()
 
+    u_hd_text = ft.TextField(label="Latency samples (one per line, or any text with numbers)", multiline=True, min_lines=3, max_lines=6, text_size=12, text_style=ft.TextStyle(font_family="monospace"))
+    u_hd_paths = ft.TextField(label="File path / glob (comma-separated, .gz ok)", expand=True, text_size=12)
+    u_hd_base = ft.TextField(label="Baseline (before) path / glob", expand=True, text_size=12)
+    u_hd_unit = ft.Dropdown(label="Unit", width=100, text_size=12, value="ms", options=[ft.dropdown.Option(u) for u in ["ns", "us", "ms", "s"]])
+    u_hd_col = ft.TextField(label="Column #", width=100, text_size=12, tooltip="0-based whitespace/comma column; empty = every number")
+    u_hd_res = ft.Text("Percentiles: -", size=14, weight="bold", color=ft.Colors.CYAN_200)
+    u_hd_pct = ft.Column(spacing=2)
+    u_hd_bars = ft.Column(spacing=1)
+
+    async def u_hd_click(e):
+        from utils import analyze_latencies
+        paths = [p.strip() for p in (u_hd_paths.value or "").split(",") if p.strip()]
+        base = [p.strip() for p in (u_hd_base.value or "").split(",") if p.strip()]
+        if not paths and not (u_hd_text.value or "").strip(): return
+        try:
+            column = int(u_hd_col.value) if (u_hd_col.value or "").strip() else None
+        except ValueError:
+            u_hd_res.value = "Error: Column must be an integer"
+            page.update()
+            return
+        u_hd_res.value = "Histogramming..."
+        page.update()
+        res = await asyncio.to_thread(analyze_latencies, u_hd_text.value, paths, baseline_paths=base, unit=u_hd_unit.value or "ms", column=column)
+        u_hd_pct.controls.clear()
+        u_hd_bars.controls.clear()
+        if "error" in res:
+            u_hd_res.value = f"Error: {res['error']}"
+            page.update()
+            return
+        cur, unit = res["current"], res["unit"]
+        u_hd_res.value = (
+            f"{cur['count']:,} samples | min {cur['min']:,.3f} | mean {cur['mean']:,.3f} | max {cur['max']:,.3f} {unit} "
+            f"({res['elapsed']:.2f}s, {len(cur['files'])} files)"
+            + (f" | {cur['rejected']:,} negative skipped" if cur["rejected"] else "")
+            + (f" | {cur['overflow']:,} clamped" if cur["overflow"] else "")
+        )
+        for name, value in cur["percentiles"].items():
+            delta = res.get("delta", {}).get(name)
+            u_hd_pct.controls.append(ft.Row([
+                ft.Text(name, size=12, width=60, font_family="monospace"),
+                ft.Text(f"{value:,.3f} {unit}", size=12, width=140, font_family="monospace"),
+                *([ft.Text(f"before {delta['before']:,.3f} → {delta['change']:+,.3f}" + (f" (x{delta['ratio']:.2f})" if delta["ratio"] else ""),
+                           size=12, color=ft.Colors.RED_300 if delta["change"] > 0 else ft.Colors.GREEN_300)] if delta else []),
+            ]))
+        peak = max([b["count"] for b in cur["bins"]] + [1])
+        for b in cur["bins"]:
+            u_hd_bars.controls.append(ft.Row([
+                ft.Text(f"{b['low']:>10,.3f}", size=11, width=100, font_family="monospace"),
+                ft.Container(width=max(1, 320 * b["count"] / peak) if b["count"] else 0, height=8, bgcolor=ft.Colors.CYAN_400),
+                ft.Text(f"{b['count']:,}" if b["count"] else "", size=11, color=ft.Colors.GREY_400),
+            ], spacing=8))
+        page.update()
+
+    async def u_hd_clear(e):
+        u_hd_text.value = ""
+        u_hd_paths.value = ""
+        u_hd_base.value = ""
+        u_hd_res.value = "Percentiles: -"
+        u_hd_pct.controls.clear()
+        u_hd_bars.controls.clear()
+        page.update()
+
+    u_slo_text = ft.TextField(label="CSV (timestamp,latency,status) or log lines", multiline=True, min_lines=3, max_lines=6, text_size=12, text_style=ft.TextStyle(font_family="monospace"))
+    u_slo_path = ft.TextField(label="Or file path (.gz ok)", expand=True, text_size=12)
+    u_slo_target = ft.TextField(label="SLO target", value="99.9% under 300 ms over 30d", width=260, text_size=12)
+    u_slo_windows = ft.TextField(label="Windows (span:burn alert)", value="1h:14.4, 6h:6, 3d:1", width=200, text_size=12)
+    u_slo_pattern = ft.TextField(label="Log regex (?P<ts>)(?P<latency>)(?P<status>) — empty for CSV", expand=True, text_size=12, text_style=ft.TextStyle(font_family="monospace"))
+    u_slo_res = ft.Text("Error Budget: -", size=14, weight="bold", color=ft.Colors.CYAN_200)
+    u_slo_rows = ft.Column(spacing=4)
+    u_slo_bars = ft.Column(spacing=1)
+
+    async def u_slo_click(e):
+        from utils import analyze_slo
+        if not (u_slo_text.value or "").strip() and not (u_slo_path.value or "").strip(): return
+        try:
+            windows = [(w.split(":")[0].strip(), float(w.split(":")[1])) for w in (u_slo_windows.value or "").split(",") if w.strip()]
+        except (IndexError, ValueError):
+            u_slo_res.value = "Error: Windows must look like 1h:14.4, 6h:6, 3d:1"
+            page.update()
+            return
+        u_slo_res.value = "Replaying..."
+        page.update()
+        res = await asyncio.to_thread(analyze_slo, u_slo_text.value, (u_slo_path.value or "").strip() or None, u_slo_target.value,
+                                      pattern=(u_slo_pattern.value or "").strip() or None, windows=windows)
+        u_slo_rows.controls.clear()
+        u_slo_bars.controls.clear()
+        if "error" in res:
+            u_slo_res.value = f"Error: {res['error']}"
+            page.update()
+            return
+        b = res["budget"]
+        u_slo_res.value = (
+            f"Budget remaining: {b['remaining']:.1%} ({b['consumed']:,} of {b['allowed']:,.0f} bad events allowed)"
+            + (f" | exhausted at {b['exhausted_at']}" if b["exhausted_at"] else "")
+            + f" | {res['events']:,} events ({res['errors']:,} errors, {res['slow']:,} slow), {res['skipped']:,} skipped"
+            + f" | {res['start']} → {res['end']} ({b['coverage']:.0%} of period, {res['elapsed']:.2f}s)"
+        )
+        for w in res["windows"]:
+            color = ft.Colors.RED_400 if w["firing"] else ft.Colors.ORANGE_300 if w["burn"] >= 1 else ft.Colors.GREEN_400
+            u_slo_rows.controls.append(ft.Row([
+                ft.Text(w["window"], size=12, width=40, font_family="monospace"),
+                ft.Container(width=max(2, 200 * min(w["burn"] / w["threshold"], 1.5)), height=10, bgcolor=color, border_radius=2),
+                ft.Text(
+                    f"burn {w['burn']:.2f}x (alert ≥{w['threshold']:g}x, peak {w['max_burn']:.2f}x) | {len(w['episodes'])} alert episodes, "
+                    f"{w['firing_s'] / 3600:,.1f}h firing"
+                    + (f" | exhausts {w['exhausts_at']}" if w["exhausts_at"] else "")
+                    + ("" if w["covered"] else " | stream shorter than window"),
+                    size=12, color=ft.Colors.GREY_300, selectable=True,
+                ),
+            ]))
+        stride = max(1, len(res["series"]) // 40)
+        for point in res["series"][::stride]:
+            left = max(0.0, min(point["budget"], 1.0))
+            u_slo_bars.controls.append(ft.Row([
+                ft.Text(point["time"][:16].replace("T", " "), size=11, width=120, font_family="monospace"),
+                ft.Container(width=max(1, 300 * left), height=8,
+                             bgcolor=ft.Colors.GREEN_400 if left > 0.5 else ft.Colors.ORANGE_300 if left > 0 else ft.Colors.RED_400),
+                ft.Text(f"{point['budget']:.1%}", size=11, color=ft.Colors.GREY_400),
+            ], spacing=8))
+        page.update()
+
+    async def u_slo_clear(e):
+        u_slo_text.value = ""
+        u_slo_path.value = ""
+        u_slo_res.value = "Error Budget: -"
+        u_slo_rows.controls.clear()
+        u_slo_bars.controls.clear()
+        page.update()
+
+    u_q_rate = ft.TextField(label="Arrival rate (req/s)", width=150, text_size=12)
+    u_q_svc = ft.TextField(label="Service time (ms)", width=150, text_size=12)
+    u_q_srv = ft.TextField(label="Servers / workers", width=140, text_size=12)
+    u_q_target = ft.TextField(label="Target p99 wait (ms)", width=150, text_size=12)
+    u_q_model = ft.Dropdown(label="Model", width=130, text_size=12, value="M/M/c", options=[ft.dropdown.Option("M/M/c"), ft.dropdown.Option("M/D/c")])
+    u_q_res = ft.Text("Queue: -", size=14, weight="bold", color=ft.Colors.CYAN_200)
+    u_q_bars = ft.Column(spacing=1)
+
+    async def u_q_click(e):
+        if not u_q_rate.value or not u_q_svc.value or not u_q_srv.value: return
+        from utils import calculate_queueing
+        res = calculate_queueing(u_q_rate.value, u_q_svc.value, u_q_srv.value, model=u_q_model.value or "M/M/c",
+                                 target_wait_ms=(u_q_target.value or "").strip() or None)
+        u_q_bars.controls.clear()
+        if "error" in res:
+            u_q_res.value = f"Error: {res['error']}"
+            page.update()
+            return
+        cur = res["current"]
+        if cur is None:
+            u_q_res.value = f"Unstable: offered load {res['offered_load']:,.2f} Erlangs needs at least {res['min_servers']} servers"
+        else:
+            u_q_res.value = (
+                f"Utilization {cur['utilization']:.1%} | P(wait) {cur['wait_probability']:.1%} | mean wait {cur['mean_wait']:,.2f} ms | "
+                f"p99 wait {cur['quantile_wait']:,.2f} ms | queue {cur['queue_length']:,.2f} | response {cur['mean_response']:,.2f} ms"
+            )
+        if res.get("target_met"):
+            u_q_res.value += f" | {res['servers_for_target']} servers meet the p99 target"
+        elif "target_met" in res:
+            u_q_res.value += f" | p99 target not met with up to {res['servers_searched']} servers"
+        if res["knee"]:
+            u_q_res.value += f" | knee at {res['knee']['utilization']:.0%} ({res['knee']['arrival_rate']:,.1f} req/s)"
+        points = res["sweep"][::3] + ([res["sweep"][-1]] if (len(res["sweep"]) - 1) % 3 else [])
+        peak = max(p["mean_response"] for p in points)
+        knee = res["knee"]["utilization"] if res["knee"] else 2
+        here = cur["utilization"] if cur else None
+        for p in points:
+            # log scale so the flat start and the knee both stay readable
+            width = 320 * math.log1p(p["mean_response"]) / math.log1p(peak)
+            color = ft.Colors.RED_400 if p["utilization"] >= knee else ft.Colors.CYAN_400
+            mark = here is not None and abs(p["utilization"] - here) < 0.015
+            u_q_bars.controls.append(ft.Row([
+                ft.Text(f"{p['utilization']:>4.0%}", size=11, width=45, font_family="monospace", weight="bold" if mark else None),
+                ft.Container(width=max(1, width), height=8, bgcolor=ft.Colors.AMBER_400 if mark else color),
+                ft.Text(f"{p['mean_response']:,.1f} ms (p99 wait {p['quantile_wait']:,.1f})", size=11, color=ft.Colors.GREY_400),
+            ], spacing=8))
+        page.update()
+
+    async def u_q_clear(e):
+        u_q_rate.value = ""
+        u_q_svc.value = ""
+        u_q_srv.value = ""
+        u_q_target.value = ""
+        u_q_res.value = "Queue: -"
+        u_q_bars.controls.clear()
+        page.update()
+
     tab_units = ft.Container(
         content=ft.Column([
             ft.Text("SRE Units Converter", size=20, weight="bold", color=ft.Colors.CYAN_200),
@@ -1684,6 +3380,28 @@ async def main(page: ft.Page):
                 ft.Row([u_tp_lat, u_tp_win, ft.Button("Calculate", on_click=u_tp_click), ft.IconButton(ft.Icons.CLEAR, on_click=u_tp_clear)]),
                 u_tp_res
             ]), padding=15)),
+            ft.Card(ft.Container(ft.Column([
+                ft.Text("Queueing / Worker Pool Sizing (Erlang-C)", weight="bold"),
+                ft.Row([u_q_rate, u_q_svc, u_q_srv, u_q_model, u_q_target, ft.Button("Calculate", on_click=u_q_click), ft.IconButton(ft.Icons.CLEAR, on_click=u_q_clear)]),
+                u_q_res,
+                u_q_bars,
+            ]), padding=15)),
+            ft.Card(ft.Container(ft.Column([
+                ft.Text("Latency Percentiles (HDR Histogram)", weight="bold"),
+                u_hd_text,
+                ft.Row([u_hd_paths, u_hd_base, u_hd_unit, u_hd_col, ft.Button("Analyze", on_click=u_hd_click), ft.IconButton(ft.Icons.CLEAR, on_click=u_hd_clear)]),
+                u_hd_res,
+                ft.Row([u_hd_pct, u_hd_bars], vertical_alignment=ft.CrossAxisAlignment.START, spacing=30),
+            ]), padding=15)),
+            ft.Card(ft.Container(ft.Column([
+                ft.Text("SLO Error Budget & Burn Rates", weight="bold"),
+                u_slo_text,
+                ft.Row([u_slo_path, u_slo_target, u_slo_windows, ft.Button("Replay", on_click=u_slo_click), ft.IconButton(ft.Icons.CLEAR, on_click=u_slo_clear)]),
+                u_slo_pattern,
+                u_slo_res,
+                u_slo_rows,
+                u_slo_bars,
+            ]), padding=15)),
         ], spacing=15, scroll=ft.ScrollMode.AUTO),
         padding=20, expand=True
     )
@@ -1754,6 +3472,7 @@ async def main(page: ft.Page):
         ("units", "Units Converter", ft.Icons.CALCULATE, tab_units),
         ("iam", "IAM Simulator", ft.Icons.POLICY, tab_iam),
         ("cidr", "CIDR Calculator", ft.Icons.NETWORK_CHECK, tab_cidr),
+        ("logs", "Log Analytics", ft.Icons.ANALYTICS, tab_logs),
         ("k8sarch", "K8s Architect", ft.Icons.GRID_VIEW, tab_k8s_architect),
         ("sslaudit", "SSL Site Auditor", ft.Icons.LOCK, tab_ssl_auditor),
         ("regex", "Regex Tester", ft.Icons.BUG_REPORT, tab_regex),
@@ -1907,4 +3626,7 @@ async def main(page: ft.Page):
 # since the suggested replacement (ft.Clipboard) is not recognized by the client.
 warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*clipboard is deprecated.*")
 
-ft.run(main, assets_dir="assets")
+if __name__ == "__main__":
+    # Regex runs use worker processes; needed for frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    ft.run(main, assets_dir="assets")
@@ -1,5 +1,17 @@
 import unittest
 from utils import epoch_to_datetime, datetime_to_epoch, format_json, minify_json, base64_encode, base64_decode
+from utils import decode_time_ordered_ids, find_duplicate_ids, match_ips_to_cidrs
+from utils import calculate_cidr_advanced, iter_sibling_subnets, analyze_prefix_lists, find_free_space
+from utils import plan_vlsm, export_vlsm_plan, analyze_firewall_rules, generate_ptr_zone
+from utils import analyze_log_ips, search_file_regex
+from utils import lint_regex, run_regex_guarded, profile_regex, sample_corpus, classify_lines
+from utils import extract_regex_table, parallel_search_regex
+from utils import linear_regex_support
+from utils import test_regex_linear as linear_test_regex  # aliased so pytest doesn't collect it
+from utils import analyze_access_log, SpaceSaving, HyperLogLog
+from utils import fingerprint_stack_traces
+from utils import normalize_log_timestamps, merge_logs_by_time, convert_epoch_column
+from utils import LatencyHistogram, analyze_latencies, parse_slo_target, analyze_slo, calculate_queueing
 
 class TestUtils(unittest.TestCase):
     def test_epoch_to_datetime(self):
@@ -27,5 +39,623 @@ class TestUtils(unittest.TestCase):
         decoded = base64_decode(encoded)
         self.assertEqual(decoded, plain)
 
+    def test_decode_time_ordered_ids(self):
+        # UUIDv7 minted at 1700000000000 ms, ULID minted 1 ms earlier
+        text = (
+            "req=018bcfe5-6800-7abc-8def-0123456789ab status=200\n"
+            "req=01HF7YASZZZZZZZZZZZZZZZZZZ status=500"
+        )
+        res = decode_time_ordered_ids(text=text)
+        self.assertEqual(res["count"], 2)
+        self.assertEqual([r["type"] for r in res["rows"]], ["ULID", "UUIDv7"])
+        self.assertEqual(res["rows"][1]["ms"], 1700000000000)
+        self.assertEqual(res["rows"][1]["line"], 1)
+        self.assertIn("2023-11-14", res["first"])
+        self.assertEqual(res["rejected"], 0)
+        # The max ULID decodes to year 10889: a look-alike, not an ID; a 2099 ULID keeps its date
+        res = decode_time_ordered_ids(text="7ZZZZZZZZZZZZZZZZZZZZZZZZZ 01HF7YASZZZZZZZZZZZZZZZZZZ 03PFAH5B00ZZZZZZZZZZZZZZZZ")
+        self.assertEqual((res["count"], res["rejected"]), (2, 1))
+        self.assertTrue(res["first"].startswith("2023-11-14"))
+        self.assertTrue(res["last"].startswith("2099-"), res["last"])
+
+    def test_find_duplicate_ids(self):
+        import os, tempfile
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("\n".join(["a", "b", "c", "b", "d", "a", "b"]) + "\n")
+        try:
+            for mode in ("bloom", "sort"):
+                res = find_duplicate_ids(f.name, mode=mode, chunk_lines=2)
+                self.assertEqual(res["total"], 7)
+                self.assertEqual({d["id"]: d["lines"] for d in res["duplicates"]}, {"a": [1, 6], "b": [2, 4, 7]})
+        finally:
+            os.unlink(f.name)
+
+    def test_match_ips_to_cidrs(self):
+        import os, tempfile
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("10.1.2.3\n10.200.0.1\n8.8.8.8\n2001:db8::1\nnot-an-ip\n")
+        try:
+            res = match_ips_to_cidrs("10.0.0.0/8\n10.200.0.0/16\n2001:db8::/32", f.name)
+            hits = {h["cidr"]: h["count"] for h in res["hits"]}
+            # Overlapping CIDRs resolve to the most specific prefix
+            self.assertEqual(hits, {"10.0.0.0/8": 1, "10.200.0.0/16": 1, "2001:db8::/32": 1})
+            self.assertEqual(res["unmatched_sample"], ["8.8.8.8"])
+            self.assertEqual(res["invalid"], 1)
+        finally:
+            os.unlink(f.name)
+
+    def test_calculate_cidr_advanced_ipv6(self):
+        res = calculate_cidr_advanced("2001:db8::20c:29ff:fe44:a321/64")
+        self.assertEqual(res["network"], "2001:db8::")
+        self.assertTrue(res["reverse_dns"].endswith("8.b.d.0.1.0.0.2.ip6.arpa"))
+        self.assertIn("00:0c:29:44:a3:21", res["eui64"])
+        self.assertEqual((res["sibling_parent"], res["sibling_count"]), ("2001:db8::/48", 65536))
+
+        # Siblings are generated lazily from any page offset
+        page = list(iter_sibling_subnets(res["sibling_parent"], 64, start=65535))
+        self.assertEqual([s["net"] for s in page], ["2001:db8:0:ffff::"])
+
+        res = calculate_cidr_advanced("49.206.128.42", "/30")
+        self.assertEqual((res["sibling_parent"], res["sibling_index"]), ("49.206.128.0/24", 10))
+        self.assertEqual(res["reverse_dns"], "42.128.206.49.in-addr.arpa")
+
+    def test_analyze_prefix_lists(self):
+        res = analyze_prefix_lists("10.0.0.0/24\n10.0.1.0/24\n10.0.0.0/25  # dup\nbogus", "10.0.0.0/22\n10.0.1.0/24")
+        self.assertEqual(res["aggregated"], ["10.0.0.0/23"])
+        self.assertEqual(res["invalid"], ["bogus"])
+        self.assertEqual(res["overlaps"][0]["inner"], "10.0.0.0/25")
+        self.assertEqual(res["diff"]["added"], ["10.0.0.0/22"])
+        self.assertEqual(res["diff"]["newly_covered"], ["10.0.2.0/23"])
+        self.assertEqual(res["diff"]["no_longer_covered"], [])
+
+    def test_find_free_space(self):
+        res = find_free_space("10.0.0.0/16", "10.0.0.0/24\n10.0.1.5\n10.0.4.0/22\n10.0.128.0/17\n192.168.0.1", "/24")
+        self.assertEqual(res["used"], 256 + 1 + 1024 + 32768)
+        self.assertEqual(res["outside"], ["192.168.0.1/32"])
+        self.assertEqual(res["free_blocks"][0]["cidr"], "10.0.64.0/18")
+        self.assertEqual(res["request"]["first_fit"], "10.0.2.0/24")
+        self.assertEqual(res["request"]["best_fit_block"], "10.0.2.0/23")
+        self.assertEqual(res["request"]["fit_count"], 122)
+
+        # Cost depends on the allocations, not the size of the parent
+        res = find_free_space("10.0.0.0/8", "10.0.0.1", 30)
+        self.assertEqual(res["request"]["first_fit"], "10.0.0.4/30")
+        self.assertEqual(res["largest"], "/9")
+
+    def test_plan_vlsm(self):
+        res = plan_vlsm("10.0.0.0/22", "1 of 60 web, 2 subnets of 200 hosts, 2 x /30 links, 2 of 2000")
+        self.assertEqual([r["cidr"] for r in res["rows"]], [
+            "10.0.0.0/24", "10.0.1.0/24", "10.0.2.0/26", "10.0.2.64/30", "10.0.2.68/30"
+        ])
+        self.assertEqual(res["rows"][2]["name"], "web")
+        self.assertEqual(len(res["failed"]), 2)
+        self.assertEqual(res["leftover"], ["10.0.2.72/29", "10.0.2.80/28", "10.0.2.96/27", "10.0.2.128/25", "10.0.3.0/24"])
+        self.assertTrue(export_vlsm_plan(res).startswith("name,cidr,first,last"))
+
+        res = plan_vlsm("2001:db8::/48", "4 x /64")
+        self.assertEqual(res["rows"][-1]["cidr"], "2001:db8:0:3::/64")
+        import json
+        self.assertEqual(len(json.loads(export_vlsm_plan(res, "json"))["rows"]), 4)
+
+    def test_analyze_firewall_rules(self):
+        rules = "\n".join([
+            "access-list 101 permit tcp 10.0.0.0 0.0.255.255 any eq 443",
+            "access-list 101 permit tcp host 10.0.1.5 any eq https",
+            "access-list 101 deny tcp 10.0.0.0 0.0.0.255 any range 400 500",
+            "access-list 101 deny ip 10.0.0.0 0.0.0.255 any",
+            "access-list 101 permit ip 10.0.0.0 0.0.0.3 any",
+            "access-list 101 permit ip any any",
+            "access-list 101 permit tcp 10.0.0.0 0.255.0.255 any",
+        ])
+        res = analyze_firewall_rules(rules)
+        types = {f["line"]: f["type"] for f in res["findings"]}
+        self.assertEqual(types, {2: "redundant", 3: "conflict", 4: "conflict", 5: "shadowed", 6: "generalization"})
+        self.assertEqual(res["invalid"][0]["line"], 7)
+        self.assertEqual(len(res["minimal"]), 4)
+
+        # An opposite rule whose overlap is already taken by a same-action rule hides nothing
+        res = analyze_firewall_rules("\n".join([
+            "access-list 102 permit ip 10.0.0.0 0.0.0.255 any",
+            "access-list 102 deny tcp host 10.0.0.5 any eq 22",
+            "access-list 102 permit tcp 10.0.0.0 0.0.0.7 any",
+        ]))
+        found = {f["line"]: (f["type"], f["by"]) for f in res["findings"]}
+        self.assertEqual(found[2], ("shadowed", [1]))
+        self.assertEqual(found[3], ("redundant", [1]))
+
+        # A rule that only repeats the default decision is removable
+        res = analyze_firewall_rules("-A INPUT -p tcp --dport 20:30 -j DROP\nallow tcp 0.0.0.0/0 10.0.0.0/24 443")
+        self.assertEqual([f["line"] for f in res["findings"]], [1])
+        self.assertEqual(res["groups"], 2)
+
+        # Interface and state matches are not modelled, so those rules must not shadow others
+        res = analyze_firewall_rules("\n".join([
+            "-A INPUT -i lo -j ACCEPT",
+            "-A INPUT -m conntrack --ctstate ESTABLISHED,RELATED -j ACCEPT",
+            "-A INPUT -p tcp --dport 22 -s 10.0.0.0/8 -j ACCEPT",
+            "-A INPUT -p tcp --dport 22 -j DROP",
+            "-A INPUT -j DROP",
+        ]))
+        self.assertEqual([r["line"] for r in res["invalid"]], [1, 2])
+        self.assertIn("-i", res["invalid"][0]["reason"])
+        self.assertEqual(res["counts"]["shadowed"], 0)
+        self.assertEqual({f["line"] for f in res["findings"]}, {4, 5})
+
+    def test_generate_ptr_zone(self):
+        import os, tempfile
+        with tempfile.NamedTemporaryFile("w", suffix=".zone", delete=False) as f:
+            path = f.name
+        try:
+            res = generate_ptr_zone("10.1.0.0/16", "host-{ip}.example.com", path)
+            self.assertEqual((res["zone"], res["written"]), ("1.10.in-addr.arpa", 65536))
+            with open(path) as zf:
+                lines = zf.read().splitlines()
+            self.assertEqual(lines[0], "$ORIGIN 1.10.in-addr.arpa.")
+            self.assertEqual(lines[-1], "255.255\tIN\tPTR\thost-10-1-255-255.example.com.")
+        finally:
+            os.unlink(path)
+
+        res = generate_ptr_zone("192.0.2.64/26", "h{d}.example.com", classless=True)
+        self.assertEqual(res["zone"], "64/26.2.0.192.in-addr.arpa")
+        self.assertEqual(res["preview"][2], "64\tIN\tPTR\th64.example.com.")
+        self.assertEqual(res["delegation"][0], "64\tIN\tCNAME\t64.64/26.2.0.192.in-addr.arpa.")
+        self.assertEqual(res["parent_zone"], "2.0.192.in-addr.arpa")
+        # a /32 still delegates from the /24 parent; the host octet is not part of it
+        res = generate_ptr_zone("192.0.2.5/32", "h{d}.example.com", classless=True)
+        self.assertEqual((res["zone"], res["parent_zone"]), ("5/32.2.0.192.in-addr.arpa", "2.0.192.in-addr.arpa"))
+        self.assertEqual(res["delegation"], ["5\tIN\tCNAME\t5.5/32.2.0.192.in-addr.arpa."])
+        self.assertEqual(res["preview"][2], "5\tIN\tPTR\th5.example.com.")
+
+        res = generate_ptr_zone("2001:db8::/120", "v6-{ip}.example.com")
+        self.assertTrue(res["zone"].endswith("8.b.d.0.1.0.0.2.ip6.arpa"))
+        self.assertEqual(res["preview"][3], "1.0\tIN\tPTR\tv6-2001-db8--1.example.com.")
+
+    def test_analyze_log_ips(self):
+        import os, tempfile
+        lines = [
+            '10.0.0.1 - - [21/Mar/2024:10:15:30 +0000] "GET / HTTP/1.1" 200',
+            '10.0.0.1 - - [21/Mar/2024:10:15:31 +0000] "GET / HTTP/1.1" 200',
+            '10.0.0.7 - - [21/Mar/2024:10:15:32 +0000] "GET / HTTP/1.1" 200',
+            '8.8.8.8 - - [21/Mar/2024:10:15:33 +0000] "GET / HTTP/1.1" 404',
+            '2001:4860::8888 - - [21/Mar/2024:10:15:34 +0000] "GET / HTTP/1.1" 200',
+            'upstream 127.0.0.1:8080 timed out; bogus 999.1.1.1',
+            '2001:db8:1:2:3:4:5:6 - - [21/Mar/2024:10:15:35 +0000] "GET / HTTP/1.1" 200',
+            'agent version 1.2.3.4.5 build v9.8.7.6 started',
+            'at std::vector<int>::at, Tab::add(), String::valueOf(x)',
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as f:
+            f.write("\n".join(lines) + "\n")
+        try:
+            res = analyze_log_ips(f.name, prefix_len=24, top_k=3, chunk_bytes=64)
+            self.assertEqual(res["lines"], 9)
+            self.assertEqual(res["ipv4"], {"total": 5, "distinct": 4})
+            self.assertEqual(res["ipv6"], {"total": 2, "distinct": 2})
+            self.assertEqual(res["rejected"], 1)
+            self.assertEqual(res["split"]["private"], {"hits": 3, "distinct": 2})
+            self.assertEqual(res["split"]["public"], {"hits": 2, "distinct": 2})
+            self.assertEqual(res["split"]["reserved"], {"hits": 2, "distinct": 2})
+            self.assertEqual(res["top_prefixes"][0], {"prefix": "10.0.0.0/24", "hits": 3, "distinct": 2})
+        finally:
+            os.unlink(f.name)
+        # scope-resolution operators are not compressed IPv6 addresses
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as f:
+            f.write("std::vector\nTab::add\nString::valueOf\n")
+        try:
+            self.assertEqual(analyze_log_ips(f.name)["ipv6"], {"total": 0, "distinct": 0})
+        finally:
+            os.unlink(f.name)
+
+    def test_search_file_regex(self):
+        import os, tempfile
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as f:
+            f.write("GET /a 200\nGET /b 500\nnoise\nGET /c 500 500\n")
+        try:
+            res = search_file_regex(r"\b(5\d\d)\b", f.name, sample_limit=2)
+            self.assertEqual((res["lines"], res["matches"], res["matching_lines"]), (4, 3, 2))
+            self.assertEqual(res["line_numbers"], [2, 4])
+            self.assertEqual([(m["line"], m["groups"]) for m in res["samples"]], [(2, ("500",)), (4, ("500",))])
+            self.assertTrue(res["truncated"])
+            self.assertIn("error", search_file_regex("(", f.name))
+        finally:
+            os.unlink(f.name)
+
+    def test_run_regex_guarded(self):
+        self.assertTrue(lint_regex("(a+)+$")["warnings"])
+        self.assertTrue(lint_regex(".*.*=")["warnings"])
+        self.assertEqual(lint_regex(r"^\d{3}-\d{4}$")["warnings"], [])
+        self.assertIn("error", run_regex_guarded("("))
+
+        ok = run_regex_guarded(r"\d+", "a1\nb22")
+        self.assertEqual([m["match"] for m in ok["matches"]], ["1", "22"])
+        capped = run_regex_guarded(r"\d", "123456", max_matches=3)
+        self.assertEqual(capped["count"], 3)
+        self.assertIn("budget", capped)
+
+        res = run_regex_guarded("(a+)+$", "ok\n" + "a" * 40 + "!", timeout_ms=200)
+        self.assertTrue(res.get("timeout"))
+        self.assertIn("timed out after 200 ms", res["error"].lower())
+        self.assertLess(res["elapsed_ms"], 5000)
+
+    def test_profile_regex(self):
+        corpus = sample_corpus({"a": ["x", "GET /a 200\nGET /b 500\n"], "b": ["y", "noise"]})
+        self.assertEqual(corpus, "GET /a 200\nGET /b 500\nnoise")
+        res = profile_regex([r"\b5\d\d\b", r" (5\d\d)$", "("], corpus, slow_k=2, min_seconds=0, max_passes=3)
+        self.assertEqual((res["lines"], res["passes"]), (3, 1))
+        fast, anchored, bad = res["results"]
+        self.assertEqual((fast["matches"], fast["matching_lines"]), (1, 1))
+        self.assertEqual(anchored["matches"], 1)
+        self.assertIn("error", bad)
+        self.assertEqual(len(fast["slowest"]), 2)
+        self.assertEqual(min(fast["relative"], anchored["relative"]), 1.0)
+        self.assertGreater(fast["lines_per_sec"], 0)
+
+    def test_classify_lines(self):
+        patterns = {
+            "nginx": r'(?P<ip>\d+\.\d+\.\d+\.\d+) - - \[(.*?)\] "(.*?)" (\d{3})',
+            "ipv4": r"\b(?:\d{1,3}\.){3}\d{1,3}\b",
+            "jvm": r"at\s+([\w\.]+)\(([\w\.]+):(\d+)\)",
+        }
+        text = "\n".join([
+            '10.0.0.1 - - [21/Mar/2024:10:15:30 +0000] "GET / HTTP/1.1" 200',
+            "at com.example.App.main(App.java:10)",
+            "peer 10.0.0.2 down",
+            "nothing to see",
+        ])
+        res = classify_lines(patterns, text)
+        self.assertTrue(res["single_pass"])
+        self.assertEqual([p["count"] for p in res["patterns"]], [1, 1, 1])
+        self.assertEqual((res["matched"], res["unmatched"]), (3, 1))
+        self.assertEqual(res["unmatched_samples"], [{"line": 4, "text": "nothing to see"}])
+        exact = classify_lines(patterns, text, all_labels=True)
+        self.assertEqual([p["count"] for p in exact["patterns"]], [1, 2, 1])
+        self.assertEqual(exact["multi_label"], [{"labels": ["nginx", "ipv4"], "count": 1}])
+        # backreferences cannot be folded into the gate; per-pattern checks still work
+        self.assertFalse(classify_lines({"dup": r"(\w+) \1"}, "a a\nb c")["single_pass"])
+        self.assertEqual(classify_lines({"dup": r"(\w+) \1"}, "a a\nb c")["matched"], 1)
+        # one uncombinable pattern keeps the gate for the rest, and leftmost still wins across both
+        mixed = dict(patterns, dup=r"\b(\w+) \1\b")
+        res = classify_lines(mixed, text + "\nerror error at 10.0.0.3")
+        self.assertFalse(res["single_pass"])
+        self.assertEqual(res["individual"], 1)
+        self.assertEqual([p["combined"] for p in res["patterns"]], [True, True, True, False])
+        self.assertEqual([p["count"] for p in res["patterns"]], [1, 1, 1, 1])
+        self.assertEqual(res["patterns"][3]["examples"][0]["line"], 5)
+        exact = classify_lines(mixed, text + "\nerror error at 10.0.0.3", all_labels=True)
+        self.assertEqual([p["count"] for p in exact["patterns"]], [1, 3, 1, 1])
+
+    def test_extract_regex_table(self):
+        import json, os, tempfile
+        text = "\n".join([
+            '10.0.0.1 - - [x] "GET /" 200 100',
+            '10.0.0.2 - - [x] "GET /a" 404 -',
+            '10.0.0.1 - - [x] "GET /b" 200 300',
+        ])
+        pattern = r'(?P<ip>\S+) - - \[.*?\] "(.*?)" (?P<status>\d{3}) (\S+)'
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as f:
+            out = f.name
+        try:
+            res = extract_regex_table(pattern, text, output_path=out, fmt="ndjson", group_by="status", metric="g4")
+            self.assertEqual([(c["name"], c["type"]) for c in res["columns"]],
+                             [("ip", "str"), ("g2", "str"), ("status", "int"), ("g4", "str")])
+            self.assertEqual(res["rows"], 3)
+            self.assertEqual(res["top"], [{"value": 200, "count": 2, "sum": 400, "avg": 200.0},
+                                          {"value": 404, "count": 1, "sum": 0, "avg": None}])
+            self.assertEqual((res["metric"]["count"], res["metric"]["avg"], res["metric"]["p50"]), (2, 200.0, 200.0))
+            with open(out) as f:
+                rows = [json.loads(l) for l in f]
+            self.assertEqual(rows[0], {"ip": "10.0.0.1", "g2": "GET /", "status": 200, "g4": 100})
+        finally:
+            os.unlink(out)
+        self.assertIn("error", extract_regex_table(r"\d+", "1"))
+        self.assertIn("error", extract_regex_table(r"(\d+)", "1", group_by="nope"))
+
+    def test_parallel_search_regex(self):
+        import gzip, os, shutil, tempfile
+        folder = tempfile.mkdtemp()
+        try:
+            plain = "".join(f"req {i} status={500 if i % 7 == 0 else 200}\n" for i in range(1, 301))
+            with open(os.path.join(folder, "a.log"), "w") as f:
+                f.write(plain + "tail status=503")
+            with gzip.open(os.path.join(folder, "b.log.gz"), "wt") as f:
+                f.write("ok\nstatus=502\n")
+            res = parallel_search_regex(r"status=(5\d\d)", os.path.join(folder, "*"), workers=2, chunk_bytes=100,
+                                        sample_limit=1000, line_number_limit=1000)
+            self.assertGreater(res["chunks"], 10)
+            self.assertEqual([f["lines"] for f in res["files"]], [301, 2])
+            expected = [("a.log", n) for n in range(7, 301, 7)] + [("a.log", 301), ("b.log.gz", 2)]
+            self.assertEqual([(os.path.basename(n["path"]), n["line"]) for n in res["line_numbers"]], expected)
+            self.assertEqual(res["samples"][-1]["groups"], ("502",))
+            self.assertIn("error", parallel_search_regex("x", os.path.join(folder, "*.none")))
+            # a catastrophic line stalls its worker; the pool is terminated instead of hanging
+            with open(os.path.join(folder, "c.log"), "w") as f:
+                f.write("aaa\n" + "a" * 40 + "b\n")
+            res = parallel_search_regex(r"(a+)+$", os.path.join(folder, "c.log"), stall_ms=300)
+            self.assertTrue(res["timeout"])
+            self.assertIn("on line 2 of", res["error"])
+            # corrupt deflate data surfaces as zlib.error from the worker
+            data = bytearray(gzip.compress(bytes(range(256)) * 20))
+            data[20:40] = b"\xff" * 20
+            with open(os.path.join(folder, "d.log.gz"), "wb") as f:
+                f.write(data)
+            self.assertIn("decompressing", parallel_search_regex("x", os.path.join(folder, "d.log.gz"))["error"])
+            # CRLF and CR-only endings split into the same lines as the sequential search
+            with open(os.path.join(folder, "e.log"), "w", newline="") as f:
+                f.write("".join(f"req {i} status={500 if i % 3 == 0 else 200}" + ("\r" if i % 2 else "\r\n") for i in range(1, 41)))
+            seq = search_file_regex(r"status=5\d\d\s$", os.path.join(folder, "e.log"))
+            par = parallel_search_regex(r"status=5\d\d\s$", os.path.join(folder, "e.log"), workers=2, chunk_bytes=64)
+            self.assertEqual((par["lines"], par["matches"]), (seq["lines"], seq["matches"]))
+            self.assertEqual([n["line"] for n in par["line_numbers"]], seq["line_numbers"])
+            self.assertEqual(seq["line_numbers"], list(range(3, 41, 3)))
+        finally:
+            shutil.rmtree(folder)
+
+    def test_regex_linear(self):
+        import re
+        self.assertEqual(linear_regex_support(r"(\w+) \1")["unsupported"], ["backreferences (\\1, (?P=name))"])
+        self.assertFalse(linear_regex_support(r"a(?=b)")["supported"])
+        self.assertIn("error", linear_test_regex(r"(\w+) \1", "a a"))
+
+        text = "10.0.0.1 - GET /a 200\nab ab aab\n\nx_y 1.5 end\n(a+)+$ aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa!"
+        for pattern in [r"(\d+)\.(\d+)", r"(?i)A+B", r"\bab\b", r"\B_", r"^\w+", r"end$", r"a*?b", r"(a|ab)(c|bcd)?",
+                        r"(?P<word>[a-z]+)\s", r"[^\d\s]{2,3}", r"x?"]:
+            expected = [(m.group(), m.groups()) for line in text.split("\n") for m in re.finditer(pattern, line)]
+            res = linear_test_regex(pattern, text)
+            self.assertEqual([(m["match"], m["groups"]) for m in res["matches"]], expected, pattern)
+        # catastrophic for re (exponential in the run of a's); hard-coded rather than computed with re.finditer
+        self.assertEqual(linear_test_regex(r"(a+)+$", text)["matches"], [])
+        self.assertEqual([m["match"] for m in linear_test_regex(r"(a+)+$", "ok\n" + "a" * 40)["matches"]], ["a" * 40])
+        res = linear_test_regex(r"(\d+)", "a 12\nb 3")
+        self.assertEqual([(m["start"], m["end"]) for m in res["matches"]], [(2, 4), (7, 8)])
+        # the bounded DFA cache flushes but keeps answering correctly
+        small = linear_test_regex(r"[a-c]{1,6}x", "abcabcabx cab ax", max_states=3)
+        self.assertGreater(small["cache_flushes"], 0)
+        self.assertEqual([m["match"] for m in small["matches"]], ["cabcabx", "ax"])
+        # every match on one long line: a restart per match used to rescan to the line end (quadratic)
+        import time
+        started = time.perf_counter()
+        res = linear_test_regex(r"a.*b|a", "a" * 20000)
+        self.assertEqual((res["count"], res["matches"][-1]["start"]), (20000, 19999))
+        self.assertLess(time.perf_counter() - started, 5)
+
+    def test_analyze_access_log(self):
+        import gzip, os, tempfile
+        rows = [
+            ("10.0.0.1", "10:15:30", "/api/v1/health?x=1", 200, "curl/8.0"),
+            ("10.0.0.1", "10:15:59", "/api/v1/health", 200, "curl/8.0"),
+            ("10.0.0.2", "10:16:01", "/login", 500, "Mozilla/5.0"),
+            ("10.0.0.3", "11:16:01", "/api/v1/health", 404, "curl/8.0"),
+        ]
+        text = "".join(f'{ip} - - [21/Mar/2024:{t} +0000] "GET {p} HTTP/1.1" {st} 512 "-" "{ua}"\n' for ip, t, p, st, ua in rows)
+        with tempfile.NamedTemporaryFile(suffix=".log.gz", delete=False) as f:
+            f.write(gzip.compress((text + "garbage line\n").encode()))
+        try:
+            res = analyze_access_log(f.name, top_k=2, max_buckets=2, query_paths=["/login"])
+            self.assertEqual((res["lines"], res["parsed"], res["unparsed"]), (5, 4, 1))
+            self.assertEqual(res["top_paths"][0], {"key": "/api/v1/health", "count": 3, "error": 0, "estimate": 3})
+            self.assertEqual(res["top_ips"][0]["key"], "10.0.0.1")
+            self.assertEqual(res["distinct_clients"], 3)
+            self.assertEqual(res["path_queries"], {"/login": 1})
+            self.assertEqual(res["statuses"], [{"status": "200", "count": 2}, {"status": "404", "count": 1}, {"status": "500", "count": 1}])
+            # three distinct minutes do not fit 2 buckets, so the series coarsens instead of growing
+            self.assertGreater(res["bucket_minutes"], 1)
+            self.assertLessEqual(len(res["series"]), 2)
+            self.assertEqual(res["span_minutes"], 62)
+            self.assertEqual(sum(p["total"] for p in res["series"]), 4)
+            self.assertEqual(sum(p["5xx"] for p in res["series"]), 1)
+        finally:
+            os.unlink(f.name)
+
+        # Space-Saving keeps the heavy hitter and bounds every count's overestimate
+        ss = SpaceSaving(capacity=2)
+        for item in "abacadaeafa":
+            ss.add(item)
+        top = ss.top(2)
+        self.assertEqual(top[0], ("a", 6, 0))
+        self.assertTrue(all(c - err <= "abacadaeafa".count(k) <= c for k, c, err in top))
+        hll = HyperLogLog(p=12)
+        for i in range(20000):
+            hll.add(f"client-{i % 5000}")
+        self.assertAlmostEqual(hll.count(), 5000, delta=5000 * 0.05)
+
+    def test_fingerprint_stack_traces(self):
+        def trace(ts, order, line, lambda_id):
+            return "\n".join([
+                f"{ts} ERROR [http-1] c.e.Api - Request {order} failed",
+                f"java.lang.IllegalStateException: order {order} not found",
+                f"\tat com.example.Orders.find(Orders.java:{line})",
+                f"\tat com.example.Api$$Lambda${lambda_id}/0x0000000800c4b440.apply(Unknown Source)",
+                "Caused by: java.sql.SQLException: timeout",
+                "\tat org.db.Conn.exec(Conn.java:5)",
+                "\t... 2 more",
+            ])
+        log = "\n".join([
+            trace("2024-03-21 10:15:30,123", 1, 42, 77),
+            "2024-03-21 10:16:00,000 INFO ok",
+            trace("2024-03-21 10:17:00,000", 2, 43, 91),
+            'Exception in thread "main" java.lang.NullPointerException',
+            "\tat com.example.Main.run(Main.java:3)",
+        ])
+        res = fingerprint_stack_traces(log, top_frames=3)
+        self.assertEqual((res["traces"], res["distinct"]), (3, 2))
+        top = res["groups"][0]
+        self.assertEqual((top["count"], top["exception"], top["causes"]), (2, "java.lang.IllegalStateException", ["java.sql.SQLException"]))
+        self.assertEqual((top["first_seen"], top["last_seen"]), ("2024-03-21 10:15:30,123", "2024-03-21 10:17:00,000"))
+        self.assertEqual(top["frames"], ["com.example.Orders.find(Orders.java)", "com.example.Api$$Lambda.apply(Unknown Source)"])
+        self.assertTrue(top["representative"].startswith("java.lang.IllegalStateException: order 1 not found"))
+        self.assertEqual(res["groups"][1]["exception"], "java.lang.NullPointerException")
+        # keeping line numbers splits the two otherwise identical traces
+        self.assertEqual(fingerprint_stack_traces(log, strip_line_numbers=False)["distinct"], 3)
+
+    def test_normalize_log_timestamps(self):
+        text = "\n".join([
+            "2024-03-21 10:15:30,123 INFO [main] started",
+            "  continuation line",
+            "2024-03-21T10:15:32.5+01:00 other format",
+        ])
+        res = normalize_log_timestamps(text)
+        self.assertEqual(res["format"], "kafka")
+        self.assertEqual((res["parsed"], res["fallback"], res["unparsed"]), (2, 1, 1))
+        self.assertEqual(res["preview"][0], "1711016130123\t2024-03-21 10:15:30,123 INFO [main] started")
+        self.assertEqual(res["preview"][2].split("\t")[0], "1711012532500")
+        res = normalize_log_timestamps(text, mode="replace", unit="s")
+        self.assertEqual(res["preview"][0], "1711016130 INFO [main] started")
+
+        self.assertEqual(normalize_log_timestamps('1.2.3.4 - - [21/Mar/2024:10:15:30 +0100] "GET /"')["preview"][0][:13], "1711012530000")
+        # naive syslog times are wall-clock in the given zone (New York is on EDT on 21 March)
+        res = normalize_log_timestamps("Mar 21 10:15:30 host sshd[1]: ok", year=2024, default_tz="America/New_York")
+        self.assertEqual((res["format"], res["first"]), ("syslog", "2024-03-21T14:15:30+00:00"))
+        res = normalize_log_timestamps("a ts=1711016130123456789 b", unit="us")
+        self.assertEqual((res["format"], res["preview"][0].split("\t")[0]), ("epoch", "1711016130123456"))
+        # long numbers mid-line (IDs, byte counts) or outside 2000-2100 are not epochs
+        res = normalize_log_timestamps("2024-03-21T10:15:30Z start\norder 1711016130123 shipped\nbytes=1711016130\n9999999999 x")
+        self.assertEqual((res["parsed"], res["fallback"], res["unparsed"]), (1, 0, 3))
+        res = normalize_log_timestamps("2024-03-21T10:15:30Z start\n1711016131 next\n", mode="replace", unit="s")
+        self.assertEqual((res["fallback"], res["preview"][1]), (1, "1711016131 next"))
+        self.assertIn("error", normalize_log_timestamps("no time here"))
+
+    def test_merge_logs_by_time(self):
+        import os, shutil, tempfile
+        folder = tempfile.mkdtemp()
+        try:
+            files = {
+                "app.log": "2024-03-21 10:00:01,000 start\n2024-03-21 10:00:05,000 error\njava.lang.X: boom\n"
+                           "2024-03-21 10:00:03,500 late by 1.5s\n2024-03-21 10:00:09,000 done\n",
+                "proxy.log": '1.2.3.4 - - [21/Mar/2024:11:00:02 +0100] "GET /" 200\n1.2.3.4 - - [21/Mar/2024:11:00:06 +0100] "GET /x" 500\n',
+                "db.log": "Mar 21 06:00:04 db postgres: checkpoint\n",
+            }
+            for name, body in files.items():
+                with open(os.path.join(folder, name), "w") as f:
+                    f.write(body)
+            path = lambda name: os.path.join(folder, name)
+            res = merge_logs_by_time([path("app.log"), path("proxy.log"), (path("db.log"), "America/New_York")], year=2024)
+            self.assertEqual([r["text"].split()[0] for r in res["preview"] if not r["text"].startswith(" ")],
+                             ["[app.log]", "[proxy.log]", "[app.log]", "[db.log]", "[app.log]", "[proxy.log]", "[app.log]"])
+            # the stack line stays under its entry
+            self.assertEqual(res["preview"][5]["text"].strip(), "java.lang.X: boom")
+            self.assertEqual((res["entries"], res["lines"], res["late"]), (7, 8, 0))
+            # without a reorder window the late line goes out of order and is reported
+            self.assertEqual(merge_logs_by_time([path("app.log")], window_s=0)["late"], 1)
+            self.assertIn("error", merge_logs_by_time([(path("app.log"), "Mars/Base")]))
+        finally:
+            shutil.rmtree(folder)
+
+    def test_convert_epoch_column(self):
+        import utils
+        column = '1711016130\n1711016130123\n"1711016130123456",\n1711016130123456789\n\nnot-a-number\n'
+        res = convert_epoch_column(column, tz_name="Asia/Kolkata")
+        self.assertEqual(res["units"], {"s": 1, "ms": 1, "us": 1, "ns": 1})
+        self.assertEqual((res["count"], res["invalid"], res["precision"]), (4, ["not-a-number"], "ns"))
+        rows = res["table"].splitlines()
+        self.assertEqual(rows[4].split(), ["1711016130123456789", "ns", "2024-03-21", "10:15:30.123456789",
+                                           "2024-03-21", "15:45:30.123456789", "+05:30", "2024-03-21T10:15:30.123456789Z"])
+        # every row is aligned to the header
+        self.assertEqual(len({len(r) for r in rows[1:]}), 1)
+        self.assertEqual({r.index("2024") for r in rows[1:]}, {rows[0].index("UTC")})
+        self.assertTrue(convert_epoch_column("1711016130", tz_name="UTC", precision="ms")["table"].endswith("2024-03-21T10:15:30.000Z"))
+        # the NumPy and plain-Python paths format identically
+        saved, utils.np = utils.np, None
+        try:
+            self.assertEqual(convert_epoch_column(column, tz_name="Asia/Kolkata")["table"], res["table"])
+        finally:
+            utils.np = saved
+
+    def test_latency_histogram(self):
+        import math, os, shutil, tempfile, utils
+        values = [int(1.07 ** i) for i in range(300)] * 3 + [5, 7, 1000]
+        ordered = sorted(values)
+        hist = LatencyHistogram(sig_figs=3)
+        hist.record(values)
+        for p, v in hist.percentiles([1, 50, 99, 99.9]).items():
+            exact = ordered[max(1, math.ceil(p / 100 * len(values))) - 1]
+            self.assertLessEqual(abs(v - exact), exact * 1e-3)
+        self.assertEqual((hist.total, hist.max), (len(values), min(max(values), hist.highest)))
+        # the plain-Python path lays out buckets identically and merges with the NumPy one
+        saved, utils.np = utils.np, None
+        try:
+            plain = utils.LatencyHistogram(sig_figs=3)
+            plain.record(values)
+        finally:
+            utils.np = saved
+        self.assertEqual(list(plain.counts), list(hist.counts))
+        hist.merge(plain)
+        self.assertEqual(hist.total, 2 * len(values))
+        self.assertRaises(ValueError, hist.merge, LatencyHistogram(sig_figs=2))
+
+        folder = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(folder, "after.log"), "w") as f:
+                f.write("".join(f"GET /a {ms}\n" for ms in range(1, 1001)))
+            res = analyze_latencies("10\n20\n30\n-1\n", baseline_text=None)
+            self.assertEqual((res["current"]["count"], res["current"]["rejected"]), (3, 1))
+            res = analyze_latencies(paths=[os.path.join(folder, "*.log")], column=2, baseline_text="".join(f"GET /a {ms}\n" for ms in range(1, 501)))
+            # within the 3-significant-digit bucket width
+            self.assertAlmostEqual(res["current"]["percentiles"]["p99"], 990, delta=0.99)
+            self.assertAlmostEqual(res["delta"]["p50"]["before"], 250, delta=0.25)
+            self.assertAlmostEqual(res["delta"]["p50"]["ratio"], 2.0, places=2)
+            self.assertEqual(sum(b["count"] for b in res["current"]["bins"]), 1000)
+            self.assertIn("error", analyze_latencies(paths=os.path.join(folder, "missing*")))
+            self.assertIn("error", analyze_latencies("5\n", baseline_text="n/a"))
+        finally:
+            shutil.rmtree(folder)
+
+    def test_analyze_slo(self):
+        self.assertEqual(parse_slo_target("99.9% under 300 ms over 30d"), {"objective": 0.999, "budget": 0.001, "threshold_ms": 300.0, "period_s": 2592000.0})
+        self.assertIsNone(parse_slo_target("99.95% over 1w")["threshold_ms"])
+        self.assertIn("error", parse_slo_target("100% over 30d"))
+        # one event a minute for 3 hours; the middle hour fails one in ten (10x a 99% budget)
+        rows = ["status,timestamp,duration_ms"]
+        for m in range(180):
+            bad = 60 <= m < 120 and m % 10 == 0
+            rows.append(f"{503 if bad else 200},{1711000800 + m * 60},{900 if m == 5 else 20}")
+        res = analyze_slo("\n".join(rows), target="99% under 500ms over 1d", windows=(("1h", 5), ("2h", 6)))
+        self.assertEqual((res["events"], res["bad"], res["errors"], res["slow"]), (180, 7, 6, 1))
+        hour, two = res["windows"]
+        self.assertEqual((hour["max_burn"], hour["max_at"]), (10.0, "2024-03-21T07:51:00+00:00"))
+        self.assertEqual(len(hour["episodes"]), 1)
+        self.assertFalse(hour["firing"])
+        # the 2h window is only evaluated once the stream covers it, by then below 6x
+        self.assertEqual(two["episodes"], [])
+        self.assertAlmostEqual(hour["burn"], 0.0)
+        # 7 bad events against a day's projected 1440 events at 1%
+        self.assertAlmostEqual(res["budget"]["remaining"], 1 - 7 / (0.01 * 180 * 86400 / (179 * 60)), places=6)
+        self.assertIsNone(res["budget"]["exhausted_at"])
+        # regex-extracted log lines, timestamp found anywhere on the line
+        log = "\n".join(f"2024-03-21T10:{m:02d}:00Z GET /a status={500 if m == 3 else 200}" for m in range(10))
+        res = analyze_slo(log + "\nnoise", pattern=r"status=(?P<status>\d+)", target="90% over 1h", windows=(("5m", 1),))
+        self.assertEqual((res["events"], res["bad"], res["skipped"]), (10, 1, 1))
+        self.assertAlmostEqual(res["windows"][0]["max_burn"], 2.0)
+        self.assertIn("error", analyze_slo(log, pattern=r"GET (?P<path>\S+)"))
+
+    def test_calculate_queueing(self):
+        import math, utils
+        # textbook Erlang C: 8 Erlangs on 10 servers waits with probability 0.4092
+        res = calculate_queueing(80, 100, 10)
+        cur = res["current"]
+        self.assertAlmostEqual(cur["wait_probability"], 0.40918, places=5)
+        self.assertAlmostEqual(cur["mean_wait"], 0.40918015 * 100 / 2, places=4)
+        self.assertAlmostEqual(cur["queue_length"], 80 * cur["mean_wait"] / 1000)
+        self.assertAlmostEqual(cur["quantile_wait"], math.log(cur["wait_probability"] / 0.01) / 20 * 1000)
+        self.assertEqual((len(res["sweep"]), res["sweep"][0]["utilization"], res["sweep"][-1]["utilization"]), (90, 0.1, 0.99))
+        self.assertEqual(res["knee"]["utilization"], 0.93)
+        # M/D/1 reduces to Pollaczek-Khinchine: half the M/M/1 wait
+        self.assertAlmostEqual(calculate_queueing(5, 100, 1, model="M/D/c")["current"]["mean_wait"],
+                               calculate_queueing(5, 100, 1)["current"]["mean_wait"] / 2)
+        self.assertEqual(calculate_queueing(80, 100, 10, target_wait_ms=20)["servers_for_target"], 15)
+        # an unreachable target is reported as unmet, not as the search cap
+        unmet = calculate_queueing(80, 100, 10, target_wait_ms=-1)
+        self.assertEqual((unmet["servers_for_target"], unmet["target_met"], unmet["servers_searched"]), (None, False, 99))
+        unstable = calculate_queueing(120, 100, 10)
+        self.assertIsNone(unstable["current"])
+        self.assertEqual(unstable["min_servers"], 13)
+        self.assertIn("error", calculate_queueing(1, 100, 0))
+        # the vectorised sweep matches the plain-Python one
+        saved, utils.np = utils.np, None
+        try:
+            plain = utils.calculate_queueing(80, 100, 10, model="M/D/c")["sweep"]
+        finally:
+            utils.np = saved
+        for a, b in zip(plain, calculate_queueing(80, 100, 10, model="M/D/c")["sweep"]):
+            self.assertAlmostEqual(a["quantile_wait"], b["quantile_wait"], places=6)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,21 +1,44 @@
 import datetime
 import json
 import base64
+import csv
+import io
 import pytz
 import yaml
 from croniter import croniter
 import uuid
 import hashlib
+import collections
+import heapq
+import itertools
 import ipaddress
+import math
+import multiprocessing
+import os
+import random
 import re
 import ulid
+import bisect
 import socket
 import ssl
+import time
 import difflib
+import glob
+import gzip
+import zlib
+try:
+    import re._parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 
+try:
+    import numpy as np
+except ImportError:  # optional: vectorized fast paths
+    np = None
+
 def epoch_to_datetime(epoch_str):
     try:
         epoch = float(epoch_str)
@@ -52,6 +75,500 @@ def datetime_to_epoch(datetime_str):
     except Exception as e:
         return {"error": f"Could not parse date: {str(e)}"}
 
+_MONTHS = {m: i for i, m in enumerate(("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+_EPOCH_UNITS = {"s": 10 ** 9, "ms": 10 ** 6, "us": 10 ** 3, "ns": 1}
+
+# Candidate log timestamp formats, in tie-break order. Every pattern captures (minute prefix, seconds,
+# fraction, zone) so one parser shape serves them all; syslog is only ever at the start of a line.
+_TS_FORMATS = [
+    ("kafka", re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}):(\d{2}),(\d{3})()")),
+    ("iso8601", re.compile(r"(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}):(\d{2})(?:\.(\d{1,9}))?(Z|[+-]\d{2}:?\d{2})?(?!,\d)")),
+    ("nginx", re.compile(r"\[(\d{2}/[A-Z][a-z]{2}/\d{4}:\d{2}:\d{2}):(\d{2})() ([+-]\d{4})\]")),
+    ("syslog", re.compile(r"([A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}):(\d{2})()()\b")),
+    # Bare long numbers are mostly IDs and byte counts, so an epoch must open the line or follow a time key
+    ("epoch", re.compile(r"(?:^[\s\[]*|(?<![\w@])(?:@?timestamp|ts|time|epoch|date|datetime)[\"']?\s*[=:]\s*[\"']?)"
+                         r"(\d{10}|\d{13}|\d{16}|\d{19})(?:\.(\d{1,9}))?(?!\d)")),
+]
+# Epoch values outside 2000-01-01 .. 2100-01-01 (in ns) are not taken as timestamps
+_EPOCH_WINDOW_NS = (946_684_800 * 10 ** 9, 4_102_444_800 * 10 ** 9)
+
+def _days_from_civil(y, m, d):
+    """Days since 1970-01-01 for a proleptic Gregorian date (no datetime objects on the hot path)."""
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+
+def _tz_offset_seconds(text):
+    """'Z', '+0530', '+05:30' -> offset in seconds east of UTC."""
+    if text == "Z":
+        return 0
+    sign = -1 if text[0] == "-" else 1
+    digits = text[1:].replace(":", "")
+    return sign * (int(digits[:2]) * 3600 + int(digits[2:4]) * 60)
+
+def _ts_minute_fields(name, prefix, year):
+    """(year, month, day, hour, minute) from a format's captured minute prefix; None for a bad month name."""
+    if name == "nginx":  # 21/Mar/2024:10:15
+        return int(prefix[7:11]), _MONTHS.get(prefix[3:6]), int(prefix[:2]), int(prefix[12:14]), int(prefix[15:17])
+    if name == "syslog":  # Mar 21 10:15
+        return year, _MONTHS.get(prefix[:3]), int(prefix[4:6]), int(prefix[7:9]), int(prefix[10:12])
+    return int(prefix[:4]), int(prefix[5:7]), int(prefix[8:10]), int(prefix[11:13]), int(prefix[14:16])  # 2024-03-21 10:15
+
+def _ts_parser(name, default_tz="UTC", year=None):
+    """Builds a specialised parser for one format: line -> (start, end, epoch_ns) or None.
+
+    Calendar arithmetic runs once per distinct minute (and zone); every other line costs one regex
+    search, a dict hit and an int() of the seconds.
+    """
+    rx = dict(_TS_FORMATS)[name]
+    search = re.compile("^" + rx.pattern).search if name == "syslog" else rx.search
+    zone = None if default_tz in ("UTC", "Z", "") else pytz.timezone(default_tz)
+    year = int(year or datetime.datetime.now(datetime.timezone.utc).year)
+
+    if name == "epoch":
+        def parse(line):
+            m = search(line)
+            if m is None:
+                return None
+            digits, frac = m.groups()
+            # 10/13/16/19 digits are s/ms/us/ns; a fraction only makes sense on seconds
+            ns = int(digits) * 10 ** (19 - len(digits))
+            if not _EPOCH_WINDOW_NS[0] <= ns < _EPOCH_WINDOW_NS[1]:
+                return None
+            if frac and len(digits) == 10:
+                ns += int(frac.ljust(9, "0")[:9])
+            return m.start(1), m.end(), ns
+        return parse
+
+    minutes = {}
+
+    def minute_base(prefix, tz):
+        fields = _ts_minute_fields(name, prefix, year)
+        if fields[1] is None:
+            return None
+        y, mo, d, h, mi = fields
+        if tz:
+            off = _tz_offset_seconds(tz)
+        elif zone is not None:
+            # naive timestamps are wall-clock time in default_tz
+            off = int(zone.utcoffset(datetime.datetime(y, mo, d, h, mi), is_dst=False).total_seconds())
+        else:
+            off = 0
+        if len(minutes) > 65536:
+            minutes.clear()
+        base = minutes[(prefix, tz)] = _days_from_civil(y, mo, d) * 86400 + h * 3600 + mi * 60 - off
+        return base
+
+    def parse(line):
+        m = search(line)
+        if m is None:
+            return None
+        prefix, sec, frac, tz = m.groups()
+        base = minutes.get((prefix, tz))
+        if base is None:
+            base = minute_base(prefix, tz)
+            if base is None:
+                return None
+        ns = (base + int(sec)) * 1_000_000_000
+        if frac:
+            ns += int(frac) * 10 ** (9 - len(frac))
+        return m.start(), m.end(), ns
+    return parse
+
+def detect_timestamp_format(lines):
+    """Picks the format matching the most sample lines (ties go to the earlier, more specific format)."""
+    hits = {}
+    for name, rx in _TS_FORMATS:
+        if name == "syslog":
+            hits[name] = sum(1 for line in lines if rx.match(line))
+        else:
+            hits[name] = sum(1 for line in lines if rx.search(line))
+    best = max(_TS_FORMATS, key=lambda f: hits[f[0]])[0]
+    return (best if hits[best] else None), hits
+
+def normalize_log_timestamps(text=None, path=None, output_path=None, mode="prefix", unit="ms", default_tz="UTC", year=None,
+                             fmt=None, preview=50, sample_lines=200):
+    """Detects a log's timestamp format once and rewrites or annotates every line with a UTC epoch.
+
+    The detected format gets a specialised regex+arithmetic parser that is reused for the rest of the
+    stream; lines it cannot read fall back to the other formats, and each format's parser is built once
+    and cached. mode is "prefix" (epoch + tab in front of the line) or "replace" (epoch in place of the
+    timestamp). Naive timestamps are read in default_tz; syslog lines take `year` (default: this year).
+    """
+    try:
+        if unit not in _EPOCH_UNITS:
+            return {"error": f"Unit must be one of {', '.join(_EPOCH_UNITS)}"}
+        if mode not in ("prefix", "replace"):
+            return {"error": "Mode must be 'prefix' or 'replace'"}
+        if default_tz not in ("UTC", "Z", "") and default_tz not in pytz.all_timezones_set:
+            return {"error": f"Unknown timezone '{default_tz}'"}
+        if path:
+            if not os.path.isfile(path):
+                return {"error": "Provide a path to a log file"}
+            size = os.path.getsize(path)
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                head = [line.rstrip("\r\n") for line in itertools.islice(f, sample_lines)]
+            source = opener(path, "rt", encoding="utf-8", errors="replace")
+        elif text:
+            size = len(text.encode("utf-8", "replace"))
+            head = text.splitlines()[:sample_lines]
+            source = io.StringIO(text)
+        else:
+            return {"error": "Provide a log text or a file path"}
+
+        if fmt is None:
+            fmt, hits = detect_timestamp_format(head)
+            if fmt is None:
+                source.close()
+                return {"error": "No known timestamp format found in the first lines"}
+        elif fmt not in dict(_TS_FORMATS):
+            source.close()
+            return {"error": f"Unknown format '{fmt}'"}
+        else:
+            hits = {}
+        parsers = {}
+
+        def parser_for(name):
+            p = parsers.get(name)
+            if p is None:
+                p = parsers[name] = _ts_parser(name, default_tz, year)
+            return p
+
+        primary = parser_for(fmt)
+        fallbacks = [name for name, _ in _TS_FORMATS if name != fmt]
+        divisor = _EPOCH_UNITS[unit]
+        out = open(output_path, "w", encoding="utf-8", newline="\n") if output_path else None
+        lines = parsed = fallback = 0
+        first_ns, last_ns = 1 << 100, -(1 << 100)
+        samples, unparsed_samples = [], []
+        prefix = mode == "prefix"
+        write = out.write if out is not None else None
+        started = time.perf_counter()
+        try:
+            with source:
+                # Lines keep their newline so the rewritten text can be written as is
+                for lines, line in enumerate(source, 1):
+                    hit = primary(line)
+                    if hit is None:
+                        for name in fallbacks:
+                            hit = parser_for(name)(line)
+                            if hit is not None:
+                                fallback += 1
+                                break
+                    if hit is None:
+                        new = line
+                        if len(unparsed_samples) < 20:
+                            unparsed_samples.append({"line": lines, "text": line.rstrip("\r\n")[:300]})
+                    else:
+                        parsed += 1
+                        start, end, ns = hit
+                        new = f"{ns // divisor}\t{line}" if prefix else f"{line[:start]}{ns // divisor}{line[end:]}"
+                        if ns < first_ns:
+                            first_ns = ns
+                        if ns > last_ns:
+                            last_ns = ns
+                    if write is not None:
+                        write(new if new.endswith("\n") else new + "\n")
+                    if lines <= preview:
+                        samples.append(new.rstrip("\r\n"))
+        finally:
+            if out is not None:
+                out.close()
+        if not parsed:
+            first_ns = last_ns = None
+        elapsed = max(time.perf_counter() - started, 1e-9)
+
+        # Baseline: dateutil on the same timestamps (what datetime_to_epoch does per call)
+        texts = []
+        for line in head[:100]:
+            hit = primary(line)
+            if hit is not None:
+                found = line[hit[0]:hit[1]].strip("[]")
+                texts.append(found.replace(":", " ", 1) if fmt == "nginx" else found)
+        dateutil_us = None
+        if fmt != "epoch" and texts:
+            t0 = time.perf_counter()
+            for t in texts:
+                try:
+                    date_parser.parse(t)
+                except (ValueError, OverflowError):
+                    pass
+            dateutil_us = (time.perf_counter() - t0) / len(texts) * 1e6
+        per_line_us = elapsed / max(lines, 1) * 1e6
+
+        def iso(ns):
+            return None if ns is None else datetime.datetime.fromtimestamp(ns / 1e9, tz=datetime.timezone.utc).isoformat()
+
+        return {
+            "source": path or "text",
+            "bytes": size,
+            "format": fmt,
+            "detection": hits,
+            "lines": lines,
+            "parsed": parsed,
+            "fallback": fallback,
+            "unparsed": lines - parsed,
+            "unparsed_samples": unparsed_samples,
+            "first": iso(first_ns),
+            "last": iso(last_ns),
+            "unit": unit,
+            "mode": mode,
+            "preview": samples,
+            "output": output_path,
+            "elapsed": elapsed,
+            "per_line_us": per_line_us,
+            "dateutil_us": dateutil_us,
+            "speedup": dateutil_us / per_line_us if dateutil_us and per_line_us else None,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+def _timed_records(path, parse, fallback, window_ns, stats, max_record_lines=1000):
+    """Yields (epoch_ns, seq, lines) per log entry of one file in time order.
+
+    Lines without a timestamp (stack frames, wrapped messages) stay with the entry above them. Entries
+    are held in a heap until the newest timestamp seen is window_ns past them, so disorder within the
+    window is repaired with memory bounded by the window, not the file.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    pending, orphans, current = [], [], None
+    newest = last_out = None
+    seq = 0
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            hit = parse(line) or fallback(line)
+            if hit is None:
+                stats["continuations"] += 1
+                target = orphans if current is None else current[2]
+                if len(target) < max_record_lines:
+                    target.append(line)
+                continue
+            ns = hit[2]
+            if current is not None:
+                heapq.heappush(pending, current)
+            seq += 1
+            current = (ns, seq, orphans + [line] if orphans else [line])
+            orphans = []
+            stats["entries"] += 1
+            newest = ns if newest is None or ns > newest else newest
+            while pending and pending[0][0] <= newest - window_ns:
+                rec = heapq.heappop(pending)
+                if last_out is not None and rec[0] < last_out:
+                    stats["late"] += 1
+                last_out = rec[0] if last_out is None or rec[0] > last_out else last_out
+                yield rec
+    if current is not None:
+        heapq.heappush(pending, current)
+    elif orphans:
+        stats["untimed"] += len(orphans)
+    while pending:
+        rec = heapq.heappop(pending)
+        if last_out is not None and rec[0] < last_out:
+            stats["late"] += 1
+        last_out = rec[0] if last_out is None or rec[0] > last_out else last_out
+        yield rec
+
+def merge_logs_by_time(sources, output_path=None, window_s=5.0, label=True, default_tz="UTC", year=None, preview=500,
+                       sample_lines=200):
+    """Interleaves several log files into one time-ordered stream with a heap-based k-way merge.
+
+    sources is a list of paths/globs, or (path, timezone) pairs for logs written in local time. Each file's
+    timestamp format is detected once and parsed with the cached normalizer parsers; files are read
+    lazily and repaired for lines up to window_s out of order, so memory stays per file and per window.
+    """
+    try:
+        specs = []
+        for item in sources or []:
+            spec, tz = (item, default_tz) if isinstance(item, str) else (item[0], item[1] or default_tz)
+            if tz not in ("UTC", "Z", "") and tz not in pytz.all_timezones_set:
+                return {"error": f"Unknown timezone '{tz}'"}
+            files = expand_log_paths(spec)
+            if not files:
+                return {"error": f"No files match '{spec}'"}
+            specs.extend((p, tz) for p in files)
+        if not specs:
+            return {"error": "Provide at least one log file"}
+        window_ns = int(float(window_s) * 1e9)
+
+        def tagged(records, idx, tag):
+            # idx breaks timestamp ties in source order; seq keeps each file's own order
+            for ns, seq, lines in records:
+                yield ns, idx, seq, tag, lines
+
+        streams, per_file = [], []
+        for idx, (path, tz) in enumerate(specs):
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+                head = [line.rstrip("\r\n") for line in itertools.islice(f, sample_lines)]
+            fmt, _ = detect_timestamp_format(head)
+            if fmt is None:
+                return {"error": f"No known timestamp format in the first lines of {path}"}
+            parse = _ts_parser(fmt, tz, year)
+            # Mixed-format lines (e.g. an epoch inside a message) must not start new entries, so only the
+            # file's own format counts; ISO and Kafka are treated as one family.
+            other = {"kafka": "iso8601", "iso8601": "kafka"}.get(fmt)
+            fallback = _ts_parser(other, tz, year) if other else (lambda line: None)
+            stats = {"path": path, "tz": tz, "format": fmt, "entries": 0, "continuations": 0, "late": 0, "untimed": 0}
+            per_file.append(stats)
+            tag = f"[{os.path.basename(path)}] " if label else ""
+            streams.append(tagged(_timed_records(path, parse, fallback, window_ns, stats), idx, tag))
+
+        out = open(output_path, "w", encoding="utf-8", newline="\n") if output_path else None
+        shown, entries, lines_out = [], 0, 0
+        first_ns = last_ns = None
+        started = time.perf_counter()
+        try:
+            for ns, idx, _, tag, lines in heapq.merge(*streams):
+                entries += 1
+                if first_ns is None:
+                    first_ns = ns
+                last_ns = ns if last_ns is None or ns > last_ns else last_ns
+                for i, line in enumerate(lines):
+                    text = (tag if i == 0 else " " * len(tag)) + line
+                    lines_out += 1
+                    if out is not None:
+                        out.write(text + "\n")
+                    if len(shown) < preview:
+                        shown.append({"source": idx, "epoch_ms": ns // 1_000_000, "text": text})
+        finally:
+            if out is not None:
+                out.close()
+        elapsed = max(time.perf_counter() - started, 1e-9)
+
+        def iso(ns):
+            return None if ns is None else datetime.datetime.fromtimestamp(ns / 1e9, tz=datetime.timezone.utc).isoformat()
+
+        return {
+            "files": per_file,
+            "entries": entries,
+            "lines": lines_out,
+            "late": sum(f["late"] for f in per_file),
+            "first": iso(first_ns),
+            "last": iso(last_ns),
+            "window_s": float(window_s),
+            "preview": shown,
+            "output": output_path,
+            "elapsed": elapsed,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+_EPOCH_DIGITS = (("s", 1e11, 10 ** 9), ("ms", 1e14, 10 ** 6), ("us", 1e17, 10 ** 3), ("ns", float("inf"), 1))
+
+def _epoch_unit(value):
+    """Unit of a raw epoch by magnitude: up to 11 digits s, 14 ms, 17 us, beyond that ns."""
+    size = abs(value)
+    for unit, limit, mult in _EPOCH_DIGITS:
+        if size < limit:
+            return unit, mult
+
+def convert_epoch_column(text, tz_name=None, precision="auto", limit=None):
+    """Converts a pasted column of epochs (s/ms/us/ns detected per value) to aligned UTC, local and ISO columns.
+
+    Values are scaled to int64 nanoseconds once; with NumPy the formatting is a few datetime64 array
+    operations, and local offsets are looked up once per distinct 15-minute slot instead of per value.
+    tz_name None means the system zone.
+    """
+    try:
+        zone = None
+        if tz_name:
+            if tz_name not in pytz.all_timezones_set:
+                return {"error": f"Unknown timezone '{tz_name}'"}
+            zone = pytz.timezone(tz_name)
+        started = time.perf_counter()
+        raw, ns_values, units, invalid = [], [], [], []
+        counts = {"s": 0, "ms": 0, "us": 0, "ns": 0}
+        for line in (text or "").splitlines():
+            token = line.strip().strip("\"',;")
+            if not token:
+                continue
+            try:
+                value = int(token)
+            except ValueError:
+                try:
+                    value = float(token)
+                except ValueError:
+                    invalid.append(token)
+                    continue
+            unit, mult = _epoch_unit(value)
+            ns = value * mult if isinstance(value, int) else round(value * mult)
+            if not -(1 << 63) < ns < (1 << 63):
+                invalid.append(token)
+                continue
+            raw.append(token)
+            ns_values.append(ns)
+            units.append(unit)
+            counts[unit] += 1
+        if not raw:
+            return {"error": "No epoch values found"}
+        if precision == "auto":
+            precision = max((u for u, c in counts.items() if c), key=list(counts).index)
+            if precision == "s" and any(ns % 1_000_000_000 for ns in ns_values):
+                precision = "ms"
+        if precision not in _EPOCH_UNITS:
+            return {"error": f"Precision must be auto or one of {', '.join(_EPOCH_UNITS)}"}
+
+        slot = 900 * 10 ** 9
+
+        def offset_seconds(seconds):
+            when = datetime.datetime.fromtimestamp(seconds, tz=zone) if zone else datetime.datetime.fromtimestamp(seconds).astimezone()
+            return int(when.utcoffset().total_seconds())
+
+        def offset_text(off):
+            sign = "-" if off < 0 else "+"
+            return f"{sign}{abs(off) // 3600:02d}:{abs(off) % 3600 // 60:02d}"
+
+        if np is not None:
+            ns = np.array(ns_values, dtype=np.int64)
+            slots, inverse = np.unique(ns // slot, return_inverse=True)
+            offsets = np.array([offset_seconds(int(s) * 900) for s in slots], dtype=np.int64)
+            offset_labels = np.array([offset_text(int(o)) for o in offsets])
+            utc = np.datetime_as_string(ns.astype("datetime64[ns]").astype(f"datetime64[{precision}]"), unit=precision)
+            local = np.datetime_as_string((ns + offsets[inverse] * 1_000_000_000).astype("datetime64[ns]").astype(f"datetime64[{precision}]"),
+                                          unit=precision)
+            iso = np.char.add(utc, "Z").tolist()
+            utc = np.char.replace(utc, "T", " ").tolist()
+            local = np.char.add(np.char.add(np.char.replace(local, "T", " "), " "), offset_labels[inverse]).tolist()
+            engine = "numpy"
+        else:
+            digits = {"s": 0, "ms": 3, "us": 6, "ns": 9}[precision]
+            cache = {}
+            utc, local, iso = [], [], []
+            for value in ns_values:
+                secs, sub = divmod(value, 1_000_000_000)
+                frac = f".{sub:09d}"[:digits + 1] if digits else ""
+                off = cache.get(value // slot)
+                if off is None:
+                    off = cache[value // slot] = offset_seconds(value // slot * 900)
+                stamp = (datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=secs)).strftime("%Y-%m-%d %H:%M:%S") + frac
+                utc.append(stamp)
+                iso.append(stamp.replace(" ", "T") + "Z")
+                local.append((datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=secs + off)).strftime("%Y-%m-%d %H:%M:%S")
+                             + frac + " " + offset_text(off))
+            engine = "python"
+
+        width = max(len(r) for r in raw)
+        local_label = tz_name or "Local"
+        header = f"{'Epoch':<{width}}  Unit  {'UTC':<{len(utc[0])}}  {local_label:<{len(local[0])}}  ISO-8601"
+        rows = [f"{r:<{width}}  {u:<4}  {a}  {b}  {c}" for r, u, a, b, c in zip(raw, units, utc, local, iso)]
+        shown = rows if limit is None else rows[:limit]
+        return {
+            "count": len(rows),
+            "invalid": invalid[:100],
+            "invalid_count": len(invalid),
+            "units": counts,
+            "precision": precision,
+            "table": "\n".join([header] + shown),
+            "engine": engine,
+            "elapsed": time.perf_counter() - started,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
 def format_json(json_str, indent=4):
     try:
         data = json.loads(json_str)
@@ -137,165 +654,3062 @@ def cron_next_runs(cron_str, num_runs=5):
     except Exception as e:
         return [f"Error: {str(e)}"]
 
-def yaml_to_json(yaml_str):
-    try:
-        data = yaml.safe_load(yaml_str)
-        return json.dumps(data, indent=4)
-    except Exception as e:
-        return f"Error: {str(e)}"
+def yaml_to_json(yaml_str):
+    try:
+        data = yaml.safe_load(yaml_str)
+        return json.dumps(data, indent=4)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+def json_to_yaml(json_str):
+    try:
+        data = json.loads(json_str)
+        return yaml.dump(data, default_flow_style=False)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+def generate_ids():
+    return {
+        "uuid": str(uuid.uuid4()),
+        "ulid": str(ulid.new()),
+        "hex": uuid.uuid4().hex
+    }
+
+def calculate_hashes(text):
+    if not text:
+        return {"md5": "", "sha1": "", "sha256": ""}
+    data = text.encode('utf-8')
+    return {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "sha256": hashlib.sha256(data).hexdigest()
+    }
+
+# ULID (Crockford base32, 48-bit ms prefix) and UUIDv7 (48-bit ms prefix) scanner
+_TIME_ID_RE = re.compile(
+    r"\b(?:(?P<uuid7>[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-7[0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12})"
+    r"|(?P<ulid>[0-7][0-9A-HJKMNP-TV-Za-hjkmnp-tv-z]{25}))\b"
+)
+# Crockford alphabet -> digits understood by int(x, 32)
+_CROCKFORD_TO_B32 = str.maketrans(
+    "0123456789ABCDEFGHJKMNPQRSTVWXYZabcdefghjkmnpqrstvwxyz",
+    "0123456789abcdefghijklmnopqrstuv" + "abcdefghijklmnopqrstuv"
+)
+
+# Plausible mint window (2000-01-01 .. 2100-01-01 UTC); tokens decoding outside it are random
+# Crockford/hex strings that merely look like IDs
+_TIME_ID_MIN_MS = 946684800000
+_TIME_ID_MAX_MS = 4102444800000
+
+def _time_id_ms(match):
+    """Returns the embedded millisecond timestamp of a ULID/UUIDv7 scanner match."""
+    value = match.group()
+    if match.lastgroup == "uuid7":
+        return int(value[:8] + value[9:13], 16)
+    return int(value[:10].translate(_CROCKFORD_TO_B32), 32)
+
+def decode_time_ordered_ids(text=None, path=None, limit=500, output_path=None):
+    """Extracts ULIDs/UUIDv7s from text or a file and lists them sorted by mint time."""
+    try:
+        if not text and not path:
+            return {"error": "Provide text or a file path"}
+
+        found = []
+        counts = {"ulid": 0, "uuid7": 0}
+        rejected = 0
+        finditer = _TIME_ID_RE.finditer
+        source = open(path, "r", errors="replace") if path else text.splitlines()
+        try:
+            for line_no, line in enumerate(source, 1):
+                for m in finditer(line):
+                    ms = _time_id_ms(m)
+                    if not _TIME_ID_MIN_MS <= ms < _TIME_ID_MAX_MS:
+                        rejected += 1
+                        continue
+                    counts[m.lastgroup] += 1
+                    found.append((ms, line_no, m.group()))
+        finally:
+            if path:
+                source.close()
+
+        if not found:
+            return {"error": "No ULIDs or UUIDv7s found" + (f" ({rejected:,} look-alikes outside 2000-2100 ignored)" if rejected else "")}
+        found.sort()
+
+        def fmt(ms):
+            # Formatted directly: epoch_to_datetime would re-apply its seconds-vs-milliseconds guess
+            dt = datetime.datetime.fromtimestamp(ms / 1000, tz=datetime.timezone.utc)
+            return {"utc": dt.strftime("%Y-%m-%d %H:%M:%S UTC"), "iso": dt.isoformat()}
+
+        if output_path:
+            last_sec, last_fmt = None, None
+            with open(output_path, "w") as out:
+                out.write("iso_utc,epoch_ms,line,id\n")
+                for ms, line_no, id_str in found:
+                    # Sorted input: consecutive IDs usually share a second
+                    if ms // 1000 != last_sec:
+                        last_sec = ms // 1000
+                        last_fmt = fmt(last_sec * 1000)["iso"]
+                    out.write(f"{last_fmt[:19]}.{ms % 1000:03d}+00:00,{ms},{line_no},{id_str}\n")
+
+        rows = []
+        for ms, line_no, id_str in found[:limit]:
+            dt = fmt(ms)
+            rows.append({
+                "id": id_str,
+                "type": "UUIDv7" if "-" in id_str else "ULID",
+                "line": line_no,
+                "ms": ms,
+                "utc": dt.get("utc", ""),
+                "iso": dt.get("iso", "")
+            })
+
+        first_ms, last_ms = found[0][0], found[-1][0]
+        return {
+            "count": len(found),
+            "ulid": counts["ulid"],
+            "uuid7": counts["uuid7"],
+            "rejected": rejected,
+            "first": fmt(first_ms).get("iso", ""),
+            "last": fmt(last_ms).get("iso", ""),
+            "span_ms": last_ms - first_ms,
+            "rows": rows,
+            "truncated": len(found) > limit,
+            "output": output_path
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a blake2b digest."""
+
+    def __init__(self, expected_items, fp_rate=0.001):
+        n = max(1, int(expected_items))
+        self.size = max(64, int(-n * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / n * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item):
+        """Adds item and returns True if it was (probably) already present."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits, size = self.bits, self.size
+        present = True
+        for i in range(self.hashes):
+            idx = (h1 + i * h2) % size
+            mask = 1 << (idx & 7)
+            if not bits[idx >> 3] & mask:
+                bits[idx >> 3] |= mask
+                present = False
+        return present
+
+def _iter_ids(path):
+    """Yields (line_no, id) for each non-empty line of an ID list file."""
+    with open(path, "r", errors="replace") as f:
+        for line_no, line in enumerate(f, 1):
+            value = line.strip()
+            if value:
+                yield line_no, value
+
+def _estimate_line_count(path, sample_lines=1000):
+    """Estimates the number of lines in a file from the average length of its head."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = list(itertools.islice(f, sample_lines))
+    if not head:
+        return 0
+    avg = sum(len(l) for l in head) / len(head)
+    return int(size / avg) + 1
+
+def find_duplicate_ids(path, mode="bloom", limit=500, fp_rate=0.001, chunk_lines=1_000_000):
+    """Finds duplicate IDs in a large file with bounded memory (Bloom pre-pass or external sort)."""
+    try:
+        if not path:
+            return {"error": "Provide a file path"}
+        dupes = {}
+        total = 0
+
+        if mode == "bloom":
+            # Pass 1: anything the filter has (probably) seen before is a candidate
+            bloom = BloomFilter(_estimate_line_count(path), fp_rate)
+            candidates = set()
+            for _, value in _iter_ids(path):
+                total += 1
+                if bloom.add(value):
+                    candidates.add(value)
+            detail = f"Bloom filter {len(bloom.bits) / 2**20:,.1f} MiB, {bloom.hashes} hashes, {len(candidates):,} candidates verified"
+            del bloom
+
+            # Pass 2: exact line numbers for the candidates only
+            if candidates:
+                seen = {}
+                for line_no, value in _iter_ids(path):
+                    if value in candidates:
+                        seen.setdefault(value, []).append(line_no)
+                dupes = {k: v for k, v in seen.items() if len(v) > 1}
+        elif mode == "sort":
+            # External merge sort: sorted runs on disk, then a k-way merge
+            import tempfile
+            runs = []
+            tmp_dir = tempfile.mkdtemp(prefix="opsnexus_dupes_")
+            try:
+                ids = _iter_ids(path)
+                while True:
+                    chunk = sorted((value, line_no) for line_no, value in itertools.islice(ids, chunk_lines))
+                    if not chunk:
+                        break
+                    total += len(chunk)
+                    run_path = os.path.join(tmp_dir, f"run{len(runs)}.txt")
+                    with open(run_path, "w") as run:
+                        run.writelines(f"{value}\t{line_no}\n" for value, line_no in chunk)
+                    runs.append(run_path)
+                del chunk
+
+                def read_run(run_path):
+                    with open(run_path, "r") as run:
+                        for line in run:
+                            value, _, line_no = line.rstrip("\n").rpartition("\t")
+                            yield value, int(line_no)
+
+                prev, lines = None, []
+                for value, line_no in heapq.merge(*(read_run(r) for r in runs)):
+                    if value != prev:
+                        if len(lines) > 1:
+                            dupes[prev] = lines
+                        prev, lines = value, []
+                    lines.append(line_no)
+                if len(lines) > 1:
+                    dupes[prev] = lines
+            finally:
+                import shutil
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            detail = f"External sort: {len(runs)} sorted run(s) of up to {chunk_lines:,} IDs"
+        else:
+            return {"error": f"Unknown mode: {mode}"}
+
+        ordered = sorted(dupes.items(), key=lambda kv: kv[1][0])
+        return {
+            "mode": mode,
+            "total": total,
+            "duplicate_ids": len(dupes),
+            "duplicate_lines": sum(len(v) for v in dupes.values()),
+            "detail": detail,
+            "duplicates": [{"id": k, "lines": v, "count": len(v)} for k, v in ordered[:limit]],
+            "truncated": len(ordered) > limit
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+# Parent blocks offered by the Subnet Explorer, most specific first
+_SIBLING_PARENTS = {4: (24, 16, 8), 6: (112, 64, 48, 32)}
+
+def _ipv6_scope(ip):
+    """Human-readable IPv6 address class."""
+    if ip.is_unspecified: return "Unspecified (::/128)"
+    if ip.is_loopback: return "Loopback (::1/128)"
+    if ip.ipv4_mapped: return "IPv4-mapped (::ffff:0:0/96)"
+    if ip.is_multicast: return "Multicast (ff00::/8)"
+    if ip.is_link_local: return "Link-Local Unicast (fe80::/10)"
+    if ip.is_site_local: return "Site-Local (fec0::/10, deprecated)"
+    if ip in ipaddress.ip_network("fc00::/7"): return "Unique Local (fc00::/7)"
+    if ip in ipaddress.ip_network("2001:db8::/32"): return "Documentation (2001:db8::/32)"
+    if ip.sixtofour: return "6to4 (2002::/16)"
+    if ip.teredo: return "Teredo (2001::/32)"
+    if ip in ipaddress.ip_network("2000::/3"): return "Global Unicast (2000::/3)"
+    return "Reserved"
+
+def _eui64_mac(ip_int):
+    """Returns the MAC embedded in an EUI-64 interface ID, or None."""
+    iid = ip_int & ((1 << 64) - 1)
+    if (iid >> 24) & 0xFFFF != 0xFFFE:
+        return None
+    mac = ((iid >> 40) << 24 | (iid & 0xFFFFFF)) ^ (0x02 << 40)  # flip universal/local bit
+    return ":".join(f"{(mac >> s) & 0xFF:02x}" for s in range(40, -1, -8))
+
+def iter_sibling_subnets(parent_cidr, new_prefix, start=0):
+    """Lazily yields the /new_prefix subnets of parent_cidr, beginning at index start."""
+    parent = ipaddress.ip_network(parent_cidr, strict=False)
+    addr_cls = ipaddress.IPv4Address if parent.version == 4 else ipaddress.IPv6Address
+    size = 1 << (parent.max_prefixlen - new_prefix)
+    count = 1 << (new_prefix - parent.prefixlen)
+    # IPv4 reserves network/broadcast except on /31 and /32 (RFC 3021)
+    edge = 1 if parent.version == 4 and new_prefix < 31 else 0
+    base = int(parent.network_address)
+    for i in range(start, count):
+        net = base + i * size
+        last = net + size - 1
+        yield {
+            "index": i,
+            "net": str(addr_cls(net)),
+            "range": f"{addr_cls(net + edge)} - {addr_cls(last - edge)}",
+            "broadcast": str(addr_cls(last)),
+        }
+
+def calculate_cidr_advanced(ip_str, mask_str=None):
+    try:
+        # Support both CIDR (49.206.128.42/30, 2001:db8::1/64) and separate Mask
+        if mask_str and '/' not in ip_str:
+            if mask_str.startswith('/'):
+                cidr_str = f"{ip_str}{mask_str}"
+            else:
+                cidr_str = f"{ip_str}/{mask_str}"
+        else:
+            cidr_str = ip_str
+
+        network = ipaddress.ip_network(cidr_str, strict=False)
+        ip = ipaddress.ip_address(ip_str.split('/')[0])
+        bits = network.max_prefixlen
+        is_v6 = network.version == 6
+        
+        # Basic Info
+        num_hosts = network.num_addresses
+        prefix = network.prefixlen
+        
+        # Usable handling (/31, /32; IPv6 has no broadcast address)
+        if is_v6:
+            usable_hosts = num_hosts
+            first_ip = str(network.network_address)
+            last_ip = str(network.broadcast_address)
+        elif prefix == 32:
+            usable_hosts = 1
+            first_ip = str(network.network_address)
+            last_ip = str(network.network_address)
+        elif prefix == 31:
+            usable_hosts = 2
+            first_ip = str(network.network_address)
+            last_ip = str(network.broadcast_address)
+        else:
+            usable_hosts = max(0, num_hosts - 2)
+            first_ip = str(network.network_address + 1)
+            last_ip = str(network.broadcast_address - 1)
+
+        # Binary/Hex/Int (8-bit groups for IPv4, 16-bit hextets for IPv6)
+        group = 16 if is_v6 else 8
+        ip_int = int(ip)
+        ip_bin = format(ip_int, f"0{bits}b")
+        
+        mask_int = int(network.netmask)
+        mask_bin = format(mask_int, f"0{bits}b")
+        mask_bin_formatted = (":" if is_v6 else ".").join([mask_bin[i:i+group] for i in range(0, bits, group)])
+
+        # Wildcard
+        wildcard_str = str(network.hostmask)
+
+        if is_v6:
+            ip_class = _ipv6_scope(ip)
+            mac = _eui64_mac(ip_int)
+            embedded_v4 = ip.ipv4_mapped or ip.sixtofour or (ip.teredo[1] if ip.teredo else None)
+        else:
+            # IP Class
+            first_octet = ip_int >> 24
+            if 1 <= first_octet <= 126: ip_class = "A"
+            elif 128 <= first_octet <= 191: ip_class = "B"
+            elif 192 <= first_octet <= 223: ip_class = "C"
+            elif 224 <= first_octet <= 239: ip_class = "D (Multicast)"
+            elif 240 <= first_octet <= 255: ip_class = "E (Experimental)"
+            else: ip_class = "Loopback/Special"
+
+        # Reverse DNS (in-addr.arpa octets / ip6.arpa nibbles)
+        rev_dns = ip.reverse_pointer
+
+        res = {
+            "version": network.version,
+            "ip": str(ip),
+            "network": str(network.network_address),
+            "netmask": str(network.netmask),
+            "broadcast": "N/A (IPv6)" if is_v6 else str(network.broadcast_address),
+            "wildcard": wildcard_str,
+            "hosts_total": num_hosts,
+            "hosts_usable": usable_hosts,
+            "range": f"{first_ip} - {last_ip}" if usable_hosts > 0 else "N/A",
+            "cidr": f"/{prefix}",
+            "mask_bin": mask_bin_formatted,
+            "ip_class": ip_class,
+            "ip_type": "Private" if ip.is_private else "Public",
+            "binary_id": ip_bin,
+            "integer_id": ip_int,
+            "hex_id": f"0x{ip_int:0{bits // 4}x}",
+            "reverse_dns": rev_dns,
+        }
+
+        if is_v6:
+            res.update({
+                "compressed": ip.compressed,
+                "exploded": ip.exploded,
+                "eui64": f"Yes (MAC {mac})" if mac else "No (random / privacy interface ID)",
+                "embedded_ipv4": str(embedded_v4) if embedded_v4 else "None",
+            })
+        else:
+            # IPv6 Transition
+            # IPv4-mapped: ::ffff:c0a8:0101 for 192.168.1.1
+            res["ipv4_mapped"] = f"::ffff:{ip_int >> 16:04x}:{ip_int & 0xFFFF:04x}"
+            # 6to4: 2002:c0a8:0101::/48
+            res["prefix_6to4"] = f"2002:{ip_int >> 16:04x}:{ip_int & 0xFFFF:04x}::/48"
+
+        # Subnet Explorer: siblings inside the nearest enclosing parent block.
+        # Only the parent and counts are computed here; pages are generated
+        # lazily by iter_sibling_subnets().
+        parent_prefix = next((p for p in _SIBLING_PARENTS[network.version] if p < prefix), None)
+        if parent_prefix is not None:
+            parent_network = network.supernet(new_prefix=parent_prefix)
+            res["sibling_parent"] = str(parent_network)
+            res["sibling_count"] = 1 << (prefix - parent_prefix)
+            res["sibling_index"] = (int(network.network_address) - int(parent_network.network_address)) >> (bits - prefix)
+        else:
+            res["sibling_parent"] = None
+            res["sibling_count"] = 0
+            res["sibling_index"] = 0
+        return res
+    except Exception as e:
+        return {"error": str(e)}
+
+def _ip_to_int(ip_str):
+    """Fast IPv4/IPv6 text -> (version, int) without building ipaddress objects."""
+    if ":" in ip_str:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, ip_str), "big")
+    return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip_str), "big")
+
+def _int_to_ip(version, value):
+    """Fast (version, int) -> IPv4/IPv6 text."""
+    if version == 4:
+        return socket.inet_ntop(socket.AF_INET, value.to_bytes(4, "big"))
+    return socket.inet_ntop(socket.AF_INET6, value.to_bytes(16, "big"))
+
+def _span_label(span):
+    """Canonical CIDR text for a (version, first, last, prefixlen) span."""
+    return f"{_int_to_ip(span[0], span[1])}/{span[3]}"
+
+def _parse_prefix_list(prefix_text):
+    """Parses whitespace/comma separated CIDRs (# comments allowed) into (version, first, last, prefixlen) spans."""
+    spans, invalid = [], []
+    for line in prefix_text.splitlines():
+        line = line.split("#", 1)[0]
+        for token in re.split(r"[\s,;]+", line.strip()):
+            if not token:
+                continue
+            addr, _, plen = token.partition("/")
+            try:
+                version, value = _ip_to_int(addr)
+                bits = 32 if version == 4 else 128
+                plen = int(plen) if plen else bits
+                if not 0 <= plen <= bits:
+                    raise ValueError(plen)
+            except (OSError, ValueError):
+                invalid.append(token)
+                continue
+            host = (1 << (bits - plen)) - 1
+            first = value & ~host
+            spans.append((version, first, first | host, plen))
+    return spans, invalid
+
+def compile_cidr_index(spans):
+    """Compiles CIDR spans into sorted non-overlapping intervals labelled with the most specific CIDR."""
+    index = {}
+    for version in (4, 6):
+        ordered = sorted(
+            {(s[1], s[2], _span_label(s)) for s in spans if s[0] == version},
+            key=lambda s: (s[0], -s[1])
+        )
+        starts, ends, labels = [], [], []
+
+        def emit(lo, hi, label):
+            if lo > hi:
+                return
+            if labels and labels[-1] == label and ends[-1] + 1 == lo:
+                ends[-1] = hi
+            else:
+                starts.append(lo)
+                ends.append(hi)
+                labels.append(label)
+
+        # CIDRs are either nested or disjoint, so a stack sweep yields the
+        # longest-prefix owner of every elementary interval.
+        stack, cursor = [], 0
+        for lo, hi, label in ordered:
+            while stack and stack[-1][0] < lo:
+                top_hi, top_label = stack.pop()
+                emit(cursor, top_hi, top_label)
+                cursor = top_hi + 1
+            if stack:
+                emit(cursor, lo - 1, stack[-1][1])
+            stack.append((hi, label))
+            cursor = lo
+        while stack:
+            top_hi, top_label = stack.pop()
+            emit(cursor, top_hi, top_label)
+            cursor = top_hi + 1
+
+        index[version] = {"starts": starts, "ends": ends, "labels": labels}
+    return index
+
+def _range_to_cidrs(start, end, bits):
+    """Splits an inclusive integer range into the minimal list of (network_int, prefixlen)."""
+    out = []
+    while start <= end:
+        align = (start & -start).bit_length() - 1 if start else bits
+        fit = (end - start + 1).bit_length() - 1
+        k = min(align, fit)
+        out.append((start, bits - k))
+        start += 1 << k
+    return out
+
+def _merge_ranges(ranges):
+    """Merges sorted inclusive (start, end) ranges that overlap or touch."""
+    merged = []
+    for lo, hi in ranges:
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1][1] = hi
+        else:
+            merged.append([lo, hi])
+    return merged
+
+def _subtract_ranges(a, b):
+    """Returns the parts of merged ranges a not covered by merged ranges b (linear sweep)."""
+    out, j = [], 0
+    for lo, hi in a:
+        while j < len(b) and b[j][1] < lo:
+            j += 1
+        k, cur = j, lo
+        while k < len(b) and b[k][0] <= hi:
+            if b[k][0] > cur:
+                out.append([cur, b[k][0] - 1])
+            cur = max(cur, b[k][1] + 1)
+            k += 1
+        if cur <= hi:
+            out.append([cur, hi])
+    return out
+
+def _format_cidrs(ranges, version):
+    """Formats merged integer ranges as minimal CIDR strings."""
+    bits = 32 if version == 4 else 128
+    return [f"{_int_to_ip(version, net)}/{plen}" for lo, hi in ranges for net, plen in _range_to_cidrs(lo, hi, bits)]
+
+def _span_sort_key(span):
+    return (span[0], span[1], -span[2])
+
+def analyze_prefix_lists(list_a, list_b=None, limit=1000):
+    """Aggregates a prefix list, finds overlapping pairs, and optionally diffs it against a second list."""
+    try:
+        spans_a, invalid = _parse_prefix_list(list_a or "")
+        if not spans_a:
+            return {"error": "No valid prefixes in list A"}
+
+        # Family, then start address, then widest prefix first
+        uniq_a = sorted(set(spans_a), key=_span_sort_key)
+        merged_a = {v: _merge_ranges((s[1], s[2]) for s in uniq_a if s[0] == v) for v in (4, 6)}
+        aggregated = _format_cidrs(merged_a[4], 4) + _format_cidrs(merged_a[6], 6)
+
+        # Overlaps: prefixes are nested or disjoint, so a containment stack
+        # sweep finds every (container, contained) pair without pairwise checks.
+        overlaps = []
+        overlap_count = len(spans_a) - len(uniq_a)
+        if overlap_count:
+            counts = {}
+            for s in spans_a:
+                counts[s] = counts.get(s, 0) + 1
+            for s, c in counts.items():
+                if c > 1 and len(overlaps) < limit:
+                    overlaps.append({"type": f"duplicate x{c}", "outer": _span_label(s), "inner": _span_label(s)})
+        stack = []
+        for span in uniq_a:
+            while stack and (stack[-1][0] != span[0] or stack[-1][2] < span[1]):
+                stack.pop()
+            for outer in stack:
+                overlap_count += 1
+                if len(overlaps) < limit:
+                    overlaps.append({"type": "contained", "outer": _span_label(outer), "inner": _span_label(span)})
+            stack.append(span)
+
+        res = {
+            "input": len(spans_a),
+            "invalid": invalid,
+            "aggregated": aggregated,
+            "overlaps": overlaps,
+            "overlap_count": overlap_count,
+            "diff": None
+        }
+
+        if list_b and list_b.strip():
+            spans_b, invalid_b = _parse_prefix_list(list_b)
+            uniq_b = sorted(set(spans_b), key=_span_sort_key)
+            merged_b = {v: _merge_ranges((s[1], s[2]) for s in uniq_b if s[0] == v) for v in (4, 6)}
+            set_a, set_b = set(uniq_a), set(uniq_b)
+            res["invalid"] = invalid + invalid_b
+            res["diff"] = {
+                "added": [_span_label(s) for s in uniq_b if s not in set_a],
+                "removed": [_span_label(s) for s in uniq_a if s not in set_b],
+                "newly_covered": [c for v in (4, 6) for c in _format_cidrs(_subtract_ranges(merged_b[v], merged_a[v]), v)],
+                "no_longer_covered": [c for v in (4, 6) for c in _format_cidrs(_subtract_ranges(merged_a[v], merged_b[v]), v)],
+            }
+        return res
+    except Exception as e:
+        return {"error": str(e)}
+
+def find_free_space(parent_cidr, used_text, prefix=None, limit=100):
+    """Finds free blocks inside a parent CIDR given used IPs/subnets, with first-fit and best-fit placement."""
+    try:
+        parents, _ = _parse_prefix_list(parent_cidr or "")
+        if len(parents) != 1:
+            return {"error": "Provide a single parent CIDR"}
+        version, p_first, p_last, p_len = parents[0]
+        bits = 32 if version == 4 else 128
+
+        spans, invalid = _parse_prefix_list(used_text or "")
+        # Allocations are kept as a merged interval set, so cost scales with the
+        # number of allocations rather than the size of the parent block.
+        inside, outside = [], []
+        for s in spans:
+            if s[0] == version and s[1] >= p_first and s[2] <= p_last:
+                inside.append((s[1], s[2]))
+            elif s[0] != version or s[2] < p_first or s[1] > p_last:
+                outside.append(_span_label(s))
+            else:
+                inside.append((max(s[1], p_first), min(s[2], p_last)))
+        used = _merge_ranges(sorted(inside))
+        free = _subtract_ranges([[p_first, p_last]], used)
+
+        # Maximal aligned free CIDR blocks
+        blocks = [(net, plen) for lo, hi in free for net, plen in _range_to_cidrs(lo, hi, bits)]
+        total = p_last - p_first + 1
+        free_total = sum(hi - lo + 1 for lo, hi in free)
+        largest = min((plen for _, plen in blocks), default=None)
+        fragmentation = 1 - (1 << (bits - largest)) / free_total if blocks else 0.0
+
+        res = {
+            "parent": _span_label(parents[0]),
+            "version": version,
+            "total": total,
+            "used": total - free_total,
+            "free": free_total,
+            "utilization": (total - free_total) / total * 100,
+            "free_ranges": len(free),
+            "free_block_count": len(blocks),
+            "largest": f"/{largest}" if largest is not None else None,
+            "fragmentation": fragmentation,
+            "free_blocks": [
+                {"cidr": f"{_int_to_ip(version, net)}/{plen}", "size": 1 << (bits - plen)}
+                for net, plen in heapq.nsmallest(limit, blocks, key=lambda b: (b[1], b[0]))
+            ],
+            "invalid": invalid,
+            "outside": outside,
+            "request": None,
+        }
+
+        if prefix:
+            want = int(str(prefix).lstrip("/"))
+            if not p_len <= want <= bits:
+                return {"error": f"Requested prefix must be between /{p_len} and /{bits}"}
+            size = 1 << (bits - want)
+            first_fit = None
+            for lo, hi in free:
+                start = -(-lo // size) * size
+                if start + size - 1 <= hi:
+                    first_fit = f"{_int_to_ip(version, start)}/{want}"
+                    break
+            # Every aligned block of the requested size lies inside exactly one
+            # maximal free block, so best-fit is the smallest one that is big enough.
+            fitting = [(plen, net) for net, plen in blocks if plen <= want]
+            best = max(fitting, key=lambda b: (b[0], -b[1])) if fitting else None
+            res["request"] = {
+                "prefix": want,
+                "fit_count": sum(1 << (want - plen) for plen, _ in fitting),
+                "first_fit": first_fit,
+                "best_fit": f"{_int_to_ip(version, best[1])}/{want}" if best else None,
+                "best_fit_block": f"{_int_to_ip(version, best[1])}/{best[0]}" if best else None,
+            }
+        return res
+    except Exception as e:
+        return {"error": str(e)}
+
+_VLSM_ITEM_RE = re.compile(
+    r"^(?:(\d+)\s*(?:x|\*|subnets?\s+of|nets?\s+of|of)\s*)?(/\d{1,3}|\d+)\s*(?:hosts?|ips?|addresses)?\s*[:=-]?\s*(.*)$",
+    re.IGNORECASE
+)
+
+def plan_vlsm(supernet, requirements, limit=5000):
+    """Allocates host/prefix requirements inside a supernet using largest-first buddy allocation."""
+    try:
+        parents, _ = _parse_prefix_list(supernet or "")
+        if len(parents) != 1:
+            return {"error": "Provide a single supernet CIDR"}
+        version, p_first, p_last, p_len = parents[0]
+        bits = 32 if version == 4 else 128
+
+        # "3 subnets of 500 hosts, 12 of 60, 40x10 dmz, 2 x /26"
+        requests, invalid = [], []
+        for group, item in enumerate(re.split(r"[,;\n]+", requirements or ""), 1):
+            item = item.strip()
+            if not item:
+                continue
+            m = _VLSM_ITEM_RE.match(item)
+            if not m:
+                invalid.append(item)
+                continue
+            count = int(m.group(1) or 1)
+            spec, name = m.group(2), m.group(3).strip() or f"group{group}"
+            if spec.startswith("/"):
+                plen = int(spec[1:])
+                hosts = None
+            else:
+                hosts = int(spec)
+                # IPv4 loses the network and broadcast addresses; /31 and /32 are exact
+                need = hosts + 2 if version == 4 and hosts > 2 else max(hosts, 1)
+                plen = bits - (need - 1).bit_length()
+            if not 0 <= plen <= bits:
+                invalid.append(item)
+                continue
+            for n in range(count):
+                requests.append((plen, hosts, f"{name}-{n + 1}" if count > 1 else name))
+
+        if not requests:
+            return {"error": "No valid requirements"}
+
+        # Largest-first: every block size is a power of two no larger than the
+        # previous one, so a bump cursor is always aligned and never leaves holes
+        # (the buddy allocator degenerates to a single free pointer).
+        order = sorted(range(len(requests)), key=lambda i: (requests[i][0], i))
+        cursor = p_first
+        rows, failed = [], []
+        allocated = requested_hosts = 0
+        for i in order:
+            plen, hosts, name = requests[i]
+            size = 1 << (bits - plen)
+            if cursor + size - 1 > p_last:
+                failed.append({"name": name, "prefix": plen, "hosts": hosts})
+                continue
+            net, last = cursor, cursor + size - 1
+            cursor += size
+            allocated += size
+            usable = size - 2 if version == 4 and plen < 31 else size
+            want = hosts if hosts is not None else usable
+            requested_hosts += want
+            if len(rows) < limit:
+                rows.append({
+                    "name": name,
+                    "hosts": want,
+                    "cidr": f"{_int_to_ip(version, net)}/{plen}",
+                    "first": _int_to_ip(version, net + 1 if version == 4 and plen < 31 else net),
+                    "last": _int_to_ip(version, last - 1 if version == 4 and plen < 31 else last),
+                    "broadcast": _int_to_ip(version, last) if version == 4 else "",
+                    "usable": usable,
+                    "utilization": want / usable * 100 if usable else 0.0,
+                })
+
+        total = p_last - p_first + 1
+        leftover = _format_cidrs([[cursor, p_last]], version) if cursor <= p_last else []
+        return {
+            "supernet": _span_label(parents[0]),
+            "version": version,
+            "requested": len(requests),
+            "allocated_count": len(requests) - len(failed),
+            "rows": rows,
+            "truncated": len(requests) - len(failed) > len(rows),
+            "failed": failed,
+            "invalid": invalid,
+            "allocated": allocated,
+            "total": total,
+            "supernet_utilization": allocated / total * 100,
+            "host_efficiency": requested_hosts / allocated * 100 if allocated else 0.0,
+            "leftover": leftover,
+            "leftover_size": p_last - cursor + 1 if cursor <= p_last else 0,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+def export_vlsm_plan(plan, fmt="csv"):
+    """Renders a plan_vlsm result as CSV or JSON text."""
+    if fmt == "json":
+        keys = ("supernet", "supernet_utilization", "host_efficiency", "rows", "failed", "leftover")
+        return json.dumps({k: plan[k] for k in keys}, indent=2)
+    buf = io.StringIO()
+    fields = ["name", "cidr", "first", "last", "broadcast", "hosts", "usable", "utilization"]
+    writer = csv.DictWriter(buf, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for row in plan["rows"]:
+        writer.writerow(dict(row, utilization=f"{row['utilization']:.1f}"))
+    return buf.getvalue()
+
+_PTR_OCTETS = [str(i) for i in range(256)]
+
+def generate_ptr_zone(prefix, template, output_path=None, ttl=3600, ns=None, classless=False, preview=50, max_records=1 << 24):
+    """Streams PTR records for every address in a prefix to a zone file using a hostname template.
+
+    IPv4 placeholders: {a} {b} {c} {d} {ip} (a-b-c-d) {n}; IPv6: {ip} (compressed, ':' -> '-') {hex} {n}.
+    """
+    try:
+        spans, _ = _parse_prefix_list(prefix or "")
+        if len(spans) != 1:
+            return {"error": "Provide a single IPv4 or IPv6 prefix"}
+        version, first, last, plen = spans[0]
+        count = last - first + 1
+        if count > max_records:
+            return {"error": f"/{plen} has {count:,} addresses; use a prefix with at most {max_records:,}"}
+        if not template or "{" not in template:
+            return {"error": "Hostname template needs at least one placeholder, e.g. host-{ip}.example.com"}
+        host_fmt = template if template.endswith(".") else template + "."
+
+        # Zone cut at the enclosing octet (IPv4) or nibble (IPv6) boundary
+        step = 8 if version == 4 else 4
+        zone_labels = plen // step
+        if version == 4:
+            octs = [(first >> s) & 255 for s in (24, 16, 8, 0)]
+            zone = ".".join(_PTR_OCTETS[o] for o in reversed(octs[:zone_labels])) + ".in-addr.arpa"
+            zone = zone if zone_labels else "in-addr.arpa"
+        else:
+            nibbles = format(first, "032x")
+            zone = ".".join(reversed(nibbles[:zone_labels])) + ".ip6.arpa" if zone_labels else "ip6.arpa"
+
+        delegation, parent = [], None
+        if classless:
+            if version != 4 or not 24 < plen <= 32:
+                return {"error": "RFC 2317 classless delegation applies to IPv4 prefixes longer than /24"}
+            # Records live under "<first>/<len>.c.b.a.in-addr.arpa"; the parent
+            # /24 zone gets one CNAME per address pointing into it.
+            parent = ".".join(_PTR_OCTETS[o] for o in reversed(octs[:3])) + ".in-addr.arpa"
+            zone = f"{first & 255}/{plen}.{parent}"
+            delegation = [f"{v & 255}\tIN\tCNAME\t{v & 255}.{zone}." for v in range(first, last + 1)]
+
+        def owners():
+            if version == 4:
+                host_octets = 1 if classless else 4 - zone_labels
+                for n, v in enumerate(range(first, last + 1)):
+                    a, b, c, d = _PTR_OCTETS[v >> 24], _PTR_OCTETS[(v >> 16) & 255], _PTR_OCTETS[(v >> 8) & 255], _PTR_OCTETS[v & 255]
+                    owner = (d, f"{d}.{c}", f"{d}.{c}.{b}", f"{d}.{c}.{b}.{a}")[host_octets - 1] if host_octets else "@"
+                    yield owner, {"a": a, "b": b, "c": c, "d": d, "ip": f"{a}-{b}-{c}-{d}", "n": n}
+            else:
+                for n, v in enumerate(range(first, last + 1)):
+                    hexstr = format(v, "032x")
+                    owner = ".".join(reversed(hexstr[zone_labels:])) or "@"
+                    # Hostname labels cannot start or end with "-" ("2001:db8::" -> "2001-db8--0")
+                    ip = socket.inet_ntop(socket.AF_INET6, v.to_bytes(16, "big")).replace(":", "-")
+                    ip = ("0" if ip[0] == "-" else "") + ip + ("0" if ip[-1] == "-" else "")
+                    yield owner, {"ip": ip, "hex": hexstr, "n": n}
+
+        header = [f"$ORIGIN {zone}.", f"$TTL {int(ttl)}"]
+        if ns:
+            ns_fqdn = ns if ns.endswith(".") else ns + "."
+            serial = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d01")
+            header += [
+                f"@\tIN\tSOA\t{ns_fqdn} hostmaster.{ns_fqdn.split('.', 1)[1] or ns_fqdn} ({serial} 3600 900 1209600 {int(ttl)})",
+                f"@\tIN\tNS\t{ns_fqdn}",
+            ]
+
+        lines, written = [], 0
+        sample = list(header)
+        out = open(output_path, "w") if output_path else None
+        try:
+            if out:
+                out.write("\n".join(header) + "\n")
+            for owner, fields in owners():
+                line = f"{owner}\tIN\tPTR\t{host_fmt.format_map(fields)}"
+                written += 1
+                if len(sample) < len(header) + preview:
+                    sample.append(line)
+                elif not out:
+                    break
+                if out:
+                    lines.append(line)
+                    if len(lines) >= 10000:
+                        out.write("\n".join(lines) + "\n")
+                        lines.clear()
+            if out and lines:
+                out.write("\n".join(lines) + "\n")
+        finally:
+            if out:
+                out.close()
+
+        return {
+            "zone": zone,
+            "version": version,
+            "records": count,
+            "written": written if out else 0,
+            "output": output_path,
+            "preview": sample,
+            "delegation": delegation,
+            "parent_zone": parent,
+        }
+    except KeyError as e:
+        return {"error": f"Unknown placeholder {e} in template"}
+    except Exception as e:
+        return {"error": str(e)}
+
+def match_ips_to_cidrs(cidr_text, ip_path, unmatched_path=None, sample_limit=100, chunk_lines=500_000):
+    """Streams IPs from a file and counts hits per CIDR using a compiled interval index."""
+    try:
+        spans, invalid_cidrs = _parse_prefix_list(cidr_text or "")
+        if not spans:
+            return {"error": "No valid CIDRs provided"}
+        if not ip_path:
+            return {"error": "Provide a path to an IP list"}
+
+        index = compile_cidr_index(spans)
+        hits = {_span_label(s): 0 for s in spans}
+        total = matched = invalid = 0
+        unmatched_sample = []
+        unmatched_out = open(unmatched_path, "w") if unmatched_path else None
+
+        # Vectorized IPv4 lookups when NumPy is available
+        v4 = index[4]
+        np_starts = np.array(v4["starts"], dtype=np.uint64) if np is not None else None
+        np_ends = np.array(v4["ends"], dtype=np.uint64) if np is not None else None
+
+        def record_miss(ip_str):
+            if len(unmatched_sample) < sample_limit:
+                unmatched_sample.append(ip_str)
+            if unmatched_out:
+                unmatched_out.write(ip_str + "\n")
+
+        try:
+            with open(ip_path, "r", errors="replace") as f:
+                while True:
+                    lines = list(itertools.islice(f, chunk_lines))
+                    if not lines:
+                        break
+                    v4_ips, v4_vals = [], []
+                    for line in lines:
+                        fields = line.split(None, 1)
+                        if not fields:
+                            continue
+                        ip_str = fields[0]
+                        total += 1
+                        try:
+                            version, value = _ip_to_int(ip_str)
+                        except OSError:
+                            invalid += 1
+                            continue
+                        if version == 4 and np_starts is not None:
+                            v4_ips.append(ip_str)
+                            v4_vals.append(value)
+                            continue
+                        tbl = index[version]
+                        pos = bisect.bisect_right(tbl["starts"], value) - 1
+                        if pos >= 0 and value <= tbl["ends"][pos]:
+                            label = tbl["labels"][pos]
+                            hits[label] += 1
+                            matched += 1
+                        else:
+                            record_miss(ip_str)
+
+                    if v4_vals:
+                        vals = np.array(v4_vals, dtype=np.uint64)
+                        pos = np.searchsorted(np_starts, vals, side="right").astype(np.int64) - 1
+                        ok = pos >= 0
+                        ok[ok] = vals[ok] <= np_ends[pos[ok]]
+                        found, counts = np.unique(pos[ok], return_counts=True)
+                        for p, c in zip(found.tolist(), counts.tolist()):
+                            label = v4["labels"][p]
+                            hits[label] += c
+                        matched += int(ok.sum())
+                        for i in np.flatnonzero(~ok).tolist():
+                            record_miss(v4_ips[i])
+        finally:
+            if unmatched_out:
+                unmatched_out.close()
+
+        per_cidr = sorted(hits.items(), key=lambda kv: kv[1], reverse=True)
+        return {
+            "total": total,
+            "matched": matched,
+            "unmatched": total - matched - invalid,
+            "invalid": invalid,
+            "cidrs": len(spans),
+            "invalid_cidrs": invalid_cidrs,
+            "intervals": len(index[4]["starts"]) + len(index[6]["starts"]),
+            "hits": [{"cidr": k, "count": v} for k, v in per_cidr],
+            "unmatched_sample": unmatched_sample,
+            "unmatched_path": unmatched_path,
+            "engine": "numpy" if np is not None else "bisect"
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+# Boundaries keep dotted version strings ("v1.2.3.4", "1.2.3.4.5") out while
+# still accepting an address that ends a sentence ("from 1.2.3.4.").
+_LOG_V4_RE = re.compile(rb"(?<![\w.])\d+\.\d+\.\d+\.\d+(?!\.?\d)")
+_LOG_V6_ANCHOR_RE = re.compile(rb"::")
+# Uncompressed form minus its first group; the leading ':' lets re skip ahead with a literal search
+_LOG_V6_FULL_RE = re.compile(rb":(?:[0-9A-Fa-f]{1,4}:){6}[0-9A-Fa-f]{1,4}(?![0-9A-Fa-f:])")
+_LOG_V6_TAIL_RE = re.compile(rb"[0-9A-Fa-f:.]*")
+_LOG_HEXCOLON = frozenset(b"0123456789abcdefABCDEF:")
+# An address never touches a word character or a '.' on the outside; this is what keeps C++/Rust/PHP
+# scope resolution ("std::vector", "Tab::add", "String::valueOf") out of the '::' expansion.
+_LOG_V6_EDGE = frozenset(b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_.:")
+
+# Non-public IPv4 blocks as sorted, non-overlapping (start, end, class)
+_IPV4_SPECIAL = [
+    (0x00000000, 0x00FFFFFF, "reserved"),   # 0.0.0.0/8
+    (0x0A000000, 0x0AFFFFFF, "private"),    # 10.0.0.0/8
+    (0x64400000, 0x647FFFFF, "reserved"),   # 100.64.0.0/10 shared (CGNAT)
+    (0x7F000000, 0x7FFFFFFF, "reserved"),   # 127.0.0.0/8 loopback
+    (0xA9FE0000, 0xA9FEFFFF, "reserved"),   # 169.254.0.0/16 link-local
+    (0xAC100000, 0xAC1FFFFF, "private"),    # 172.16.0.0/12
+    (0xC0000000, 0xC00000FF, "reserved"),   # 192.0.0.0/24
+    (0xC0000200, 0xC00002FF, "reserved"),   # 192.0.2.0/24 TEST-NET-1
+    (0xC0A80000, 0xC0A8FFFF, "private"),    # 192.168.0.0/16
+    (0xC6120000, 0xC613FFFF, "reserved"),   # 198.18.0.0/15 benchmarking
+    (0xC6336400, 0xC63364FF, "reserved"),   # 198.51.100.0/24 TEST-NET-2
+    (0xCB007100, 0xCB0071FF, "reserved"),   # 203.0.113.0/24 TEST-NET-3
+    (0xE0000000, 0xFFFFFFFF, "reserved"),   # 224.0.0.0/4 multicast, 240.0.0.0/4, broadcast
+]
+_IP_CLASSES = ("private", "public", "reserved")
+
+def _ipv6_class(value):
+    if value >> 121 == 0x7E:  # fc00::/7 unique local
+        return "private"
+    return "public" if ipaddress.IPv6Address(value).is_global else "reserved"
+
+def _scan_ipv6(chunk, counts):
+    """Collects IPv6 addresses: compressed ones by expanding around each '::', full ones from a ':'-anchored run of seven groups."""
+    for m in _LOG_V6_FULL_RE.finditer(chunk):
+        start = pos = m.start()
+        while start > 0 and pos - start < 5 and chunk[start - 1] in _LOG_HEXCOLON:
+            start -= 1
+        if start == pos or pos - start > 4 or b":" in chunk[start:pos] or (start > 0 and chunk[start - 1] in _LOG_V6_EDGE):
+            continue
+        if m.end() < len(chunk) and chunk[m.end()] in _LOG_V6_EDGE and chunk[m.end()] != 46:
+            continue
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET6, chunk[start:m.end()].decode("ascii")), "big")
+        counts[value] = counts.get(value, 0) + 1
+    if b"::" not in chunk:
+        return
+    last_end = 0
+    for m in _LOG_V6_ANCHOR_RE.finditer(chunk):
+        pos = m.start()
+        if pos < last_end:
+            continue
+        start = pos
+        while start > 0 and chunk[start - 1] in _LOG_HEXCOLON:
+            start -= 1
+        end = _LOG_V6_TAIL_RE.match(chunk, pos).end()
+        last_end = end
+        while chunk[end - 1] == 46:  # a trailing '.' ends the sentence, not the address
+            end -= 1
+        if (start > 0 and chunk[start - 1] in _LOG_V6_EDGE) or (end < len(chunk) and chunk[end] in _LOG_V6_EDGE and chunk[end] != 46):
+            continue
+        groups = [g for g in chunk[start:end].split(b":") if g]
+        # bare '::' and a lone non-numeric group ("::add", "ab::") are far likelier identifiers than addresses
+        if not groups or (len(groups) == 1 and not any(48 <= c <= 57 for c in groups[0])):
+            continue
+        try:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET6, chunk[start:end].decode("ascii")), "big")
+        except (OSError, UnicodeDecodeError):
+            continue
+        counts[value] = counts.get(value, 0) + 1
+
+def analyze_log_ips(path, prefix_len=24, prefix_len_v6=64, top_k=20, chunk_bytes=8 << 20):
+    """Extracts IPv4/IPv6 addresses from a log file in chunks and reports distinct counts, top prefixes and a private/public/reserved split."""
+    try:
+        if not path or not os.path.isfile(path):
+            return {"error": "Provide a path to a log file"}
+        prefix_len, prefix_len_v6 = int(prefix_len), int(prefix_len_v6)
+        if not (0 <= prefix_len <= 32 and 0 <= prefix_len_v6 <= 128):
+            return {"error": "Prefix length out of range"}
+
+        started = datetime.datetime.now()
+        size = os.path.getsize(path)
+        lines = rejected = 0
+        v6_counts = {}
+        # IPv4: NumPy path buffers packed uint32 addresses and folds them into
+        # (distinct keys, counts) periodically; fallback counts the raw matches.
+        keys = counts = None
+        pending, pending_n = [], 0
+        raw_counts = {}
+
+        def fold():
+            nonlocal keys, counts, pending, pending_n
+            if not pending:
+                return
+            batch_keys, batch_counts = np.unique(np.concatenate(pending), return_counts=True)
+            if keys is None:
+                keys, counts = batch_keys, batch_counts
+            else:
+                keys, inverse = np.unique(np.concatenate([keys, batch_keys]), return_inverse=True)
+                counts = np.bincount(inverse, weights=np.concatenate([counts, batch_counts])).astype(np.int64)
+            pending, pending_n = [], 0
+
+        with open(path, "rb") as f:
+            carry = b""
+            while True:
+                block = f.read(chunk_bytes)
+                if not block and not carry:
+                    break
+                if block:
+                    cut = block.rfind(b"\n") + 1
+                    if not cut:
+                        carry += block
+                        continue
+                    chunk, carry = carry + block[:cut], block[cut:]
+                else:
+                    chunk, carry = carry, b""
+                lines += chunk.count(b"\n")
+
+                matches = _LOG_V4_RE.findall(chunk)
+                if matches and np is not None:
+                    octets = np.fromstring(b".".join(matches).decode("ascii"), dtype=np.int64, sep=".").reshape(-1, 4)
+                    valid = (octets <= 255).all(axis=1)
+                    rejected += int(len(valid) - valid.sum())
+                    octets = octets[valid]
+                    packed = ((octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]).astype(np.uint32)
+                    pending.append(packed)
+                    pending_n += len(packed)
+                    if pending_n >= 16_000_000:
+                        fold()
+                elif matches:
+                    for m in matches:
+                        raw_counts[m] = raw_counts.get(m, 0) + 1
+                _scan_ipv6(chunk, v6_counts)
+
+        # Per-address IPv4 counts
+        if np is not None:
+            fold()
+            if keys is None:
+                keys, counts = np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.int64)
+        else:
+            merged = {}
+            for m, c in raw_counts.items():
+                try:
+                    value = int.from_bytes(socket.inet_aton(m.decode("ascii")), "big")
+                except OSError:
+                    rejected += c
+                    continue
+                if m.count(b".") != 3:
+                    rejected += c
+                    continue
+                merged[value] = merged.get(value, 0) + c
+            keys, counts = sorted(merged), None
+            counts = [merged[k] for k in keys]
+
+        split = {c: {"hits": 0, "distinct": 0} for c in _IP_CLASSES}
+        prefixes, top_ips = [], []
+        shift = 32 - prefix_len
+        if np is not None and len(keys):
+            starts = np.array([s for s, _, _ in _IPV4_SPECIAL], dtype=np.uint32)
+            ends = np.array([e for _, e, _ in _IPV4_SPECIAL], dtype=np.uint32)
+            classes = np.array([_IP_CLASSES.index(c) for _, _, c in _IPV4_SPECIAL])
+            idx = np.searchsorted(starts, keys, side="right") - 1
+            special = (idx >= 0) & (keys <= ends[np.maximum(idx, 0)])
+            cls = np.where(special, classes[np.maximum(idx, 0)], _IP_CLASSES.index("public"))
+            hits_by_class = np.bincount(cls, weights=counts, minlength=3)
+            distinct_by_class = np.bincount(cls, minlength=3)
+            for i, name in enumerate(_IP_CLASSES):
+                split[name]["hits"] += int(hits_by_class[i])
+                split[name]["distinct"] += int(distinct_by_class[i])
+
+            nets, inverse = np.unique(keys.astype(np.uint64) >> shift, return_inverse=True)
+            net_hits = np.bincount(inverse, weights=counts).astype(np.int64)
+            net_distinct = np.bincount(inverse)
+            for i in np.argsort(-net_hits, kind="stable")[:top_k]:
+                prefixes.append((int(net_hits[i]), int(net_distinct[i]), f"{_int_to_ip(4, int(nets[i]) << shift)}/{prefix_len}"))
+            for i in np.argsort(-counts, kind="stable")[:top_k]:
+                top_ips.append((int(counts[i]), _int_to_ip(4, int(keys[i])), _IP_CLASSES[int(cls[i])]))
+            v4_total, v4_distinct = int(counts.sum()), len(keys)
+        else:
+            starts = [s for s, _, _ in _IPV4_SPECIAL]
+            nets = {}
+            for value, c in zip(keys, counts):
+                i = bisect.bisect_right(starts, value) - 1
+                name = _IPV4_SPECIAL[i][2] if i >= 0 and value <= _IPV4_SPECIAL[i][1] else "public"
+                split[name]["hits"] += c
+                split[name]["distinct"] += 1
+                net = nets.setdefault(value >> shift, [0, 0])
+                net[0] += c
+                net[1] += 1
+                top_ips.append((c, _int_to_ip(4, value), name))
+            prefixes = [(h, d, f"{_int_to_ip(4, n << shift)}/{prefix_len}") for n, (h, d) in nets.items()]
+            v4_total, v4_distinct = sum(counts), len(keys)
+
+        # IPv6 is rare in most logs; a plain dict is enough
+        shift6 = 128 - prefix_len_v6
+        nets6 = {}
+        for value, c in v6_counts.items():
+            name = _ipv6_class(value)
+            split[name]["hits"] += c
+            split[name]["distinct"] += 1
+            net = nets6.setdefault(value >> shift6, [0, 0])
+            net[0] += c
+            net[1] += 1
+            top_ips.append((c, _int_to_ip(6, value), name))
+        prefixes += [(h, d, f"{_int_to_ip(6, n << shift6)}/{prefix_len_v6}") for n, (h, d) in nets6.items()]
+
+        elapsed = max((datetime.datetime.now() - started).total_seconds(), 1e-6)
+        return {
+            "path": path,
+            "bytes": size,
+            "lines": lines,
+            "elapsed": elapsed,
+            "mb_per_sec": size / elapsed / 1e6,
+            "engine": "numpy" if np is not None else "python",
+            "ipv4": {"total": v4_total, "distinct": v4_distinct},
+            "ipv6": {"total": sum(v6_counts.values()), "distinct": len(v6_counts)},
+            "rejected": rejected,
+            "split": split,
+            "prefix_len": prefix_len,
+            "prefix_len_v6": prefix_len_v6,
+            "top_prefixes": [{"prefix": p, "hits": h, "distinct": d} for h, d, p in heapq.nlargest(top_k, prefixes)],
+            "top_ips": [{"ip": ip, "hits": h, "class": c} for h, ip, c in heapq.nlargest(top_k, top_ips)],
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+def _sketch_hash(item):
+    """Stable 64-bit hash shared by the streaming sketches (blake2b, so results do not depend on PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(item.encode("utf-8", "replace"), digest_size=8).digest(), "little")
+
+class SpaceSaving:
+    """Space-Saving top-K counter: at most `capacity` monitored keys, each count overestimated by at most its error.
+
+    Evictions pick the minimum through a lazy heap holding one entry per key; increments only touch the
+    dict, and a stale heap entry is refreshed when it surfaces, so the amortized cost stays O(log k).
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = max(1, int(capacity))
+        self.counts = {}
+        self.errors = {}
+        self.heap = []
+        self.total = 0
+
+    def add(self, item, n=1):
+        self.total += n
+        counts = self.counts
+        if item in counts:
+            counts[item] += n
+            return
+        if len(counts) < self.capacity:
+            counts[item] = n
+            self.errors[item] = 0
+            heapq.heappush(self.heap, (n, item))
+            return
+        heap = self.heap
+        while True:
+            low, key = heap[0]
+            current = counts[key]
+            if current == low:
+                break
+            heapq.heapreplace(heap, (current, key))
+        del counts[key], self.errors[key]
+        counts[item] = low + n
+        self.errors[item] = low
+        heapq.heapreplace(heap, (low + n, item))
+
+    def top(self, k):
+        """Largest k keys as (key, count, error); count - error is a guaranteed lower bound."""
+        return [(key, c, self.errors[key]) for key, c in heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])]
+
+class CountMinSketch:
+    """Count-Min sketch: point estimates never undercount and overcount by at most e/width of the total with probability 1 - e^-depth."""
+
+    def __init__(self, width=2048, depth=4):
+        self.width = max(1, int(width))
+        self.depth = max(1, int(depth))
+        self.rows = [[0] * self.width for _ in range(self.depth)]
+
+    def _cells(self, item):
+        h = _sketch_hash(item)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item, n=1):
+        for row, idx in zip(self.rows, self._cells(item)):
+            row[idx] += n
+
+    def estimate(self, item):
+        return min(row[idx] for row, idx in zip(self.rows, self._cells(item)))
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**p one-byte registers (standard error about 1.04 / sqrt(2**p))."""
+
+    def __init__(self, p=14):
+        self.p = min(16, max(4, int(p)))
+        self.m = 1 << self.p
+        self.registers = bytearray(self.m)
+
+    def add(self, item):
+        h = _sketch_hash(item)
+        rest_bits = 64 - self.p
+        idx, rest = h >> rest_bits, h & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self):
+        m = self.m
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting is exact-ish for small cardinalities
+        return estimate
+
+# Nginx/Apache "combined" (and "common", without referer/agent) log format
+_ACCESS_RE = re.compile(r'(\S+) \S+ \S+ \[([^\]]+)\] "(?:(\S+) (\S+)[^"]*|[^"]*)" (\d{3}) (\d+|-)(?: "([^"]*)" "([^"]*)")?')
+
+def analyze_access_log(path, top_k=20, capacity=1000, cm_width=2048, cm_depth=4, hll_p=14, max_buckets=720, query_paths=None, unparsed_limit=20):
+    """Streams an Nginx access log (plain or .gz) into fixed-size summaries.
+
+    Space-Saving tracks the top client IPs, paths and user agents, a Count-Min sketch answers per-path
+    frequencies, HyperLogLog counts distinct clients and paths, and the per-minute status series
+    doubles its bucket width whenever it would exceed max_buckets, so memory does not grow with the file.
+    """
+    try:
+        if not path or not os.path.isfile(path):
+            return {"error": "Provide a path to an access log file"}
+        size = os.path.getsize(path)
+        ips, paths, agents = SpaceSaving(capacity), SpaceSaving(capacity), SpaceSaving(capacity)
+        path_cm = CountMinSketch(cm_width, cm_depth)
+        clients, distinct_paths = HyperLogLog(hll_p), HyperLogLog(hll_p)
+        statuses = {}
+        buckets, width = {}, 1
+        minute_cache = {}
+        lines = parsed = body_bytes = 0
+        unparsed_samples = []
+        first_minute = last_minute = None
+        started = time.perf_counter()
+        opener = gzip.open if path.endswith(".gz") else open
+        match = _ACCESS_RE.match
+
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            for lines, line in enumerate(f, 1):
+                m = match(line)
+                if m is None:
+                    if len(unparsed_samples) < unparsed_limit:
+                        unparsed_samples.append({"line": lines, "text": line.rstrip("\r\n")[:500]})
+                    continue
+                parsed += 1
+                ip, ts, _method, req_path, status, sent, _referer, agent = m.groups()
+                ips.add(ip)
+                clients.add(ip)
+                if req_path is not None:
+                    req_path = req_path.split("?", 1)[0]
+                    paths.add(req_path)
+                    path_cm.add(req_path)
+                    distinct_paths.add(req_path)
+                if agent is not None:
+                    agents.add(agent)
+                statuses[status] = statuses.get(status, 0) + 1
+                if sent != "-":
+                    body_bytes += int(sent)
+
+                # "21/Mar/2024:10:15:30 +0000" -> UTC minute; logs are mostly ordered, so the cache stays tiny
+                key = ts[:17] + ts[20:]
+                minute = minute_cache.get(key)
+                if minute is None:
+                    try:
+                        dt = datetime.datetime.strptime(key, "%d/%b/%Y:%H:%M %z")
+                    except ValueError:
+                        continue
+                    if len(minute_cache) > 4096:
+                        minute_cache.clear()
+                    minute = minute_cache[key] = int(dt.timestamp()) // 60
+                first_minute = minute if first_minute is None or minute < first_minute else first_minute
+                last_minute = minute if last_minute is None or minute > last_minute else last_minute
+                bucket = buckets.get(minute // width)
+                if bucket is None:
+                    bucket = buckets[minute // width] = [0, 0, 0, 0, 0, 0]
+                    while len(buckets) > max_buckets:
+                        # Coarsen: merge neighbouring buckets instead of growing
+                        width *= 2
+                        merged = {}
+                        for b, counts in buckets.items():
+                            target = merged.setdefault(b // 2, [0, 0, 0, 0, 0, 0])
+                            for i, c in enumerate(counts):
+                                target[i] += c
+                        buckets = merged
+                        bucket = buckets[minute // width]
+                bucket[0] += 1
+                if "1" <= status[0] <= "5":
+                    bucket[int(status[0])] += 1
+
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        series = [
+            {
+                "time": datetime.datetime.fromtimestamp(b * width * 60, tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M"),
+                "total": c[0], "1xx": c[1], "2xx": c[2], "3xx": c[3], "4xx": c[4], "5xx": c[5],
+            }
+            for b, c in sorted(buckets.items())
+        ]
+        return {
+            "path": path,
+            "bytes": size,
+            "lines": lines,
+            "parsed": parsed,
+            "unparsed": lines - parsed,
+            "unparsed_samples": unparsed_samples,
+            "body_bytes": body_bytes,
+            "elapsed": elapsed,
+            "mb_per_sec": size / elapsed / 1e6,
+            "distinct_clients": round(clients.count()),
+            "distinct_paths": round(distinct_paths.count()),
+            "top_ips": [{"key": k, "count": c, "error": err} for k, c, err in ips.top(top_k)],
+            "top_paths": [{"key": k, "count": c, "error": err, "estimate": path_cm.estimate(k)} for k, c, err in paths.top(top_k)],
+            "top_agents": [{"key": k, "count": c, "error": err} for k, c, err in agents.top(top_k)],
+            "path_queries": {p: path_cm.estimate(p) for p in (query_paths or [])},
+            "statuses": [{"status": s, "count": c} for s, c in sorted(statuses.items())],
+            "series": series,
+            "bucket_minutes": width,
+            "span_minutes": 0 if first_minute is None else last_minute - first_minute + 1,
+            "sketch": {
+                "capacity": ips.capacity,
+                "cm_width": path_cm.width,
+                "cm_depth": path_cm.depth,
+                "cm_error": math.e / path_cm.width * paths.total,
+                "hll_registers": clients.m,
+                "hll_error": 1.04 / math.sqrt(clients.m),
+            },
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+_JVM_FRAME_RE = re.compile(r"\s+at\s+([\w$.<>/\-]+)\(([^)]*)\)")
+_JVM_MORE_RE = re.compile(r"\s+\.\.\. \d+ (?:more|common frames omitted)")
+_JVM_CAUSE_RE = re.compile(r"\s*(?:Caused by|Suppressed): ([\w$.]+)(?::\s?(.*))?")
+_JVM_HEADER_RE = re.compile(r"(?:.*?[\s:\]\-])?((?:[a-zA-Z_$][\w$]*\.)+[A-Z][\w$]*(?:Exception|Error|Throwable|Fault)\b)(?::\s?(.*))?")
+_JVM_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?")
+# Generated class names differ between runs and JVMs: Foo$$Lambda$123/0x0000000800c4b440, $Proxy45, GeneratedMethodAccessor12
+_JVM_VOLATILE_RE = re.compile(r"(\$\$Lambda)(?:\$\d+)?/0x[0-9a-f]+|(\$Proxy)\d+|(Accessor)\d+|(\$\$EnhancerBySpringCGLIB)\$\$[0-9a-f]+")
+
+def _jvm_frame(method, location, strip_line_numbers):
+    """Normalized frame text used in fingerprints."""
+    method = _JVM_VOLATILE_RE.sub(r"\1\2\3\4", method)
+    if strip_line_numbers:
+        location = location.split(":", 1)[0]
+    return f"{method}({location})"
+
+def fingerprint_stack_traces(text=None, path=None, top_frames=5, strip_line_numbers=True, limit=200, max_trace_lines=60):
+    """Reassembles multi-line JVM stack traces from a log and groups them by fingerprint, in one streaming pass.
+
+    A fingerprint hashes the exception class, the classes of its causes and the top frames with generated
+    class names (lambdas, proxies, accessors) normalized and, optionally, line numbers stripped. Messages
+    are ignored, so traces that differ only in IDs or values collapse into one group. Memory grows with the
+    number of distinct fingerprints, not with the number of traces.
+    """
+    try:
+        if path:
+            if not os.path.isfile(path):
+                return {"error": "Provide a path to a log file"}
+            size = os.path.getsize(path)
+            source = gzip.open(path, "rt", encoding="utf-8", errors="replace") if path.endswith(".gz") else open(path, "r", errors="replace")
+        elif text:
+            size = len(text.encode("utf-8", "replace"))
+            source = io.StringIO(text)
+        else:
+            return {"error": "Provide a log text or a file path"}
+
+        groups = {}
+        traces = lines = 0
+        trace = None
+        prev = prev2 = ""
+        started = time.perf_counter()
+
+        def finish(t):
+            nonlocal traces
+            traces += 1
+            key = "\n".join([t["exception"], *t["causes"], *t["frames"][:top_frames]])
+            fp = hashlib.blake2b(key.encode("utf-8"), digest_size=6).hexdigest()
+            g = groups.get(fp)
+            if g is None:
+                groups[fp] = {
+                    "fingerprint": fp, "count": 1,
+                    "exception": t["exception"], "message": t["message"], "causes": t["causes"],
+                    "frames": t["frames"][:top_frames],
+                    "first_seen": t["ts"], "last_seen": t["ts"], "first_line": t["line"], "last_line": t["line"],
+                    "representative": "\n".join(t["text"]) + ("\n..." if t["truncated"] else ""),
+                }
+            else:
+                g["count"] += 1
+                g["last_line"] = t["line"]
+                if t["ts"]:
+                    g["last_seen"] = t["ts"]
+                    g["first_seen"] = g["first_seen"] or t["ts"]
+
+        with source:
+            for lines, line in enumerate(source, 1):
+                line = line.rstrip("\r\n")
+                frame = _JVM_FRAME_RE.match(line)
+                if frame:
+                    if trace is None:
+                        # The exception header is the line right above the first frame
+                        header = _JVM_HEADER_RE.match(prev)
+                        ts = _JVM_TS_RE.search(prev) or _JVM_TS_RE.search(prev2)
+                        trace = {
+                            "exception": header.group(1) if header else "(unknown)",
+                            "message": ((header.group(2) or "") if header else prev)[:300],
+                            "causes": [], "frames": [], "in_cause": False,
+                            "ts": ts.group() if ts else None, "line": lines - 1,
+                            "text": [prev], "truncated": False,
+                        }
+                    if not trace["in_cause"]:
+                        trace["frames"].append(_jvm_frame(frame.group(1), frame.group(2), strip_line_numbers))
+                elif trace is not None and (_JVM_MORE_RE.match(line) or _JVM_CAUSE_RE.match(line)):
+                    cause = _JVM_CAUSE_RE.match(line)
+                    if cause and not _JVM_MORE_RE.match(line):
+                        trace["causes"].append(cause.group(1))
+                        trace["in_cause"] = True
+                elif trace is not None:
+                    finish(trace)
+                    trace = None
+                if trace is not None:
+                    if len(trace["text"]) < max_trace_lines:
+                        trace["text"].append(line)
+                    else:
+                        trace["truncated"] = True
+                prev2, prev = prev, line
+            if trace is not None:
+                finish(trace)
+
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        ordered = sorted(groups.values(), key=lambda g: (-g["count"], g["first_line"]))
+        return {
+            "source": path or "text",
+            "bytes": size,
+            "lines": lines,
+            "traces": traces,
+            "distinct": len(groups),
+            "groups": ordered[:limit],
+            "truncated": len(ordered) > limit,
+            "elapsed": elapsed,
+            "mb_per_sec": size / elapsed / 1e6,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+def test_regex(pattern, text, progress=None, max_matches=None):
+    try:
+        matches = []
+        for match in re.finditer(pattern, text):
+            if progress is not None:
+                progress[0] = match.end()
+            if max_matches is not None and len(matches) >= max_matches:
+                return {"matches": matches, "count": len(matches), "budget": f"stopped after the {max_matches:,} match budget"}
+            matches.append({
+                "match": match.group(),
+                "start": match.start(),
+                "end": match.end(),
+                "groups": match.groups()
+            })
+        return {"matches": matches, "count": len(matches)}
+    except re.error as e:
+        return {"error": str(e)}
+
+def search_file_regex(pattern, path, sample_limit=100, line_number_limit=10000, progress=None, max_matches=None, max_line_length=None):
+    """Streams a file line by line with a pattern compiled once; never holds the whole file in memory."""
+    try:
+        rx = re.compile(pattern)
+        if not path or not os.path.isfile(path):
+            return {"error": "Provide a path to a file"}
+        started = datetime.datetime.now()
+        lines = matches = matching_lines = skipped = 0
+        line_numbers, samples = [], []
+        budget = None
+        with open(path, "r", errors="replace", newline="") as f:
+            for lines, line in enumerate(f, 1):
+                if progress is not None:
+                    progress[0] = lines
+                if max_line_length is not None and len(line) > max_line_length:
+                    skipped += 1
+                    continue
+                if max_matches is not None and matches >= max_matches:
+                    budget = f"stopped at line {lines:,} after the {max_matches:,} match budget"
+                    break
+                found = 0
+                for m in rx.finditer(line):
+                    found += 1
+                    if len(samples) < sample_limit:
+                        samples.append({
+                            "line": lines,
+                            "match": m.group(),
+                            "start": m.start(),
+                            "end": m.end(),
+                            "groups": m.groups(),
+                            "text": line.rstrip("\r\n")[:500],
+                        })
+                if found:
+                    matches += found
+                    matching_lines += 1
+                    if len(line_numbers) < line_number_limit:
+                        line_numbers.append(lines)
+        return {
+            "path": path,
+            "bytes": os.path.getsize(path),
+            "lines": lines,
+            "matches": matches,
+            "matching_lines": matching_lines,
+            "line_numbers": line_numbers,
+            "samples": samples,
+            "truncated": matching_lines > len(line_numbers) or matches > len(samples),
+            "skipped_long_lines": skipped,
+            "budget": budget,
+            "elapsed": (datetime.datetime.now() - started).total_seconds(),
+        }
+    except re.error as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": str(e)}
+
+def lint_regex(pattern):
+    """Static check for constructs that make backtracking engines blow up (nested/adjacent unbounded quantifiers)."""
+    try:
+        tree = _sre_parse.parse(pattern)
+    except re.error as e:
+        return {"error": str(e)}
+
+    warnings_found = []
+    unbounded = _sre_parse.MAXREPEAT
+    repeats = (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT, getattr(_sre_parse, "POSSESSIVE_REPEAT", None))
+
+    def children(op, av):
+        if op in repeats:
+            return [av[2]]
+        if op is _sre_parse.SUBPATTERN:
+            return [av[-1]]
+        if op is _sre_parse.BRANCH:
+            return list(av[1])
+        if op in (_sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+            return [av[1]]
+        if op is _sre_parse.GROUPREF_EXISTS:
+            return [b for b in av[1:] if b is not None]
+        return []
+
+    def has_unbounded(seq):
+        for op, av in seq:
+            if op in repeats and av[1] == unbounded:
+                return True
+            if any(has_unbounded(c) for c in children(op, av)):
+                return True
+        return False
+
+    def starts_wide(seq):
+        """True if a sequence begins with something that matches many characters (., class, category)."""
+        for op, av in seq:
+            if op in (_sre_parse.ANY, _sre_parse.IN, _sre_parse.CATEGORY, _sre_parse.NOT_LITERAL):
+                return True
+            if op is _sre_parse.SUBPATTERN:
+                return starts_wide(av[-1])
+            return False
+        return False
+
+    def visit(seq):
+        prev_wide_star = False
+        for op, av in seq:
+            if op in repeats:
+                body = av[2]
+                if av[1] > 1 and has_unbounded(body):
+                    warnings_found.append("Nested quantifier: an unbounded repeat inside another repeat, e.g. (a+)+ - can backtrack exponentially")
+                elif av[1] == unbounded:
+                    items = list(body)
+                    while len(items) == 1 and items[0][0] is _sre_parse.SUBPATTERN:
+                        items = list(items[0][1][-1])
+                    for bop, bav in items:
+                        if bop is not _sre_parse.BRANCH:
+                            continue
+                        branches = [str(b) for b in bav[1]]
+                        if len(set(branches)) < len(branches) or sum(starts_wide(b) for b in bav[1]) > 1:
+                            warnings_found.append("Repeated alternation with overlapping branches, e.g. (a|a)* or (\\w+|\\d+)* - can backtrack exponentially")
+                wide_star = av[1] == unbounded and starts_wide(body)
+                if wide_star and prev_wide_star:
+                    warnings_found.append("Adjacent unbounded quantifiers over overlapping characters, e.g. .*.* or \\d+\\d* - can backtrack polynomially")
+                prev_wide_star = wide_star
+            else:
+                prev_wide_star = False
+            for child in children(op, av):
+                visit(child)
+
+    visit(tree)
+    return {"warnings": list(dict.fromkeys(warnings_found))}
+
+def _guarded_worker(conn, func, kwargs):
+    """Runs in a child process so a runaway pattern can be killed."""
+    try:
+        res = func(**kwargs)
+    except Exception as e:
+        res = {"error": str(e)}
+    conn.send(res)
+    conn.close()
+
+def _run_guarded(func, kwargs, timeout_ms, per_step, locate):
+    """Calls func(progress=..., **kwargs) in a killable worker process.
+
+    progress is a shared [ticks, line, pattern] array the worker keeps current. With per_step the
+    deadline applies to each tick (a stall), otherwise to the whole run; locate(progress) gives the
+    line (and an optional suffix) for the timeout message.
+    """
+    ctx = multiprocessing.get_context()
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    progress = ctx.RawArray("q", 3)
+    proc = ctx.Process(target=_guarded_worker, args=(send_conn, func, dict(kwargs, progress=progress)), daemon=True)
+    started = time.perf_counter()
+    proc.start()
+    send_conn.close()
+
+    deadline = timeout_ms / 1000
+    last_seen, last_change = progress[0], started
+    res = None
+    try:
+        while res is None:
+            if recv_conn.poll(0.02):
+                res = recv_conn.recv()
+                break
+            now = time.perf_counter()
+            if per_step and progress[0] != last_seen:
+                last_seen, last_change = progress[0], now
+            if now - last_change > deadline:
+                line, suffix = locate(progress)
+                res = {"error": f"Timed out after {timeout_ms:,} ms on line {line:,}{suffix}", "timeout": True, "line": line}
+                break
+            if not proc.is_alive() and not recv_conn.poll():
+                res = {"error": f"Regex worker exited unexpectedly (code {proc.exitcode})"}
+    except EOFError:
+        res = {"error": "Regex worker exited unexpectedly"}
+    finally:
+        if proc.is_alive():
+            proc.terminate()
+            proc.join(1)
+            if proc.is_alive():
+                proc.kill()
+        proc.join(1)
+        recv_conn.close()
+    res["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    return res
+
+def run_regex_guarded(pattern, text=None, path=None, timeout_ms=2000, max_matches=100_000, max_line_length=1_000_000, max_text=50_000_000):
+    """Runs test_regex / search_file_regex in a killable worker process with a wall-clock deadline and size/match budgets.
+
+    Text mode is killed when the whole run exceeds the deadline and reports the line the stalled
+    search started from; file mode is killed when a single line takes longer than the deadline
+    (progress is tracked per line, so long files are not cut off).
+    """
+    lint = lint_regex(pattern)
+    if "error" in lint:
+        return lint
+    if path is None and len(text or "") > max_text:
+        return {"error": f"Text is {len(text):,} chars (budget {max_text:,}); load it as a file instead", "warnings": lint["warnings"]}
+
+    if path:
+        res = _run_guarded(search_file_regex, {"pattern": pattern, "path": path, "max_matches": max_matches, "max_line_length": max_line_length},
+                           timeout_ms, True, lambda p: (p[0], ""))
+    else:
+        res = _run_guarded(test_regex, {"pattern": pattern, "text": text, "max_matches": max_matches},
+                           timeout_ms, False, lambda p: ((text or "").count("\n", 0, p[0]) + 1, ""))
+    res["warnings"] = lint["warnings"]
+    return res
+
+def profile_regex(patterns, text=None, path=None, slow_k=10, min_seconds=0.2, max_passes=1000, progress=None):
+    """Times each pattern line by line over a text corpus or a streamed file.
+
+    In-memory corpora are re-run until min_seconds of regex time has accumulated and each line keeps
+    its best time, so short sample texts still give stable numbers. Timer overhead is subtracted.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    patterns = [p for p in patterns if p]
+    if not patterns:
+        return {"error": "Provide at least one pattern"}
+    if path:
+        if not os.path.isfile(path):
+            return {"error": "Provide a path to a file"}
+        size = os.path.getsize(path)
+        corpus = None
+    else:
+        if not text:
+            return {"error": "Provide a text corpus or a file path"}
+        corpus = text.splitlines(keepends=True)
+        size = len(text.encode("utf-8", "replace"))
+
+    clock = time.perf_counter_ns
+    overhead = min(-clock() + clock() for _ in range(1000))
+    results = []
+    line_count = 0
+    passes = 1
+    ticks = 0
+    for idx, pattern in enumerate(patterns):
+        try:
+            rx = re.compile(pattern)
+        except re.error as e:
+            results.append({"pattern": pattern, "error": str(e)})
+            continue
+        finditer = rx.finditer
+        matches = matching_lines = 0
+        total_ns = worst_ns = 0
+        slowest = []  # min-heap of (ns, line, text)
+
+        if corpus is None:
+            n = 0
+            with open(path, "r", errors="replace", newline="") as f:
+                for n, line in enumerate(f, 1):
+                    if progress is not None:
+                        ticks += 1
+                        progress[0], progress[1], progress[2] = ticks, n, idx
+                    t0 = clock()
+                    found = sum(1 for _ in finditer(line))
+                    dt = max(0, clock() - t0 - overhead)
+                    total_ns += dt
+                    if dt > worst_ns:
+                        worst_ns = dt
+                    if found:
+                        matches += found
+                        matching_lines += 1
+                    if len(slowest) < slow_k:
+                        heapq.heappush(slowest, (dt, n, line))
+                    elif dt > slowest[0][0]:
+                        heapq.heapreplace(slowest, (dt, n, line))
+            line_count = n
+        else:
+            best = [None] * len(corpus)
+            spent = 0
+            passes = 0
+            while passes < max_passes and (passes == 0 or spent < min_seconds * 1e9):
+                passes += 1
+                for n, line in enumerate(corpus):
+                    if progress is not None:
+                        ticks += 1
+                        progress[0], progress[1], progress[2] = ticks, n + 1, idx
+                    t0 = clock()
+                    found = sum(1 for _ in finditer(line))
+                    dt = max(0, clock() - t0 - overhead)
+                    spent += dt
+                    if best[n] is None or dt < best[n]:
+                        best[n] = dt
+                    if passes == 1 and found:
+                        matches += found
+                        matching_lines += 1
+            line_count = len(corpus)
+            total_ns = sum(best)
+            worst_ns = max(best, default=0)
+            slowest = heapq.nlargest(slow_k, ((dt, n + 1, corpus[n]) for n, dt in enumerate(best)))
+
+        seconds = total_ns / 1e9
+        results.append({
+            "pattern": pattern,
+            "matches": matches,
+            "matching_lines": matching_lines,
+            "total_ms": total_ns / 1e6,
+            "lines_per_sec": line_count / seconds if seconds else float("inf"),
+            "mb_per_sec": size / 1e6 / seconds if seconds else float("inf"),
+            "avg_us": total_ns / line_count / 1000 if line_count else 0.0,
+            "worst_us": worst_ns / 1000,
+            "slowest": [
+                {"line": n, "us": dt / 1000, "text": t.rstrip("\r\n")[:200]}
+                for dt, n, t in sorted(slowest, key=lambda x: -x[0])
+            ],
+        })
+
+    timed = [r for r in results if "error" not in r]
+    if timed:
+        fastest = min(r["total_ms"] for r in timed)
+        for r in timed:
+            r["relative"] = r["total_ms"] / fastest if fastest else 1.0
+    return {
+        "source": path or "text",
+        "lines": line_count,
+        "bytes": size,
+        "passes": passes,
+        "results": results,
+    }
+
+def run_regex_profile(patterns, text=None, path=None, timeout_ms=2000, **kwargs):
+    """profile_regex in a killable worker; the deadline applies per line."""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    res = _run_guarded(profile_regex, dict(kwargs, patterns=patterns, text=text, path=path), timeout_ms, True,
+                       lambda p: (p[1], f" of pattern {p[2] + 1}"))
+    for r in res.get("results", []):
+        if "error" not in r:
+            r["warnings"] = lint_regex(r["pattern"])["warnings"]
+    return res
+
+def sample_corpus(samples):
+    """Joins the test strings of the regex_samples library into one benchmark corpus."""
+    return "\n".join(text.rstrip("\n") for _, text in samples.values())
+
+_INLINE_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+def _neutralize_groups(pattern):
+    """Rewrites capturing groups as non-capturing so patterns can share one alternation.
+
+    Returns None for patterns that cannot be combined (backreferences, conditionals).
+    """
+    out = []
+    i, n, in_class = 0, len(pattern), False
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            if i + 1 < n and (pattern[i + 1].isdigit() and pattern[i + 1] != "0" or pattern[i + 1] == "g"):
+                return None
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+            out.append(c)
+        elif c == "[":
+            in_class = True
+            out.append(c)
+            if pattern[i + 1:i + 2] == "^":
+                out.append("^")
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                out.append("]")
+                i += 1
+        elif c == "(":
+            if pattern.startswith("(?P<", i):
+                out.append("(?:")
+                i = pattern.index(">", i) + 1
+                continue
+            if pattern.startswith("(?P=", i) or pattern.startswith("(?(", i):
+                return None
+            out.append("(" if pattern[i + 1:i + 2] == "?" else "(?:")
+        else:
+            out.append(c)
+        i += 1
+    body = "".join(out)
+    flags = _INLINE_FLAGS_RE.match(body)
+    if flags:
+        # global inline flags are only legal at the start of the whole expression; scope them instead
+        body = f"(?{flags.group(1)}:{body[flags.end():]})"
+    return body
+
+def _required_literal(pattern):
+    """Longest literal run every match must contain, used as a cheap `in` prefilter ("" if none)."""
+    try:
+        tree = _sre_parse.parse(pattern)
+    except re.error:
+        return ""
+    if tree.state.flags & re.IGNORECASE:
+        return ""
+    best, run = "", []
+
+    def walk(seq):
+        nonlocal best, run
+        for op, av in seq:
+            if op is _sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+            if op is _sre_parse.SUBPATTERN and not (av[1] & re.IGNORECASE):
+                walk(av[-1])
+                if len(run) > len(best):
+                    best = "".join(run)
+                run = []
+            elif op in (_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT) and av[0] >= 1:
+                walk(av[2])
+                if len(run) > len(best):
+                    best = "".join(run)
+                run = []
+
+    walk(tree)
+    if len(run) > len(best):
+        best = "".join(run)
+    return best
+
+def classify_lines(patterns, text=None, path=None, all_labels=False, unmatched_limit=50, example_limit=3, progress=None):
+    """Labels every line with the named patterns it matches, in one scan.
+
+    All combinable patterns are folded into a single gate alternation, so one regex pass per line
+    decides matched/unmatched and yields the first label (leftmost match, ties in pattern order),
+    like a grok chain with break_on_match. Patterns that cannot be folded are searched one by one
+    and compete for the same leftmost position. With all_labels the other patterns are also
+    verified, but only when their required literal occurs in the line.
+    """
+    names, checks, alternatives = [], [], []
+    for name, pattern in patterns.items():
+        try:
+            rx = re.compile(pattern)
+        except re.error as e:
+            return {"error": f"{name}: {e}"}
+        idx = len(names)
+        names.append(name)
+        checks.append((_required_literal(pattern), rx.search))
+        body = _neutralize_groups(pattern)
+        alternatives.append(None if body is None else f"(?P<_p{idx}>{body})")
+    if not names:
+        return {"error": "No patterns to classify with"}
+
+    # Patterns that cannot be folded (backreferences, conditionals) are searched
+    # on their own and compete with the gate's match for the leftmost position.
+    gate = None
+    if any(alternatives):
+        try:
+            gate = re.compile("|".join(a for a in alternatives if a)).search
+        except re.error:
+            gate = None
+    leftovers = [i for i, a in enumerate(alternatives) if gate is None or a is None]
+
+    if path:
+        if not os.path.isfile(path):
+            return {"error": "Provide a path to a file"}
+        size = os.path.getsize(path)
+        source = open(path, "r", errors="replace", newline="")
+    elif text:
+        size = len(text.encode("utf-8", "replace"))
+        source = io.StringIO(text)
+    else:
+        return {"error": "Provide a text or a file path"}
+
+    counts = [0] * len(names)
+    examples = [[] for _ in names]
+    combos = {}
+    unmatched, unmatched_samples = 0, []
+    lines = 0
+    started = time.perf_counter()
+    with source:
+        for lines, line in enumerate(source, 1):
+            if progress is not None:
+                progress[0] = progress[1] = lines
+            line = line.rstrip("\r\n")
+            first, first_at, found = -1, -1, []
+            if gate is not None:
+                m = gate(line)
+                if m is not None:
+                    first, first_at = int(m.lastgroup[2:]), m.start()
+            for i in leftovers:
+                literal, search = checks[i]
+                if literal and literal not in line:
+                    continue
+                m = search(line)
+                if m is None:
+                    continue
+                found.append(i)
+                if first < 0 or m.start() < first_at or (m.start() == first_at and i < first):
+                    first, first_at = i, m.start()
+            if first < 0:
+                unmatched += 1
+                if len(unmatched_samples) < unmatched_limit:
+                    unmatched_samples.append({"line": lines, "text": line[:500]})
+                continue
+            if not all_labels:
+                counts[first] += 1
+                if len(examples[first]) < example_limit:
+                    examples[first].append({"line": lines, "text": line[:500]})
+                continue
+            hit = [
+                i for i, (literal, search) in enumerate(checks)
+                if i == first or i in found or (i not in leftovers and (not literal or literal in line) and search(line))
+            ]
+            for i in hit:
+                counts[i] += 1
+                if len(examples[i]) < example_limit:
+                    examples[i].append({"line": lines, "text": line[:500]})
+            if len(hit) > 1:
+                key = tuple(hit)
+                combos[key] = combos.get(key, 0) + 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "source": path or "text",
+        "lines": lines,
+        "bytes": size,
+        "matched": lines - unmatched,
+        "unmatched": unmatched,
+        "unmatched_samples": unmatched_samples,
+        "patterns": [
+            {"name": name, "count": counts[i], "literal": checks[i][0], "combined": i not in leftovers, "examples": examples[i]}
+            for i, name in enumerate(names)
+        ],
+        "multi_label": [
+            {"labels": [names[i] for i in key], "count": c}
+            for key, c in sorted(combos.items(), key=lambda kv: -kv[1])[:20]
+        ],
+        "single_pass": gate is not None and not leftovers,
+        "individual": len(leftovers),
+        "all_labels": all_labels,
+        "elapsed": elapsed,
+        "mb_per_sec": size / 1e6 / elapsed if elapsed else 0.0,
+    }
+
+def run_log_classifier(patterns, text=None, path=None, timeout_ms=2000, **kwargs):
+    """classify_lines in a killable worker; the deadline applies per line."""
+    return _run_guarded(classify_lines, dict(kwargs, patterns=patterns, text=text, path=path), timeout_ms, True,
+                        lambda p: (p[1], ""))
+
+_INT_RE = re.compile(r"[+-]?\d+\Z")
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\Z")
+
+def _typed(value):
+    """Parses a captured group as int or float when it looks numeric; None for unmatched groups."""
+    if value is None or value == "":
+        return None
+    if _INT_RE.match(value):
+        return int(value)
+    if _FLOAT_RE.match(value):
+        return float(value)
+    return value
+
+def _percentiles(values, qs=(50, 90, 95, 99)):
+    """Linear-interpolated percentiles of a list of numbers."""
+    if not values:
+        return {}
+    if np is not None:
+        return {f"p{q}": float(v) for q, v in zip(qs, np.percentile(np.asarray(values, dtype=float), qs))}
+    ordered = sorted(values)
+    out = {}
+    for q in qs:
+        pos = (len(ordered) - 1) * q / 100
+        lo = int(pos)
+        hi = min(lo + 1, len(ordered) - 1)
+        out[f"p{q}"] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    return out
+
+def extract_regex_table(pattern, text=None, path=None, output_path=None, fmt="csv", group_by=None, metric=None,
+                        top_k=20, sample_rows=50, max_values=1_000_000, progress=None):
+    """Turns every match's groups into a typed row, streaming rows to CSV/NDJSON and aggregating on the fly.
+
+    Columns are the group names (g1, g2, ... for unnamed groups). group_by counts rows per value of
+    a column (top-K); metric gives count/sum/avg/min/max/percentiles of a numeric column, overall and
+    per group. Percentiles are exact up to max_values values, then estimated from a reservoir sample.
+    """
+    try:
+        rx = re.compile(pattern)
+    except re.error as e:
+        return {"error": str(e)}
+    if rx.groups == 0:
+        return {"error": "Pattern has no groups to extract; add (...) or (?P<name>...) groups"}
+    names = {i: n for n, i in rx.groupindex.items()}
+    columns = [names.get(i, f"g{i}") for i in range(1, rx.groups + 1)]
+
+    def resolve(col):
+        if col in (None, ""):
+            return None
+        col = str(col).strip()
+        if col in columns:
+            return columns.index(col)
+        if col.isdigit() and 1 <= int(col) <= len(columns):
+            return int(col) - 1
+        raise ValueError(f"Unknown column '{col}'; available: {', '.join(columns)}")
+
+    try:
+        key_idx, metric_idx = resolve(group_by), resolve(metric)
+    except ValueError as e:
+        return {"error": str(e)}
+    if fmt not in ("csv", "ndjson"):
+        return {"error": "Format must be csv or ndjson"}
+
+    if path:
+        if not os.path.isfile(path):
+            return {"error": "Provide a path to a file"}
+        source = open(path, "r", errors="replace", newline="")
+    elif text:
+        source = io.StringIO(text)
+    else:
+        return {"error": "Provide a text or a file path"}
+
+    kinds = [None] * len(columns)  # narrows int -> float -> str as values arrive
+    rank = {None: 0, int: 1, float: 2, str: 3}
+    groups = {}
+    values = []
+    seen_values = 0
+    reservoir = random.Random(0)
+    m_count, m_sum, m_min, m_max = 0, 0, None, None
+    rows, samples = 0, []
+    lines = 0
+    out = writer = None
+    try:
+        if output_path:
+            out = open(output_path, "w", newline="", encoding="utf-8")
+            if fmt == "csv":
+                writer = csv.writer(out, lineterminator="\n")
+                writer.writerow(columns)
+        with source:
+            for lines, line in enumerate(source, 1):
+                if progress is not None:
+                    progress[0] = progress[1] = lines
+                for m in rx.finditer(line.rstrip("\r\n")):
+                    raw = m.groups()
+                    row = [_typed(v) for v in raw]
+                    rows += 1
+                    for i, v in enumerate(row):
+                        t = type(v) if v is not None else None
+                        if rank[t] > rank[kinds[i]]:
+                            kinds[i] = t
+                    if out is not None:
+                        if writer is not None:
+                            writer.writerow(["" if v is None else v for v in raw])
+                        else:
+                            out.write(json.dumps(dict(zip(columns, row))) + "\n")
+                    if len(samples) < sample_rows:
+                        samples.append(row)
+                    num = row[metric_idx] if metric_idx is not None else None
+                    if isinstance(num, (int, float)):
+                        m_count += 1
+                        m_sum += num
+                        m_min = num if m_min is None or num < m_min else m_min
+                        m_max = num if m_max is None or num > m_max else m_max
+                        seen_values += 1
+                        if len(values) < max_values:
+                            values.append(num)
+                        else:
+                            j = reservoir.randrange(seen_values)
+                            if j < max_values:
+                                values[j] = num
+                    if key_idx is not None:
+                        key = row[key_idx]
+                        g = groups.get(key)
+                        if g is None:
+                            g = groups[key] = [0, 0, 0]  # rows, numeric rows, sum
+                        g[0] += 1
+                        if isinstance(num, (int, float)):
+                            g[1] += 1
+                            g[2] += num
+    except OSError as e:
+        return {"error": str(e)}
+    finally:
+        if out is not None:
+            out.close()
+
+    res = {
+        "columns": [{"name": c, "type": (kinds[i] or str).__name__} for i, c in enumerate(columns)],
+        "lines": lines,
+        "rows": rows,
+        "samples": samples,
+        "output_path": output_path,
+        "format": fmt,
+    }
+    if key_idx is not None:
+        top = heapq.nlargest(top_k, groups.items(), key=lambda kv: kv[1][0])
+        res["group_by"] = columns[key_idx]
+        res["distinct"] = len(groups)
+        res["top"] = [
+            dict({"value": k, "count": g[0]}, **({"sum": g[2], "avg": g[2] / g[1] if g[1] else None} if metric_idx is not None else {}))
+            for k, g in top
+        ]
+    if metric_idx is not None:
+        res["metric"] = dict({
+            "column": columns[metric_idx],
+            "count": m_count,
+            "sum": m_sum,
+            "avg": m_sum / m_count if m_count else None,
+            "min": m_min,
+            "max": m_max,
+            "approximate": seen_values > max_values,
+        }, **_percentiles(values))
+    return res
+
+def run_regex_extract(pattern, text=None, path=None, timeout_ms=2000, **kwargs):
+    """extract_regex_table in a killable worker; the deadline applies per line."""
+    return _run_guarded(extract_regex_table, dict(kwargs, pattern=pattern, text=text, path=path), timeout_ms, True,
+                        lambda p: (p[1], ""))
+
+def expand_log_paths(spec):
+    """Resolves a file, directory (its files, sorted) or glob pattern (sorted, ** allowed) to a file list."""
+    specs = spec if isinstance(spec, (list, tuple)) else [spec]
+    files = []
+    for item in specs:
+        item = os.path.expanduser((item or "").strip())
+        if not item:
+            continue
+        if os.path.isdir(item):
+            files.extend(sorted(os.path.join(item, n) for n in os.listdir(item) if os.path.isfile(os.path.join(item, n))))
+        elif glob.has_magic(item):
+            files.extend(sorted(p for p in glob.glob(item, recursive=True) if os.path.isfile(p)))
+        elif os.path.isfile(item):
+            files.append(item)
+    return list(dict.fromkeys(files))
+
+_PAR_RX = None
+_PAR_PROGRESS = None
+
+def _par_init(pattern, progress=None):
+    """Pool initializer: each worker compiles the pattern once and keeps the shared per-chunk line counters."""
+    global _PAR_RX, _PAR_PROGRESS
+    _PAR_RX = re.compile(pattern)
+    _PAR_PROGRESS = progress
+
+def _par_gzip_lines(path):
+    """Streams the lines of a .gz file without holding the decompressed file in memory (split like search_file_regex)."""
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="") as f:
+        yield from f
+
+def _par_search_chunk(task):
+    """Searches one newline-aligned byte range of a file (or a whole .gz file, streamed); line numbers are chunk-local."""
+    idx, path, start, end, sample_limit, line_number_limit = task
+    search = _PAR_RX.finditer
+    progress = _PAR_PROGRESS
+    if end is None:
+        lines = _par_gzip_lines(path)
+    else:
+        with open(path, "rb") as f:
+            skip = False
+            if start > 0:
+                f.seek(start - 1)
+                skip = f.read(1) != b"\n"
+            data = f.read(end - start)
+            if data and not data.endswith(b"\n"):
+                data += f.readline()  # finish the last line that starts inside this range
+        if skip:
+            cut = data.find(b"\n")
+            data = b"" if cut < 0 else data[cut + 1:]  # that line belongs to the previous range
+        # Same line splitting as search_file_regex's newline="" file: \r\n, \r and \n all end a line and
+        # stay on it. Ranges are cut after a \n, so a \r\n pair is never split between two of them.
+        lines = io.StringIO(data.decode("utf-8", "replace"), newline="")
+        del data
+    matches = matching_lines = n = 0
+    line_numbers, samples = [], []
+    for n, line in enumerate(lines, 1):
+        if progress is not None:
+            progress[idx] = n
+        found = 0
+        for m in search(line):
+            found += 1
+            if len(samples) < sample_limit:
+                samples.append({"line": n, "match": m.group(), "groups": m.groups(), "text": line.rstrip("\r\n")[:500]})
+        if found:
+            matches += found
+            matching_lines += 1
+            if len(line_numbers) < line_number_limit:
+                line_numbers.append(n)
+    return idx, n, matches, matching_lines, line_numbers, samples
+
+def parallel_search_regex(pattern, paths, workers=None, chunk_bytes=32 << 20, sample_limit=100, line_number_limit=10000,
+                          timeout_s=None, stall_ms=None):
+    """Fans a regex search over files/globs/directories out to a process pool.
+
+    Plain files are split at newline-aligned byte ranges; .gz files are streamed whole inside a
+    worker. Results are merged in file and chunk order, so line numbers and samples come back
+    exactly as a sequential scan would report them. timeout_s bounds the whole search; stall_ms
+    terminates the pool once no worker has finished a line for that long (a backtracking blow-up).
+    """
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        return {"error": str(e)}
+    files = expand_log_paths(paths)
+    if not files:
+        return {"error": "No files match the given path, directory or glob"}
+
+    tasks, owners = [], []
+    total_bytes = 0
+    for fi, path in enumerate(files):
+        size = os.path.getsize(path)
+        total_bytes += size
+        if path.endswith(".gz"):
+            ranges = [(0, None)]
+        else:
+            ranges = [(off, min(off + chunk_bytes, size)) for off in range(0, size, chunk_bytes)] or [(0, 0)]
+        for start, end in ranges:
+            tasks.append((len(tasks), path, start, end, sample_limit, line_number_limit))
+            owners.append(fi)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    per_file = [{"path": p, "bytes": os.path.getsize(p), "lines": 0, "matches": 0, "matching_lines": 0} for p in files]
+    line_numbers, samples = [], []
+    matches = matching_lines = lines = 0
+    started = time.perf_counter()
+    ctx = multiprocessing.get_context()
+    progress = ctx.RawArray("q", len(tasks)) if stall_ms else None
+    pool = ctx.Pool(workers, initializer=_par_init, initargs=(pattern, progress))
+    try:
+        results = pool.imap(_par_search_chunk, tasks)
+        ticks, last_tick = -1, started
+        for expected in range(len(tasks)):
+            while True:
+                now = time.perf_counter()
+                if timeout_s is not None and now - started >= timeout_s:
+                    return {"error": f"Timed out after {timeout_s:,} s", "timeout": True}
+                wait = None if timeout_s is None else timeout_s - (now - started)
+                if progress is not None:
+                    total = sum(progress)
+                    if total != ticks:
+                        ticks, last_tick = total, now
+                    elif (now - last_tick) * 1000 >= stall_ms:
+                        # The chunk being waited on is the earliest unfinished one
+                        f = per_file[owners[expected]]
+                        return {"error": f"Timed out after {stall_ms:,} ms on line {f['lines'] + progress[expected]:,} of {f['path']}",
+                                "timeout": True}
+                    wait = 0.05 if wait is None else min(wait, 0.05)
+                try:
+                    idx, n_lines, n_matches, n_matching, nums, found = results.next(wait)
+                    break
+                except multiprocessing.TimeoutError:
+                    continue
+            f = per_file[owners[idx]]
+            base = f["lines"]  # lines in earlier chunks of the same file
+            f["lines"] += n_lines
+            f["matches"] += n_matches
+            f["matching_lines"] += n_matching
+            lines += n_lines
+            matches += n_matches
+            matching_lines += n_matching
+            for n in nums:
+                if len(line_numbers) >= line_number_limit:
+                    break
+                line_numbers.append({"path": f["path"], "line": base + n})
+            for m in found:
+                if len(samples) >= sample_limit:
+                    break
+                samples.append(dict(m, path=f["path"], line=base + m["line"]))
+    except (OSError, EOFError, zlib.error) as e:
+        return {"error": str(e)}
+    finally:
+        # Every result has been collected (or the search is being abandoned), so
+        # stopping the workers outright never loses data and never blocks join().
+        pool.terminate()
+        pool.join()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "files": per_file,
+        "bytes": total_bytes,
+        "lines": lines,
+        "matches": matches,
+        "matching_lines": matching_lines,
+        "line_numbers": line_numbers,
+        "samples": samples,
+        "truncated": matching_lines > len(line_numbers) or matches > len(samples),
+        "workers": workers,
+        "chunks": len(tasks),
+        "elapsed": elapsed,
+        "mb_per_sec": total_bytes / 1e6 / elapsed if elapsed else 0.0,
+    }
+
+_LINEAR_UNSUPPORTED = {
+    "GROUPREF": "backreferences (\\1, (?P=name))",
+    "GROUPREF_EXISTS": "conditional groups (?(1)...)",
+    "ASSERT": "lookaround (?=...) / (?<=...)",
+    "ASSERT_NOT": "negative lookaround (?!...) / (?<!...)",
+    "ATOMIC_GROUP": "atomic groups (?>...)",
+    "POSSESSIVE_REPEAT": "possessive quantifiers (*+, ++, ?+)",
+}
+
+def linear_regex_support(pattern):
+    """Lists the features of a pattern that only the backtracking engine has (empty when the linear engine can run it)."""
+    try:
+        tree = _sre_parse.parse(pattern)
+    except re.error as e:
+        return {"error": str(e)}
+    found = []
+
+    def walk(seq):
+        for op, av in seq:
+            name = str(op)
+            if name in _LINEAR_UNSUPPORTED:
+                found.append(_LINEAR_UNSUPPORTED[name])
+            if isinstance(av, (tuple, list)):
+                for part in av:
+                    if isinstance(part, _sre_parse.SubPattern):
+                        walk(part)
+                    elif isinstance(part, list) and part and isinstance(part[0], _sre_parse.SubPattern):
+                        for sub in part:
+                            walk(sub)
+
+    walk(tree)
+    if tree.state.flags & re.LOCALE:
+        found.append("the LOCALE flag")
+    return {"supported": not found, "unsupported": list(dict.fromkeys(found))}
+
+
+class _ClassMap(dict):
+    """ord(char) -> equivalence class id, filled lazily; used directly as a str.translate table."""
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def __missing__(self, code):
+        cls = self.engine._classify(chr(code))
+        self[code] = cls
+        return cls
+
+
+class _LinearRegex:
+    """Thompson NFA with a lazily built, size-bounded DFA cache (RE2 subset: no backreferences or lookaround).
+
+    Matching is line oriented (^ and $ anchor at line boundaries). The DFA decides whether a line
+    matches with one table lookup per character; one backward pass finds where the leftmost-first
+    match from every position ends and a Pike VM over each match span recovers the groups, with the
+    same semantics as re. All of it is linear in the input.
+    """
+
+    CHAR, SPLIT, JMP, SAVE, ASSERT, MATCH = range(6)
+    BOL, EOL, WORDB, NOT_WORDB = range(4)
+
+    def __init__(self, pattern, max_states=4096, max_program=20000):
+        support = linear_regex_support(pattern)
+        if "error" in support:
+            raise re.error(support["error"])
+        if not support["supported"]:
+            raise ValueError("Needs the backtracking engine: " + ", ".join(support["unsupported"]))
+        tree = _sre_parse.parse(pattern)
+        self.pattern = pattern
+        self.groups = tree.state.groups - 1
+        self.max_states = max_states
+        self.max_program = max_program
+        self.ascii = bool(tree.state.flags & re.ASCII)
+        self.op, self.a, self.b = [], [], []
+        self.atoms = []
+        self.uses_word = self.uses_bol = False
+        self._emit(self.SAVE, 0)
+        self._compile(tree, tree.state.flags)
+        self._emit(self.SAVE, 1)
+        self._emit(self.MATCH)
+        self.nsave = 2 * (self.groups + 1)
+
+        self.literal = _required_literal(pattern)
+        self.classmap = _ClassMap(self)
+        self._sigs, self._sig_ids, self._class_word = [], {}, []
+        self.flushes = 0
+        self._leaf_cache = {}
+        self._reset_dfa()
+
+    # --- compilation -------------------------------------------------------
+
+    def _emit(self, op, a=0, b=0):
+        if len(self.op) >= self.max_program:
+            raise ValueError(f"Pattern expands to more than {self.max_program:,} NFA states; reduce the repetition counts")
+        self.op.append(op)
+        self.a.append(a)
+        self.b.append(b)
+        return len(self.op) - 1
+
+    def _is_word(self, ch):
+        if self.ascii:
+            return ch.isascii() and (ch.isalnum() or ch == "_")
+        return ch.isalnum() or ch == "_"
+
+    def _category(self, cat):
+        name = str(cat)
+        ascii_only = self.ascii
+        if name.endswith("DIGIT"):
+            test = (lambda ch: "0" <= ch <= "9") if ascii_only else str.isdecimal
+        elif name.endswith("SPACE"):
+            test = (lambda ch: ch in " \t\n\r\f\v") if ascii_only else str.isspace
+        elif name.endswith("WORD"):
+            test = self._is_word
+        else:
+            raise ValueError(f"Unsupported category {name}")
+        return (lambda ch: not test(ch)) if "_NOT_" in name else test
+
+    def _atom(self, op, av, flags):
+        icase = bool(flags & re.IGNORECASE)
+
+        def variants(ch):
+            return {ch, ch.lower(), ch.upper()} if icase else {ch}
+
+        if op is _sre_parse.LITERAL:
+            chars = variants(chr(av))
+            pred = chars.__contains__ if len(chars) > 1 else (lambda ch, c=chr(av): ch == c)
+        elif op is _sre_parse.NOT_LITERAL:
+            chars = variants(chr(av))
+            pred = lambda ch: ch not in chars
+        elif op is _sre_parse.ANY:
+            pred = (lambda ch: True) if flags & re.DOTALL else (lambda ch: ch != "\n")
+        elif op is _sre_parse.IN:
+            negate = False
+            tests = []
+            for iop, iav in av:
+                if iop is _sre_parse.NEGATE:
+                    negate = True
+                elif iop is _sre_parse.LITERAL:
+                    tests.append(lambda ch, s=variants(chr(iav)): ch in s)
+                elif iop is _sre_parse.RANGE:
+                    lo, hi = chr(iav[0]), chr(iav[1])
+                    if icase:
+                        tests.append(lambda ch, lo=lo, hi=hi: lo <= ch <= hi or lo <= ch.lower() <= hi or lo <= ch.upper() <= hi)
+                    else:
+                        tests.append(lambda ch, lo=lo, hi=hi: lo <= ch <= hi)
+                elif iop is _sre_parse.CATEGORY:
+                    tests.append(self._category(iav))
+                else:
+                    raise ValueError(f"Unsupported set item {iop}")
+            pred = (lambda ch: not any(t(ch) for t in tests)) if negate else (lambda ch: any(t(ch) for t in tests))
+        else:
+            raise ValueError(f"Unsupported item {op}")
+        self.atoms.append(pred)
+        return len(self.atoms) - 1
+
+    def _compile(self, seq, flags):
+        for op, av in seq:
+            self._compile_item(op, av, flags)
+
+    def _compile_item(self, op, av, flags):
+        P = _sre_parse
+        if op in (P.LITERAL, P.NOT_LITERAL, P.ANY, P.IN):
+            self._emit(self.CHAR, self._atom(op, av, flags))
+        elif op is P.AT:
+            name = str(av)
+            if name in ("AT_BEGINNING", "AT_BEGINNING_STRING", "AT_BEGINNING_LINE"):
+                self.uses_bol = True
+                self._emit(self.ASSERT, self.BOL)
+            elif name in ("AT_END", "AT_END_STRING", "AT_END_LINE"):
+                self._emit(self.ASSERT, self.EOL)
+            elif name == "AT_BOUNDARY":
+                self.uses_word = True
+                self._emit(self.ASSERT, self.WORDB)
+            elif name == "AT_NON_BOUNDARY":
+                self.uses_word = True
+                self._emit(self.ASSERT, self.NOT_WORDB)
+            else:
+                raise ValueError(f"Unsupported anchor {name}")
+        elif op is P.SUBPATTERN:
+            group, add_flags, del_flags, body = av
+            inner = (flags | add_flags) & ~del_flags
+            if group:
+                self._emit(self.SAVE, 2 * group)
+            self._compile(body, inner)
+            if group:
+                self._emit(self.SAVE, 2 * group + 1)
+        elif op is P.BRANCH:
+            ends = []
+            branches = av[1]
+            for i, branch in enumerate(branches):
+                if i < len(branches) - 1:
+                    split = self._emit(self.SPLIT)
+                    self.a[split] = split + 1
+                    self._compile(branch, flags)
+                    ends.append(self._emit(self.JMP))
+                    self.b[split] = len(self.op)
+                else:
+                    self._compile(branch, flags)
+            for j in ends:
+                self.a[j] = len(self.op)
+        elif op in (P.MAX_REPEAT, P.MIN_REPEAT):
+            lo, hi, body = av
+            greedy = op is P.MAX_REPEAT
+            for _ in range(lo):
+                self._compile(body, flags)
+            if hi == P.MAXREPEAT:
+                loop = self._emit(self.SPLIT)
+                self._compile(body, flags)
+                back = self._emit(self.JMP, loop)
+                self._set_split(loop, loop + 1, len(self.op), greedy)
+                self.b[back] = len(self.op)  # loop exit, taken when an iteration matched empty
+            else:
+                splits = []
+                for _ in range(hi - lo):
+                    s = self._emit(self.SPLIT)
+                    splits.append(s)
+                    self._compile(body, flags)
+                end = len(self.op)
+                for s in splits:
+                    self._set_split(s, s + 1, end, greedy)
+        else:
+            raise ValueError(f"Unsupported construct {op}")
+
+    def _set_split(self, pc, body, exit_, greedy):
+        self.a[pc], self.b[pc] = (body, exit_) if greedy else (exit_, body)
+
+    # --- character classes -------------------------------------------------
+
+    def _classify(self, ch):
+        sig = tuple(pred(ch) for pred in self.atoms) + ((self._is_word(ch),) if self.uses_word else ())
+        cls = self._sig_ids.get(sig)
+        if cls is None:
+            cls = len(self._sigs)
+            if cls >= 256:
+                raise ValueError("Pattern distinguishes more than 256 character classes")
+            self._sig_ids[sig] = cls
+            self._sigs.append(sig)
+            self._class_word.append(self.uses_word and sig[-1])
+            for row in self._trans:
+                row.append(-1)
+        return cls
+
+    # --- lazy DFA ----------------------------------------------------------
+
+    def _assert_ok(self, kind, prev_word, next_word, bol, eol):
+        if kind == self.BOL:
+            return bol
+        if kind == self.EOL:
+            return eol
+        if kind == self.WORDB:
+            return prev_word != next_word
+        return prev_word == next_word and not (bol and eol)  # like sre, \B never matches an empty string
 
-def json_to_yaml(json_str):
-    try:
-        data = json.loads(json_str)
-        return yaml.dump(data, default_flow_style=False)
-    except Exception as e:
-        return f"Error: {str(e)}"
+    def _closure(self, pcs, ctx=None):
+        """Epsilon closure; assertions are followed only when a context (prev_word, next_word, bol, eol) is given."""
+        op, a, b = self.op, self.a, self.b
+        seen, kept = set(), set()
+        stack = list(pcs)
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            o = op[pc]
+            if o == self.JMP:
+                stack.append(a[pc])
+            elif o == self.SPLIT:
+                stack.append(a[pc])
+                stack.append(b[pc])
+            elif o == self.SAVE:
+                stack.append(pc + 1)
+            elif o == self.ASSERT and ctx is not None:
+                if self._assert_ok(a[pc], *ctx):
+                    stack.append(pc + 1)
+            else:
+                kept.add(pc)
+        return kept
 
-def generate_ids():
-    return {
-        "uuid": str(uuid.uuid4()),
-        "ulid": str(ulid.new()),
-        "hex": uuid.uuid4().hex
-    }
+    def _reset_dfa(self):
+        self._ids, self._keys, self._trans, self._eol = {}, [], [], []
+        self._start = -1
+        self._start = self._state((frozenset(self._closure([0])), False, True))
 
-def calculate_hashes(text):
-    if not text:
-        return {"md5": "", "sha1": "", "sha256": ""}
-    data = text.encode('utf-8')
-    return {
-        "md5": hashlib.md5(data).hexdigest(),
-        "sha1": hashlib.sha1(data).hexdigest(),
-        "sha256": hashlib.sha256(data).hexdigest()
-    }
+    def _state(self, key):
+        sid = self._ids.get(key)
+        if sid is None:
+            if len(self._keys) >= self.max_states:
+                # Bounded cache: flush and keep going (each step stays O(program size), so time stays linear)
+                self.flushes += 1
+                self._ids, self._keys, self._trans, self._eol = {}, [], [], []
+                self._start = None
+            sid = len(self._keys)
+            self._ids[key] = sid
+            self._keys.append(key)
+            self._trans.append([-1] * len(self._sigs))
+            self._eol.append(-1)
+            if self._start is None:
+                self._start = self._state((frozenset(self._closure([0])), False, True))
+        return sid
 
-def calculate_cidr_advanced(ip_str, mask_str=None):
-    try:
-        # Support both CIDR (49.206.128.42/30) and separate Mask
-        if mask_str:
-            if mask_str.startswith('/'):
-                cidr_str = f"{ip_str}{mask_str}"
+    def _step(self, sid, cls):
+        """Computes (and caches) the transition of DFA state sid on class cls; -2 means a match ended here."""
+        pcs, prev_word, bol = self._keys[sid]
+        next_word = self._class_word[cls]
+        live = self._closure(pcs, (prev_word, next_word, bol, False))
+        if any(self.op[pc] == self.MATCH for pc in live):
+            self._trans[sid][cls] = -2
+            return -2
+        sig = self._sigs[cls]
+        nxt = [pc + 1 for pc in live if self.op[pc] == self.CHAR and sig[self.a[pc]]]
+        nxt.append(0)  # unanchored search: a new thread starts at every position
+        key = (frozenset(self._closure(nxt)), next_word if self.uses_word else False, False)
+        before = self.flushes
+        nid = self._state(key)
+        if self.flushes == before:
+            self._trans[sid][cls] = nid
+        return nid
+
+    def _at_eol(self, sid):
+        pcs, prev_word, bol = self._keys[sid]
+        live = self._closure(pcs, (prev_word, False, bol, True))
+        hit = 1 if any(self.op[pc] == self.MATCH for pc in live) else 0
+        self._eol[sid] = hit
+        return hit
+
+    def line_matches(self, line):
+        """True if the pattern matches anywhere in a single line (no newlines)."""
+        if self.literal and self.literal not in line:
+            return False
+        data = line.translate(self.classmap).encode("latin-1")
+        sid = self._start
+        trans = self._trans
+        for cls in data:
+            nid = trans[sid][cls]
+            if nid < 0:
+                if nid == -2:
+                    return True
+                nid = self._step(sid, cls)
+                if nid == -2:
+                    return True
+                trans = self._trans
+            sid = nid
+        hit = self._eol[sid]
+        return (hit if hit >= 0 else self._at_eol(sid)) == 1
+
+    # --- Pike VM -----------------------------------------------------------
+
+    def _add_thread(self, threads, seen, pc, caps, text, i):
+        op, a, b = self.op, self.a, self.b
+        stack = [(pc, caps)]
+        while stack:
+            pc, caps = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            o = op[pc]
+            if o == self.JMP:
+                # like sre, an iteration that matched empty ends the loop instead of dying
+                stack.append((b[pc] if b[pc] and a[pc] in seen else a[pc], caps))
+            elif o == self.SPLIT:
+                stack.append((b[pc], caps))
+                stack.append((a[pc], caps))  # preferred branch is explored first
+            elif o == self.SAVE:
+                caps = list(caps)
+                caps[a[pc]] = i
+                stack.append((pc + 1, caps))
+            elif o == self.ASSERT:
+                prev_word = i > 0 and self._is_word(text[i - 1])
+                next_word = i < len(text) and self._is_word(text[i])
+                if self._assert_ok(a[pc], prev_word, next_word, i == 0, i == len(text)):
+                    stack.append((pc + 1, caps))
             else:
-                cidr_str = f"{ip_str}/{mask_str}"
-        else:
-            cidr_str = ip_str
+                threads.append((pc, caps))
 
-        network = ipaddress.ip_network(cidr_str, strict=False)
-        ip = ipaddress.ip_address(ip_str.split('/')[0])
-        
-        # Basic Info
-        num_hosts = network.num_addresses
-        prefix = network.prefixlen
-        
-        # Usable handling (/31, /32)
-        if prefix == 32:
-            usable_hosts = 1
-            first_ip = str(network.network_address)
-            last_ip = str(network.network_address)
-        elif prefix == 31:
-            usable_hosts = 2
-            first_ip = str(network.network_address)
-            last_ip = str(network.broadcast_address)
-        else:
-            usable_hosts = max(0, num_hosts - 2)
-            first_ip = str(network.network_address + 1)
-            last_ip = str(network.broadcast_address - 1)
+    def _pike(self, text, start, no_empty=False, end=None):
+        """Leftmost-first match at or after start; no_empty forbids an empty match at start (as re does after one).
 
-        # Binary/Hex/Int
-        ip_int = int(ip)
-        ip_bin = bin(ip_int)[2:].zfill(32)
-        ip_bin_formatted = " ".join([ip_bin[i:i+8] for i in range(0, 32, 8)])
-        
-        mask_int = int(network.netmask)
-        mask_bin = bin(mask_int)[2:].zfill(32)
-        mask_bin_formatted = ".".join([mask_bin[i:i+8] for i in range(0, 32, 8)])
+        With end (from _match_ends) the search is anchored at start and stops at end, taking the
+        highest-priority thread that matches there, so recovering groups costs O(end - start).
+        """
+        op, a = self.op, self.a
+        sigs, classmap = self._sigs, self.classmap
+        empty = [None] * self.nsave
+        matched = None
+        threads = []
+        self._add_thread(threads, set(), 0, empty, text, start)
+        i, n = start, len(text) if end is None else end
+        while True:
+            nxt, seen = [], set()
+            sig = sigs[classmap[ord(text[i])]] if i < n else None
+            for pc, caps in threads:
+                if op[pc] == self.MATCH:
+                    if no_empty and caps[0] == start and i == start:
+                        continue
+                    matched = caps
+                    break  # lower-priority threads are cut
+                if sig is not None and sig[a[pc]]:
+                    self._add_thread(nxt, seen, pc + 1, caps, text, i + 1)
+            if i >= n or (matched is not None and not nxt):
+                break
+            i += 1
+            if matched is None and end is None:
+                self._add_thread(nxt, seen, 0, empty, text, i)
+            threads = nxt
+        if end is not None and (matched is None or matched[1] != end):
+            return None
+        return matched
 
-        # Wildcard
-        wildcard_int = int(network.hostmask)
-        wildcard_str = str(network.hostmask)
+    def _leaves(self, pc, ctx):
+        """CHAR/MATCH instructions reachable from pc without consuming input, in priority order (cached per context)."""
+        key = (pc, ctx)
+        leaves = self._leaf_cache.get(key)
+        if leaves is not None:
+            return leaves
+        op, a, b = self.op, self.a, self.b
+        leaves, seen, stack = [], set(), [pc]
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            o = op[pc]
+            if o == self.JMP:
+                stack.append(b[pc] if b[pc] and a[pc] in seen else a[pc])
+            elif o == self.SPLIT:
+                stack.append(b[pc])
+                stack.append(a[pc])
+            elif o == self.SAVE:
+                stack.append(pc + 1)
+            elif o == self.ASSERT:
+                if self._assert_ok(a[pc], *ctx):
+                    stack.append(pc + 1)
+            else:
+                leaves.append(pc)
+        if len(self._leaf_cache) > 100_000:
+            self._leaf_cache.clear()
+        self._leaf_cache[key] = leaves
+        return leaves
 
-        # IP Class
-        first_octet = int(str(ip).split('.')[0])
-        if 1 <= first_octet <= 126: ip_class = "A"
-        elif 128 <= first_octet <= 191: ip_class = "B"
-        elif 192 <= first_octet <= 223: ip_class = "C"
-        elif 224 <= first_octet <= 239: ip_class = "D (Multicast)"
-        elif 240 <= first_octet <= 255: ip_class = "E (Experimental)"
-        else: ip_class = "Loopback/Special"
-
-        # Reverse DNS
-        rev_dns = ".".join(reversed(str(ip).split('.'))) + ".in-addr.arpa"
-
-        # IPv6 Transition
-        # IPv4-mapped: ::ffff:c0a8:0101 for 192.168.1.1
-        ipv4_mapped = f"::ffff:{ip_int:08x}"
-        ipv4_mapped = ":".join([ipv4_mapped[i:i+4] for i in range(0, len(ipv4_mapped), 4)])
-        # 6to4: 2002:c0a8:0101::/48
-        prefix_6to4 = f"2002:{ip_int:08x}::/48"
-        prefix_6to4 = prefix_6to4.replace("2002:", "2002:").replace("::", "::") # formatting fix
-        
-        res = {
-            "ip": str(ip),
-            "network": str(network.network_address),
-            "netmask": str(network.netmask),
-            "broadcast": str(network.broadcast_address),
-            "wildcard": wildcard_str,
-            "hosts_total": num_hosts,
-            "hosts_usable": usable_hosts,
-            "range": f"{first_ip} - {last_ip}" if usable_hosts > 0 else "N/A",
-            "cidr": f"/{prefix}",
-            "mask_bin": mask_bin_formatted,
-            "ip_class": ip_class,
-            "ip_type": "Private" if ip.is_private else "Public",
-            "binary_id": ip_bin,
-            "integer_id": ip_int,
-            "hex_id": f"0x{ip_int:08x}",
-            "reverse_dns": rev_dns,
-            "ipv4_mapped": ipv4_mapped,
-            "prefix_6to4": prefix_6to4,
-        }
+    def _match_ends(self, text):
+        """End of the leftmost-first match anchored at every position of a line, in one right-to-left pass.
 
-        # Subnet List (Possible siblings in the same /24, /16, or /8 block)
-        siblings = []
-        try:
-            if prefix >= 24:
-                parent_prefix = 24
-            elif prefix >= 16:
-                parent_prefix = 16
-            elif prefix >= 8:
-                parent_prefix = 8
+        Where a thread ends up depends only on its instruction and position, not on where it started,
+        so res[pc] at i follows from res at i + 1: the first leaf (in priority order) whose outcome is a
+        match decides, which is exactly the thread the Pike VM would keep. Returns (ends, nonempty_ends),
+        -1 meaning no match; nonempty_ends skips an empty match at the start position itself.
+        """
+        op, a = self.op, self.a
+        MATCH = self.MATCH
+        sigs, classmap = self._sigs, self.classmap
+        entries = [0] + sorted({pc + 1 for pc, o in enumerate(op) if o == self.CHAR} - {0})
+        n = len(text)
+        nxt = [-1] * (len(op) + 1)
+        ends, nonempty = [-1] * (n + 1), [-1] * (n + 1)
+        word = self._is_word
+        for i in range(n, -1, -1):
+            sig = sigs[classmap[ord(text[i])]] if i < n else None
+            if self.uses_word:
+                ctx = (i > 0 and word(text[i - 1]), i < n and word(text[i]), i == 0, i == n)
             else:
-                parent_prefix = prefix # Don't show siblings for extremely large blocks
-            
-            if parent_prefix != prefix:
-                parent_network = ipaddress.ip_network(f"{res['ip']}/{parent_prefix}", strict=False)
-                # Limit to first 256 subnets to avoid UI lag
-                for i, sub in enumerate(parent_network.subnets(new_prefix=prefix)):
-                    if i >= 256: break
-                    siblings.append({
-                        "net": str(sub.network_address),
-                        "range": f"{sub.network_address + (1 if prefix < 31 else 0)} - {sub.broadcast_address - (1 if prefix < 31 else 0)}",
-                        "broadcast": str(sub.broadcast_address)
-                    })
-        except Exception:
-            pass # Fallback to empty siblings if parent calculation fails
-        
-        res["siblings"] = siblings
-        return res
-    except Exception as e:
+                ctx = (False, False, i == 0, i == n)
+            cur = [-1] * (len(op) + 1)
+            for entry in entries:
+                r = -1
+                for leaf in self._leaves(entry, ctx):
+                    if op[leaf] == MATCH:
+                        r = i
+                        break
+                    if sig is not None and sig[a[leaf]]:
+                        r = nxt[leaf + 1]
+                        if r >= 0:
+                            break
+                cur[entry] = r
+            ends[i] = cur[0]
+            r = -1
+            for leaf in self._leaves(0, ctx):
+                if op[leaf] != MATCH and sig is not None and sig[a[leaf]]:
+                    r = nxt[leaf + 1]
+                    if r >= 0:
+                        break
+            nonempty[i] = r
+            nxt = cur
+        return ends, nonempty
+
+    def finditer(self, line):
+        """Yields (start, end, groups) like re.finditer, for one line.
+
+        Match ends for every start come from one _match_ends pass; the Pike VM then only re-runs each
+        match's own span for its groups, so the total work stays linear in the line length.
+        """
+        n = len(line)
+        ends, nonempty = self._match_ends(line)
+        pos, no_empty = 0, False
+        while pos <= n:
+            s = pos
+            if no_empty and nonempty[s] < 0:
+                s += 1
+            while s <= n and ends[s] < 0:
+                s += 1
+            if s > n:
+                return
+            e = nonempty[s] if no_empty and s == pos else ends[s]
+            caps = self._pike(line, s, no_empty and s == pos, end=e)
+            if caps is None:  # cannot happen for well-formed programs; fall back to the plain search
+                caps = self._pike(line, pos, no_empty)
+                if caps is None:
+                    return
+            s, e = caps[0], caps[1]
+            groups = tuple(
+                line[caps[2 * g]:caps[2 * g + 1]] if caps[2 * g] is not None and caps[2 * g + 1] is not None else None
+                for g in range(1, self.groups + 1)
+            )
+            yield s, e, groups
+            pos, no_empty = e, e == s
+
+    def stats(self):
+        return {"dfa_states": len(self._keys), "classes": len(self._sigs), "cache_flushes": self.flushes, "nfa_size": len(self.op)}
+
+
+def test_regex_linear(pattern, text, max_matches=None, max_states=4096):
+    """test_regex on the linear-time engine. Line oriented: the DFA skips non-matching lines, the Pike VM extracts spans."""
+    try:
+        engine = _LinearRegex(pattern, max_states=max_states)
+    except (re.error, ValueError) as e:
         return {"error": str(e)}
+    matches = []
+    offset = 0
+    budget = None
+    for line in text.split("\n"):
+        if engine.line_matches(line):
+            for s, e, groups in engine.finditer(line):
+                if max_matches is not None and len(matches) >= max_matches:
+                    budget = f"stopped after the {max_matches:,} match budget"
+                    break
+                matches.append({"match": line[s:e], "start": offset + s, "end": offset + e, "groups": groups})
+        if budget:
+            break
+        offset += len(line) + 1
+    res = {"matches": matches, "count": len(matches), "engine": "linear", **engine.stats()}
+    if budget:
+        res["budget"] = budget
+    return res
+
 
-def test_regex(pattern, text):
+def search_file_linear(pattern, path, sample_limit=100, line_number_limit=10000, max_states=4096):
+    """Streams a file through the linear-time engine: guaranteed O(file size) whatever the pattern."""
     try:
-        matches = []
-        for match in re.finditer(pattern, text):
-            matches.append({
-                "match": match.group(),
-                "start": match.start(),
-                "end": match.end(),
-                "groups": match.groups()
-            })
-        return {"matches": matches, "count": len(matches)}
-    except re.error as e:
+        engine = _LinearRegex(pattern, max_states=max_states)
+    except (re.error, ValueError) as e:
+        return {"error": str(e)}
+    if not path or not os.path.isfile(path):
+        return {"error": "Provide a path to a file"}
+    started = time.perf_counter()
+    lines = matching_lines = 0
+    line_numbers, samples = [], []
+    line_matches = engine.line_matches
+    try:
+        with open(path, "r", errors="replace", newline="") as f:
+            for lines, line in enumerate(f, 1):
+                line = line.rstrip("\r\n")
+                if not line_matches(line):
+                    continue
+                matching_lines += 1
+                if len(line_numbers) < line_number_limit:
+                    line_numbers.append(lines)
+                if len(samples) < sample_limit:
+                    for s, e, groups in engine.finditer(line):
+                        samples.append({"line": lines, "match": line[s:e], "groups": groups, "text": line[:500]})
+                        if len(samples) >= sample_limit:
+                            break
+    except OSError as e:
+        return {"error": str(e)}
+    return {
+        "path": path,
+        "bytes": os.path.getsize(path),
+        "lines": lines,
+        "matching_lines": matching_lines,
+        "line_numbers": line_numbers,
+        "samples": samples,
+        "truncated": matching_lines > len(line_numbers),
+        "elapsed": time.perf_counter() - started,
+        "engine": "linear",
+        **engine.stats(),
+    }
+
+
+def benchmark_regex_engines(samples, min_bytes=256_000, pathological=22):
+    """Times re against the linear engine on the samples corpus and checks both agree line by line."""
+    corpus = sample_corpus(samples).split("\n")
+    size = sum(len(l) + 1 for l in corpus)
+    reps = max(1, -(-min_bytes // max(size, 1)))
+    lines = corpus * reps
+    nbytes = size * reps
+    rows = []
+    for name, (pattern, _) in samples.items():
+        row = {"name": name, "pattern": pattern}
+        try:
+            rx = re.compile(pattern)
+        except re.error as e:
+            rows.append(dict(row, error=str(e)))
+            continue
+        support = linear_regex_support(pattern)
+        if not support["supported"]:
+            rows.append(dict(row, supported=False, unsupported=support["unsupported"]))
+            continue
+        try:
+            engine = _LinearRegex(pattern)
+        except ValueError as e:
+            rows.append(dict(row, supported=False, unsupported=[str(e)]))
+            continue
+        t0 = time.perf_counter()
+        expected = [bool(rx.search(l)) for l in lines]
+        t1 = time.perf_counter()
+        got = [engine.line_matches(l) for l in lines]
+        t2 = time.perf_counter()
+        rows.append(dict(
+            row, supported=True, agree=expected == got, matching_lines=sum(got) // reps,
+            re_mb_per_sec=nbytes / 1e6 / max(t1 - t0, 1e-9), linear_mb_per_sec=nbytes / 1e6 / max(t2 - t1, 1e-9),
+            slowdown=(t2 - t1) / max(t1 - t0, 1e-9), **engine.stats(),
+        ))
+
+    # A catastrophic case: re is exponential in the run of a's, the linear engine is not
+    worst = None
+    if pathological:
+        text = "a" * pathological + "!"
+        t0 = time.perf_counter()
+        re.search(r"(a+)+$", text)
+        t1 = time.perf_counter()
+        _LinearRegex(r"(a+)+$").line_matches(text)
+        t2 = time.perf_counter()
+        worst = {"pattern": "(a+)+$", "input": f"'a' x {pathological} + '!'", "re_ms": (t1 - t0) * 1000, "linear_ms": (t2 - t1) * 1000}
+    return {"lines": len(lines), "bytes": nbytes, "rows": rows, "pathological": worst}
+
+def read_file_preview(path, max_lines=200, max_chars=20000):
+    """Returns the first lines of a file for display without reading the rest."""
+    try:
+        out, size = [], 0
+        with open(path, "r", errors="replace") as f:
+            for line in itertools.islice(f, max_lines):
+                out.append(line)
+                size += len(line)
+                if size >= max_chars:
+                    break
+        return {"text": "".join(out)[:max_chars], "bytes": os.path.getsize(path)}
+    except Exception as e:
         return {"error": str(e)}
 
 def decode_cert(pem_data):
@@ -338,6 +3752,390 @@ def calculate_wildcard(mask_str):
     except Exception as e:
         return {"error": str(e)}
 
+_FW_ACTIONS = {"permit": "permit", "allow": "permit", "accept": "permit", "deny": "deny", "drop": "deny", "reject": "deny"}
+_FW_PROTOCOLS = {"ip": None, "ipv6": None, "any": None, "all": None, "-1": None, "icmp": 1, "igmp": 2, "tcp": 6, "udp": 17, "gre": 47, "esp": 50, "ah": 51, "icmpv6": 58, "ipv6-icmp": 58, "ospf": 89, "sctp": 132}
+_FW_PORTS = {
+    "ftp-data": 20, "ftp": 21, "ssh": 22, "telnet": 23, "smtp": 25, "domain": 53, "dns": 53, "tftp": 69, "www": 80, "http": 80,
+    "pop3": 110, "ntp": 123, "imap": 143, "snmp": 161, "snmptrap": 162, "bgp": 179, "ldap": 389, "https": 443, "syslog": 514,
+}
+_FW_ALL = (0, (1 << 128) - 1)
+_FW_V4_BASE = 0xFFFF << 32
+
+def _fw_prefix(first, last):
+    """Prefix length of an aligned span in the unified 128-bit space."""
+    return 128 - (last - first + 1).bit_length() + 1
+
+def _fw_addr(text):
+    """Parses a CIDR/IP/'any' into an inclusive span of the unified IPv6 space (IPv4 is mapped into ::ffff:0:0/96)."""
+    if text in ("any", "*"):
+        return _FW_ALL
+    addr, _, plen = text.partition("/")
+    version, value = _ip_to_int(addr)
+    bits = 32 if version == 4 else 128
+    plen = int(plen) if plen else bits
+    if not 0 <= plen <= bits:
+        raise ValueError(f"bad prefix /{plen}")
+    host = (1 << (bits - plen)) - 1
+    first = value & ~host
+    if version == 4:
+        return _FW_V4_BASE | first, _FW_V4_BASE | first | host
+    return first, first | host
+
+def _fw_wildcard(addr, wildcard):
+    """Cisco address + wildcard mask -> span; only contiguous (CIDR-shaped) wildcards are supported."""
+    host = int.from_bytes(socket.inet_pton(socket.AF_INET, wildcard), "big")
+    if host & (host + 1):
+        raise ValueError(f"non-contiguous wildcard {wildcard}")
+    value = int.from_bytes(socket.inet_pton(socket.AF_INET, addr), "big") & ~host
+    return _FW_V4_BASE | value, _FW_V4_BASE | value | host
+
+def _fw_port(text):
+    text = text.lower()
+    return _FW_PORTS[text] if text in _FW_PORTS else int(text)
+
+def _fw_port_range(text):
+    """'80', '80-90', '80:90', '1024:', 'any' -> inclusive port range."""
+    if text in ("any", "*", "all", "-1"):
+        return 0, 65535
+    lo, sep, hi = re.split(r"([:-])", text, maxsplit=1) if re.search(r"\w[:-]|^:", text) else (text, "", "")
+    lo = _fw_port(lo) if lo else 0
+    hi = (_fw_port(hi) if hi else 65535) if sep else lo
+    if not 0 <= lo <= hi <= 65535:
+        raise ValueError(f"bad port range {text}")
+    return lo, hi
+
+def _fw_proto(text):
+    text = text.lower()
+    if text in _FW_PROTOCOLS:
+        p = _FW_PROTOCOLS[text]
+    else:
+        p = int(text)
+    return (0, 255) if p is None else (p, p)
+
+def _fw_cisco_addr(tokens, i):
+    tok = tokens[i]
+    if tok in ("any", "any4", "any6"):
+        return _FW_ALL if tok == "any" else (_fw_addr("0.0.0.0/0") if tok == "any4" else _fw_addr("::/0")), i + 1
+    if tok == "host":
+        return _fw_addr(tokens[i + 1]), i + 2
+    if "/" in tok or ":" in tok:
+        return _fw_addr(tok), i + 1
+    nxt = tokens[i + 1] if i + 1 < len(tokens) else ""
+    if re.fullmatch(r"\d+\.\d+\.\d+\.\d+", nxt):
+        # A dotted token after an address is a wildcard when it looks like one
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET, nxt), "big")
+        if value & (value + 1) == 0 or nxt.startswith("0."):
+            return _fw_wildcard(tok, nxt), i + 2
+    return _fw_addr(tok), i + 1
+
+def _fw_cisco_ports(tokens, i, bare=False):
+    if i >= len(tokens):
+        return (0, 65535), i
+    op = tokens[i]
+    if op == "eq":
+        return (_fw_port(tokens[i + 1]),) * 2, i + 2
+    if op == "range":
+        return (_fw_port(tokens[i + 1]), _fw_port(tokens[i + 2])), i + 3
+    if op == "gt":
+        return (_fw_port(tokens[i + 1]) + 1, 65535), i + 2
+    if op == "lt":
+        return (0, _fw_port(tokens[i + 1]) - 1), i + 2
+    if op == "neq":
+        raise ValueError("'neq' port operator is not supported")
+    if bare and re.fullmatch(r"\d+(?:[:-]\d*)?|any", op):
+        # Trailing bare port/range of the generic "action proto src dst ports" form
+        return _fw_port_range(op), i + 1
+    return (0, 65535), i
+
+_FW_IPT_OPTS = {
+    "-A", "--append", "-I", "--insert", "-t", "--table", "-j", "--jump", "-m", "--match", "--comment",
+    "-p", "--protocol", "-s", "--source", "-d", "--destination",
+    "--sport", "--source-port", "--dport", "--destination-port",
+}
+
+def _parse_fw_rule(line):
+    """Parses one Cisco ACL, iptables or generic/security-group rule into (group, action, box)."""
+    tokens = line.split()
+    if tokens[0].lower() in ("-a", "-i", "iptables", "ip6tables"):
+        opts, i = {}, 0
+        while i < len(tokens):
+            if tokens[i] == "!":
+                raise ValueError("negated matches are not supported")
+            if tokens[i].startswith("-") and i + 1 < len(tokens):
+                opts[tokens[i]] = tokens[i + 1]
+                i += 2
+            else:
+                i += 1
+        target = opts.get("-j", opts.get("--jump", "")).lower()
+        if target not in _FW_ACTIONS:
+            raise ValueError(f"unsupported target '{target or '-'}'")
+        if "--dports" in opts or "--sports" in opts:
+            raise ValueError("multiport matches are not supported")
+        # Interface, state, ICMP-type etc. narrow a rule in ways the box model
+        # cannot express, so treating them as "any" would invent shadowing.
+        unknown = [k for k in opts if k not in _FW_IPT_OPTS]
+        if unknown:
+            raise ValueError(f"unsupported match option '{unknown[0]}'")
+        if opts.get("-m", opts.get("--match", "tcp")).lower() not in ("tcp", "udp", "comment"):
+            raise ValueError(f"unsupported match module '{opts.get('-m', opts.get('--match'))}'")
+        group = opts.get("-A") or opts.get("--append") or opts.get("-I") or opts.get("--insert") or ""
+        proto = _fw_proto(opts.get("-p", opts.get("--protocol", "all")))
+        src = _fw_addr(opts.get("-s", opts.get("--source", "any")))
+        dst = _fw_addr(opts.get("-d", opts.get("--destination", "any")))
+        sport = _fw_port_range(opts.get("--sport", opts.get("--source-port", "any")))
+        dport = _fw_port_range(opts.get("--dport", opts.get("--destination-port", "any")))
+        return group, _FW_ACTIONS[target], (*proto, *src, *dst, *sport, *dport)
+
+    # Cisco "[access-list NAME] [seq] permit|deny proto src [ports] dst [ports] [log]"
+    # and generic/security-group "allow,tcp,0.0.0.0/0,10.0.0.0/24,443" share one layout
+    low = [t for t in re.split(r"[\s,]+|->", line.lower()) if t]
+    act = next((i for i, t in enumerate(low) if t in _FW_ACTIONS), None)
+    if act is None:
+        raise ValueError("unrecognised rule format")
+    group = low[1] if low[0] == "access-list" and act > 1 else ""
+    proto = _fw_proto(low[act + 1])
+    src, i = _fw_cisco_addr(low, act + 2)
+    sport, i = _fw_cisco_ports(low, i) if proto in ((6, 6), (17, 17)) else ((0, 65535), i)
+    dst, i = _fw_cisco_addr(low, i)
+    dport, i = _fw_cisco_ports(low, i, bare=True) if proto in ((6, 6), (17, 17)) else ((0, 65535), i)
+    return group, _FW_ACTIONS[low[act]], (*proto, *src, *dst, *sport, *dport)
+
+def _box_intersects(a, b):
+    return (a[0] <= b[1] and b[0] <= a[1] and a[2] <= b[3] and b[2] <= a[3] and a[4] <= b[5] and b[4] <= a[5]
+            and a[6] <= b[7] and b[6] <= a[7] and a[8] <= b[9] and b[8] <= a[9])
+
+def _box_volume(a, b=None):
+    """Number of points in box a (or in the intersection of a and b)."""
+    if b is None:
+        return (a[1] - a[0] + 1) * (a[3] - a[2] + 1) * (a[5] - a[4] + 1) * (a[7] - a[6] + 1) * (a[9] - a[8] + 1)
+    vol = 1
+    for k in range(0, 10, 2):
+        vol *= (a[k + 1] if a[k + 1] < b[k + 1] else b[k + 1]) - (a[k] if a[k] > b[k] else b[k]) + 1
+    return vol
+
+def _box_subtract(a, b):
+    """Returns the pieces of box a not covered by box b (at most 2 per dimension)."""
+    if not _box_intersects(a, b):
+        return [a]
+    out, cur = [], list(a)
+    for k in range(0, 10, 2):
+        if cur[k] < b[k]:
+            piece = cur.copy()
+            piece[k + 1] = b[k] - 1
+            out.append(tuple(piece))
+            cur[k] = b[k]
+        if cur[k + 1] > b[k + 1]:
+            piece = cur.copy()
+            piece[k] = b[k + 1] + 1
+            out.append(tuple(piece))
+            cur[k + 1] = b[k + 1]
+    return out
+
+def _boxes_cover(box, cuts, max_pieces):
+    """True if the union of cuts covers box (None if it fragments past max_pieces)."""
+    # Union coverage is order independent: a single containing box or a
+    # volume bound settles most cases cheaply, and cutting widest boxes
+    # first keeps fragments few.
+    for c in cuts:
+        if (c[0] <= box[0] and box[1] <= c[1] and c[2] <= box[2] and box[3] <= c[3] and c[4] <= box[4]
+                and box[5] <= c[5] and c[6] <= box[6] and box[7] <= c[7] and c[8] <= box[8] and box[9] <= c[9]):
+            return True
+    need, total = _box_volume(box), 0
+    for c in cuts:
+        total += _box_volume(box, c)
+        if total >= need:
+            break
+    else:
+        return False
+    residual = [box]
+    for cut in sorted(cuts, key=_box_volume, reverse=True):
+        residual = [q for p in residual for q in _box_subtract(p, cut)]
+        if not residual:
+            return True
+        if len(residual) > max_pieces:
+            return None
+    return False
+
+def _first_match_takers(box, cuts, max_pieces):
+    """Indexes of the cuts that take part of box under first-match order (None if it fragments past max_pieces)."""
+    takers, residual = [], [box]
+    for k, cut in enumerate(cuts):
+        if not any(_box_intersects(p, cut) for p in residual):
+            continue
+        takers.append(k)
+        residual = [q for p in residual for q in _box_subtract(p, cut)]
+        if not residual:
+            break
+        if len(residual) > max_pieces:
+            return None
+    return takers
+
+class _PrefixIndex:
+    """Finds rules whose address span overlaps a query span.
+
+    CIDR spans are nested or disjoint, so overlapping spans are either
+    ancestors (one dict probe per distinct prefix length) or descendants
+    (one bisect range per distinct prefix length) of the query.
+    """
+
+    def __init__(self, spans):
+        by_len = {}
+        for rid, (first, last) in enumerate(spans):
+            by_len.setdefault(_fw_prefix(first, last), []).append((first, rid))
+        self.exact = {}
+        self.sorted = {}
+        for plen, items in by_len.items():
+            items.sort()
+            self.sorted[plen] = ([f for f, _ in items], [r for _, r in items])
+            for first, rid in items:
+                self.exact.setdefault((plen, first), []).append(rid)
+        self.lengths = sorted(by_len)
+
+    def _slices(self, first, last):
+        plen = _fw_prefix(first, last)
+        for length in self.lengths:
+            if length < plen:
+                rids = self.exact.get((length, first & ~((1 << (128 - length)) - 1)), ())
+                yield rids, 0, len(rids)
+            else:
+                starts, rids = self.sorted[length]
+                yield rids, bisect.bisect_left(starts, first), bisect.bisect_right(starts, last)
+
+    def count(self, first, last):
+        return sum(hi - lo for _, lo, hi in self._slices(first, last))
+
+    def overlapping(self, first, last):
+        out = []
+        for rids, lo, hi in self._slices(first, last):
+            out.extend(rids[lo:hi])
+        return out
+
+def analyze_firewall_rules(rules_text, default_action="deny", max_pieces=4096, limit=2000):
+    """Finds shadowed, redundant and conflicting rules in an ordered first-match rule set and proposes a reduced equivalent set."""
+    try:
+        rules, invalid = [], []
+        for line_no, line in enumerate((rules_text or "").splitlines(), 1):
+            text = line.strip()
+            if not text or text.startswith(("#", "!", "remark")) or " remark " in f" {text.lower()} ":
+                continue
+            try:
+                group, action, box = _parse_fw_rule(text)
+            except (IndexError, KeyError, OSError, ValueError) as err:
+                invalid.append({"line": line_no, "text": text, "reason": str(err) or "incomplete rule"})
+                continue
+            rules.append({"line": line_no, "text": text, "group": group, "action": action, "box": box})
+        if not rules:
+            return {"error": "No parsable rules found"}
+
+        findings, removed = [], set()
+        for group in dict.fromkeys(r["group"] for r in rules):
+            members = [r for r in rules if r["group"] == group]
+            boxes = [r["box"] for r in members]
+            src_index = _PrefixIndex([(b[2], b[3]) for b in boxes])
+            dst_index = _PrefixIndex([(b[4], b[5]) for b in boxes])
+
+            # 128-bit bounds are rank-compressed to int64 so candidate
+            # filtering can be vectorized; ranks preserve every overlap.
+            packed = None
+            if np is not None:
+                coords = sorted({v for b in boxes for v in (b[2], b[3] + 1, b[4], b[5] + 1)})
+                rank = {v: r for r, v in enumerate(coords)}
+                packed = np.array([
+                    (b[0], b[1], rank[b[2]], rank[b[3] + 1] - 1, rank[b[4]], rank[b[5] + 1] - 1, b[6], b[7], b[8], b[9])
+                    for b in boxes
+                ], dtype=np.int64)
+
+            def overlapping(j):
+                """Indexes of all rules intersecting rule j, in rule order."""
+                box = boxes[j]
+                if src_index.count(box[2], box[3]) <= dst_index.count(box[4], box[5]):
+                    picked = src_index.overlapping(box[2], box[3])
+                else:
+                    picked = dst_index.overlapping(box[4], box[5])
+                if packed is None:
+                    return sorted(i for i in picked if i != j and _box_intersects(box, boxes[i]))
+                idx = np.array(picked, dtype=np.int64)
+                cand, q = packed[idx], packed[j]
+                keep = np.all((cand[:, 0::2] <= q[1::2]) & (q[0::2] <= cand[:, 1::2]), axis=1) & (idx != j)
+                return np.sort(idx[keep]).tolist()
+
+            # Pass 1: compare each rule with the earlier rules it intersects
+            covered, later_of = set(), {}
+            for j, rule in enumerate(members):
+                hits = overlapping(j)
+                split = bisect.bisect_left(hits, j)
+                earlier, later_of[j] = hits[:split], hits[split:]
+                if not earlier:
+                    continue
+                other = [i for i in earlier if members[i]["action"] != rule["action"]]
+                full = _boxes_cover(boxes[j], [boxes[i] for i in earlier], max_pieces)
+                if full:
+                    # Only the earlier rules that actually take some of its
+                    # traffic count; an opposite rule whose overlap is already
+                    # consumed by same-action rules hides nothing.
+                    covered.add(j)
+                    takers = _first_match_takers(boxes[j], [boxes[i] for i in earlier], max_pieces)
+                    if takers is not None:
+                        by = [earlier[k] for k in takers]
+                    else:
+                        same = [i for i in earlier if i not in other]
+                        by = same if _boxes_cover(boxes[j], [boxes[i] for i in same], max_pieces) else earlier
+                    hiding = [i for i in by if members[i]["action"] != rule["action"]]
+                    findings.append({
+                        "line": rule["line"], "text": rule["text"],
+                        "type": "shadowed" if hiding else "redundant",
+                        "by": [members[i]["line"] for i in (hiding or by)],
+                        "detail": "never matches; earlier rules with the opposite action take its traffic" if hiding else "never matches; fully covered by earlier rules with the same action",
+                    })
+                elif other:
+                    # A broader rule below narrower opposite rules is the usual
+                    # "exceptions first" layout; only partial overlaps are conflicts.
+                    general = all(not _box_subtract(boxes[i], boxes[j]) for i in other)
+                    findings.append({
+                        "line": rule["line"], "text": rule["text"], "type": "generalization" if general else "conflict",
+                        "by": [members[i]["line"] for i in other],
+                        "detail": ("superset of earlier exceptions with the opposite action" if general else "partially overlaps earlier rules with the opposite action; result depends on order")
+                        + ("" if full is False else " (overlap too fragmented to resolve exactly)"),
+                    })
+
+            # Pass 2: rules whose traffic would fall through to the same decision
+            # anyway. Checked last-to-first against the rules still kept, so that
+            # removing several of them together stays equivalent.
+            alive = set(range(len(members))) - covered
+            for j in sorted(alive, reverse=True):
+                rule = members[j]
+                same = []
+                for i in later_of[j]:
+                    if i not in alive:
+                        continue
+                    if members[i]["action"] != rule["action"]:
+                        break
+                    same.append(i)
+                else:
+                    if rule["action"] == default_action or _boxes_cover(boxes[j], [boxes[i] for i in same], max_pieces):
+                        alive.discard(j)
+                        findings.append({
+                            "line": rule["line"], "text": rule["text"], "type": "redundant",
+                            "by": [members[i]["line"] for i in same] or ["default"],
+                            "detail": "removable; its traffic gets the same decision from " + ("later rules" if same else f"the default {default_action}"),
+                        })
+            removed.update(members[j]["line"] for j in range(len(members)) if j not in alive)
+
+        findings.sort(key=lambda f: f["line"])
+        counts = {t: sum(1 for f in findings if f["type"] == t) for t in ("shadowed", "redundant", "conflict", "generalization")}
+        return {
+            "rules": len(rules),
+            "groups": len({r["group"] for r in rules}),
+            "invalid": invalid,
+            "counts": counts,
+            "findings": findings[:limit],
+            "truncated": len(findings) > limit,
+            "minimal": [r["text"] for r in rules if r["line"] not in removed],
+            "removed": len(removed),
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
 def calculate_mss(mtu_str, tunnel_type):
     try:
         mtu = int(mtu_str)
@@ -812,6 +4610,638 @@ def calculate_throughput(latency_ms, window_kb):
     except:
         return 0
 
+def _erlang_c(load, servers):
+    """Probability an arrival waits in M/M/c for offered load(s) in Erlangs (scalar or NumPy array).
+
+    Uses the Erlang B recursion B(k) = a*B(k-1) / (k + a*B(k-1)), which never forms a^c or c!, so it
+    stays finite for thousands of servers; with an array of loads each step is one vector operation.
+    """
+    b = load * 0 + 1.0
+    for k in range(1, servers + 1):
+        b = load * b / (k + load * b)
+    rho = load / servers
+    return b / (1 - rho * (1 - b))
+
+def _queue_metrics(load, servers, service_s, model, quantile):
+    """Mean/quantile wait and queue length for offered load(s) below `servers` (scalars or arrays)."""
+    vector = np is not None and isinstance(load, np.ndarray)
+    log = np.log if vector else math.log
+    rho = load / servers
+    wait_prob = _erlang_c(load, servers)
+    drain = servers / service_s - load / service_s  # c*mu - lambda
+    mean_wait = wait_prob / drain
+    tail = 1 - quantile
+    if model == "M/D/c":
+        # Cosmetatos: M/D/c wait is about half the M/M/c wait, corrected for c and rho; the tail keeps
+        # the exponential shape with the conditional mean scaled by the same factor.
+        factor = 0.5 * (1 + (1 - rho) * (servers - 1) * ((4 + 5 * servers) ** 0.5 - 2) / (16 * rho * servers))
+        mean_wait = mean_wait * factor
+        drain = drain / factor
+    # P(W > t) = C * exp(-drain * t)
+    if vector:
+        q_wait = np.where(wait_prob > tail, log(np.maximum(wait_prob, tail) / tail) / drain, 0.0)
+    else:
+        q_wait = log(wait_prob / tail) / drain if wait_prob > tail else 0.0
+    arrival = load / service_s
+    return {
+        "utilization": rho,
+        "wait_probability": wait_prob,
+        "mean_wait": mean_wait,
+        "quantile_wait": q_wait,
+        "mean_response": mean_wait + service_s,
+        "queue_length": arrival * mean_wait,
+        "in_system": arrival * mean_wait + load,
+    }
+
+def calculate_queueing(arrival_rate, service_ms, servers, model="M/M/c", quantile=0.99, target_wait_ms=None,
+                       sweep_from=0.10, sweep_to=0.99, sweep_step=0.01, knee_factor=2.0):
+    """Erlang-C queueing for a worker pool: utilization, mean/p99 wait and queue length.
+
+    M/M/c is exact; M/D/c (constant service time) uses the Cosmetatos approximation. The sweep holds the
+    service time and server count and varies the arrival rate over the utilization range, vectorised with
+    NumPy when available. The knee is the first utilization whose mean response time reaches
+    knee_factor x the service time. With target_wait_ms, the smallest server count meeting it is reported (None, with
+    target_met False, when no count up to servers_searched does).
+    """
+    try:
+        lam = float(arrival_rate)
+        service_s = float(service_ms) / 1000
+        c = int(servers)
+        quantile = float(quantile)
+        if model not in ("M/M/c", "M/D/c"):
+            return {"error": "Model must be M/M/c or M/D/c"}
+        if lam < 0 or service_s <= 0 or c < 1:
+            return {"error": "Need arrival rate >= 0, service time > 0 and at least one server"}
+        if not 0 < quantile < 1:
+            return {"error": "Quantile must be between 0 and 1"}
+        load = lam * service_s
+        to_ms = lambda m: {k: v * 1000 if k in ("mean_wait", "quantile_wait", "mean_response") else v for k, v in m.items()}
+        result = {
+            "model": model,
+            "offered_load": load,
+            "utilization": load / c,
+            "stable": load < c,
+            "min_servers": math.floor(load) + 1,
+        }
+        if load >= c:
+            result["current"] = None
+        elif load == 0:
+            result["current"] = {"utilization": 0.0, "wait_probability": 0.0, "mean_wait": 0.0, "quantile_wait": 0.0,
+                                 "mean_response": service_s * 1000, "queue_length": 0.0, "in_system": 0.0}
+        else:
+            result["current"] = to_ms(_queue_metrics(load, c, service_s, model, quantile))
+
+        if target_wait_ms is not None:
+            target = float(target_wait_ms)
+            # wait falls monotonically with servers; a target still missed at 10x the stable
+            # minimum is reported as unmet rather than as the search cap
+            result["servers_for_target"], result["target_met"] = None, False
+            for n in range(result["min_servers"], 10 * result["min_servers"] + 10):
+                if load == 0 or _queue_metrics(load, n, service_s, model, quantile)["quantile_wait"] * 1000 <= target:
+                    result["servers_for_target"], result["target_met"] = n, True
+                    break
+            result["servers_searched"] = 10 * result["min_servers"] + 9
+
+        rhos = [round(sweep_from + i * sweep_step, 6) for i in range(int(round((sweep_to - sweep_from) / sweep_step)) + 1)]
+        if np is not None:
+            metrics = _queue_metrics(np.array(rhos) * c, c, service_s, model, quantile)
+            columns = {k: (v * 1000 if k in ("mean_wait", "quantile_wait", "mean_response") else v).tolist() for k, v in metrics.items()}
+            sweep = [{k: columns[k][i] for k in columns} for i in range(len(rhos))]
+        else:
+            sweep = [to_ms(_queue_metrics(r * c, c, service_s, model, quantile)) for r in rhos]
+        for rho, point in zip(rhos, sweep):
+            point["utilization"] = rho
+            point["arrival_rate"] = rho * c / service_s
+        result["sweep"] = sweep
+        knee = next((p for p in sweep if p["mean_response"] >= knee_factor * service_s * 1000), None)
+        result["knee"] = knee and {"utilization": knee["utilization"], "arrival_rate": knee["arrival_rate"],
+                                   "mean_response": knee["mean_response"]}
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram: fixed memory, values kept to `sig_figs` significant digits.
+
+    Values are recorded as integers in units of `resolution` (1 = one microsecond for ms input scaled by
+    1000). Each power-of-two range is split into the same number of linear sub-buckets, so the relative
+    error is bounded everywhere from 1 unit up to `highest`.
+    """
+
+    def __init__(self, highest=3_600_000_000, sig_figs=3):
+        self.sig_figs = min(5, max(1, int(sig_figs)))
+        self.highest = int(highest)
+        sub_count = 1 << math.ceil(math.log2(2 * 10 ** self.sig_figs))
+        self.half_magnitude = sub_count.bit_length() - 2  # log2(sub_count) - 1
+        self.half_count = sub_count >> 1
+        self.mask = sub_count - 1
+        buckets = 1
+        reach = sub_count
+        while reach <= self.highest:
+            reach <<= 1
+            buckets += 1
+        self.length = (buckets + 1) * self.half_count
+        self.vector = np is not None
+        self.counts = np.zeros(self.length, dtype=np.int64) if self.vector else [0] * self.length
+        self.total = 0
+        self.overflow = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+
+    def _index(self, value):
+        bucket = (value | self.mask).bit_length() - self.half_magnitude - 1
+        return ((bucket + 1) << self.half_magnitude) + (value >> bucket) - self.half_count
+
+    def value_at(self, index):
+        """Midpoint of the value range a counts index covers."""
+        bucket = (index >> self.half_magnitude) - 1
+        sub = (index & (self.half_count - 1)) + self.half_count
+        if bucket < 0:
+            sub -= self.half_count
+            bucket = 0
+        low = sub << bucket
+        return low + ((1 << bucket) - 1) / 2
+
+    def _count_list(self):
+        return self.counts.tolist() if self.vector else self.counts
+
+    def record(self, values):
+        """Records an iterable (or NumPy array) of non-negative integer values; larger than highest are clamped."""
+        if self.vector:
+            v = np.asarray(values, dtype=np.int64)
+            if not len(v):
+                return
+            over = v > self.highest
+            if over.any():
+                self.overflow += int(over.sum())
+                v = np.minimum(v, self.highest)
+            # frexp's exponent is the bit length for integers below 2**53
+            bucket = np.frexp((v | self.mask).astype(np.float64))[1] - self.half_magnitude - 1
+            idx = ((bucket + 1) << self.half_magnitude) + (v >> bucket) - self.half_count
+            self.counts += np.bincount(idx, minlength=self.length)
+            lo, hi = int(v.min()), int(v.max())
+            self.total += len(v)
+            self.sum += float(v.sum())
+        else:
+            lo = hi = None
+            for value in values:
+                value = int(value)
+                if value > self.highest:
+                    self.overflow += 1
+                    value = self.highest
+                self.counts[self._index(value)] += 1
+                self.total += 1
+                self.sum += value
+                lo = value if lo is None or value < lo else lo
+                hi = value if hi is None or value > hi else hi
+            if lo is None:
+                return
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def merge(self, other):
+        """Adds another histogram with the same layout into this one."""
+        if (other.length, other.half_magnitude) != (self.length, self.half_magnitude):
+            raise ValueError("histograms need the same highest value and significant digits to merge")
+        if self.vector:
+            self.counts += np.asarray(other.counts, dtype=np.int64)
+        else:
+            self.counts = [a + b for a, b in zip(self.counts, other._count_list())]
+        self.total += other.total
+        self.overflow += other.overflow
+        self.sum += other.sum
+        for attr, pick in (("min", min), ("max", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+
+    def percentiles(self, ps):
+        """Values at the given percentiles (0-100), in one cumulative pass."""
+        if not self.total:
+            return {p: None for p in ps}
+        targets = sorted((max(1, math.ceil(p / 100 * self.total)), p) for p in ps)
+        out, running, t = {}, 0, 0
+        for index, c in enumerate(self._count_list()):
+            if not c:
+                continue
+            running += c
+            while t < len(targets) and running >= targets[t][0]:
+                out[targets[t][1]] = min(self.value_at(index), self.max)
+                t += 1
+            if t == len(targets):
+                break
+        return out
+
+    def bins(self, count=40):
+        """Collapses the counts into `count` log-spaced bins between min and max for plotting."""
+        if not self.total:
+            return []
+        lo, hi = max(self.min, 1), max(self.max, 1)
+        edges = [lo * (hi / lo) ** (i / count) for i in range(count + 1)] if hi > lo else [lo, lo + 1]
+        out = [0] * (len(edges) - 1)
+        for index, c in enumerate(self._count_list()):
+            if c:
+                out[min(len(out) - 1, max(0, bisect.bisect_right(edges, self.value_at(index)) - 1))] += c
+        return [{"low": edges[i], "high": edges[i + 1], "count": c} for i, c in enumerate(out)]
+
+_LATENCY_SCALE = {"ns": 1e-3, "us": 1, "ms": 1e3, "s": 1e6}
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+def _latency_source_values(text=None, path=None, column=None, chunk_lines=200_000):
+    """Yields lists of floats from text or a (.gz) file: every number, or one whitespace/comma column per line."""
+    if path:
+        opener = gzip.open if path.endswith(".gz") else open
+        source = opener(path, "rt", encoding="utf-8", errors="replace")
+    else:
+        source = io.StringIO(text or "")
+    with source:
+        while True:
+            lines = list(itertools.islice(source, chunk_lines))
+            if not lines:
+                break
+            if column is None:
+                yield [float(x) for x in _NUMBER_RE.findall("".join(lines))]
+            else:
+                values = []
+                for line in lines:
+                    parts = re.split(r"[,\s]+", line.strip())
+                    try:
+                        values.append(float(parts[column]))
+                    except (IndexError, ValueError):
+                        continue
+                yield values
+
+def _latency_summary(hist, unit):
+    scale = _LATENCY_SCALE[unit]
+    levels = (50, 90, 99, 99.9, 99.99)
+    pct = hist.percentiles(levels)
+    conv = lambda v: None if v is None else v / scale
+    return {
+        "count": hist.total,
+        "min": conv(hist.min),
+        "mean": conv(hist.sum / hist.total) if hist.total else None,
+        "max": conv(hist.max),
+        "percentiles": {f"p{p:g}": conv(pct[p]) for p in levels},
+        "overflow": hist.overflow,
+    }
+
+def analyze_latencies(text=None, paths=None, baseline_text=None, baseline_paths=None, unit="ms", column=None,
+                      sig_figs=3, max_value_s=3600, bins=40):
+    """Streams latency samples into HDR histograms and reports p50/p90/p99/p99.9/max.
+
+    Every file gets its own histogram and they are merged into the total, so memory stays fixed however many
+    samples are read. With a baseline (before) set, both are summarised and the percentile deltas reported.
+    Values are in `unit` and resolved to the microsecond (nanosecond input keeps 1 us resolution).
+    """
+    try:
+        if unit not in _LATENCY_SCALE:
+            return {"error": f"Unit must be one of {', '.join(_LATENCY_SCALE)}"}
+        scale = _LATENCY_SCALE[unit]
+        highest = int(float(max_value_s) * 1e6)
+        started = time.perf_counter()
+
+        def build(text, paths):
+            total = LatencyHistogram(highest, sig_figs)
+            per_file, negative = [], 0
+            sources = [("text", None)] if text and text.strip() else []
+            for spec in ([paths] if isinstance(paths, str) else paths or []):
+                files = expand_log_paths(spec)
+                if not files:
+                    raise ValueError(f"No files match '{spec}'")
+                sources.extend((p, p) for p in files)
+            if not sources:
+                return None
+            for name, path in sources:
+                hist = LatencyHistogram(highest, sig_figs)
+                for chunk in _latency_source_values(text if path is None else None, path, column):
+                    if hist.vector:
+                        values = np.rint(np.asarray(chunk, dtype=np.float64) * scale)
+                        keep = values >= 0
+                        negative += int(len(values) - keep.sum())
+                        hist.record(values[keep].astype(np.int64))
+                    else:
+                        values = [round(v * scale) for v in chunk]
+                        kept = [v for v in values if v >= 0]
+                        negative += len(values) - len(kept)
+                        hist.record(kept)
+                total.merge(hist)
+                if path is not None:
+                    per_file.append(dict(_latency_summary(hist, unit), path=path))
+            summary = _latency_summary(total, unit)
+            summary.update(files=per_file, rejected=negative,
+                           bins=[{"low": b["low"] / scale, "high": b["high"] / scale, "count": b["count"]} for b in total.bins(bins)])
+            return summary
+
+        current = build(text, paths)
+        if current is None:
+            return {"error": "Provide latency samples as text or a file path/glob"}
+        if not current["count"]:
+            return {"error": "No numeric samples found"}
+        baseline = build(baseline_text, baseline_paths)
+        if baseline is not None and not baseline["count"]:
+            return {"error": "No numeric samples found in the baseline"}
+        result = {
+            "unit": unit,
+            "sig_figs": sig_figs,
+            "current": current,
+            "baseline": baseline,
+            "elapsed": time.perf_counter() - started,
+        }
+        if baseline:
+            result["delta"] = {
+                k: {"before": baseline["percentiles"][k], "after": v, "change": v - baseline["percentiles"][k],
+                    "ratio": v / baseline["percentiles"][k] if baseline["percentiles"][k] else None}
+                for k, v in current["percentiles"].items()
+            }
+        return result
+    except Exception as e:
+        return {"error": str(e)}
+
+_SPAN_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_SLO_TARGET_RE = re.compile(
+    r"^\s*(\d+(?:\.\d+)?)\s*%"
+    r"(?:\s*(?:of requests\s*)?(?:under|below|<=?|within)\s*(\d+(?:\.\d+)?)\s*(us|ms|s)\b)?"
+    r"\s*(?:over|in|per|/)\s*(\d+(?:\.\d+)?\s*[smhdw])\s*$", re.I)
+
+def _span_seconds(text):
+    """'90s', '1h', '3d', '30d' -> seconds."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*", str(text).lower())
+    if not m:
+        raise ValueError(f"Bad duration '{text}' (use e.g. 5m, 1h, 3d)")
+    return float(m.group(1)) * _SPAN_UNITS[m.group(2)]
+
+def parse_slo_target(text):
+    """'99.9% under 300 ms over 30d' -> objective, error budget, optional latency threshold (ms) and period (s)."""
+    m = _SLO_TARGET_RE.match(text or "")
+    if not m:
+        return {"error": "Target must look like '99.9% under 300 ms over 30d' or '99.95% over 28d'"}
+    # rounded so 99.9% gives a 0.001 budget rather than 0.000999...
+    objective = round(float(m.group(1)) / 100, 12)
+    if not 0 < objective < 1:
+        return {"error": "Objective must be between 0% and 100% (exclusive)"}
+    threshold = None
+    if m.group(2):
+        threshold = float(m.group(2)) * {"us": 1e-3, "ms": 1, "s": 1e3}[m.group(3).lower()]
+    return {"objective": objective, "budget": round(1 - objective, 12), "threshold_ms": threshold, "period_s": _span_seconds(m.group(4))}
+
+class _SlidingCounter:
+    """Event and bad-event totals over a trailing span, bucketed into `slots` time slots.
+
+    Each add() touches the newest slot and evicts expired ones from the left, so the cost is amortised
+    O(1) per event and memory is bounded by `slots`. Events older than the newest slot are counted in it.
+    """
+
+    def __init__(self, span_ns, slots=60):
+        self.width = max(1, int(span_ns) // slots)
+        self.slots = slots
+        self.ring = collections.deque()
+        self.total = 0
+        self.bad = 0
+
+    def add(self, ns, bad):
+        slot = ns // self.width
+        ring = self.ring
+        if ring and ring[-1][0] >= slot:
+            ring[-1][1] += 1
+            ring[-1][2] += bad
+        else:
+            ring.append([slot, 1, bad])
+            while ring[0][0] <= slot - self.slots:
+                _, total, dropped = ring.popleft()
+                self.total -= total
+                self.bad -= dropped
+        self.total += 1
+        self.bad += bad
+
+    def burn(self, budget):
+        return self.bad / self.total / budget if self.total else 0.0
+
+_SLO_COLUMNS = {
+    "timestamp": ("timestamp", "ts", "time", "date", "datetime", "@timestamp"),
+    "latency": ("latency", "latency_ms", "duration", "duration_ms", "elapsed", "response_time", "rt", "ms"),
+    "status": ("status", "status_code", "code", "http_status", "result"),
+}
+_SLO_BAD_WORDS = {"error", "err", "fail", "failed", "failure", "timeout", "false", "5xx"}
+
+def analyze_slo(text=None, path=None, target="99.9% under 300 ms over 30d", pattern=None, latency_unit="ms",
+                windows=(("1h", 14.4), ("6h", 6.0), ("3d", 1.0)), default_tz="UTC", eval_s=60, max_points=500):
+    """Replays a latency/status stream against an SLO and reports burn rates and the remaining error budget.
+
+    Input is CSV (timestamp,latency,status — a header row may name and reorder them) or, with `pattern`, any
+    log with named groups ts/latency/status (without ts the timestamp is found anywhere in the line). An event
+    is bad when its status is >= 500 or an error word, or its latency is over the target's threshold. Every
+    window is a _SlidingCounter; alert thresholds are evaluated every eval_s of stream time like a rule
+    engine would (once the stream covers the window), and firing episodes are reported so alerting
+    thresholds can be checked against real traffic. When the stream is shorter than the SLO period the
+    budget is scaled to the period's projected event count.
+    """
+    try:
+        slo = parse_slo_target(target)
+        if "error" in slo:
+            return slo
+        if latency_unit not in _LATENCY_SCALE:
+            return {"error": f"Latency unit must be one of {', '.join(_LATENCY_SCALE)}"}
+        if default_tz not in ("UTC", "Z", "") and default_tz not in pytz.all_timezones_set:
+            return {"error": f"Unknown timezone '{default_tz}'"}
+        windows = [(label, _span_seconds(label), float(limit)) for label, limit in windows]
+        rx = None
+        if pattern:
+            rx = re.compile(pattern)
+            if not {"latency", "status"} & set(rx.groupindex):
+                return {"error": "Pattern needs a named group (?P<latency>...) or (?P<status>...)"}
+        if path:
+            if not os.path.isfile(path):
+                return {"error": "Provide a path to a CSV or log file"}
+            opener = gzip.open if path.endswith(".gz") else open
+            source = opener(path, "rt", encoding="utf-8", errors="replace", newline="")
+        elif text and text.strip():
+            source = io.StringIO(text)
+        else:
+            return {"error": "Provide CSV/log text or a file path"}
+
+        budget = slo["budget"]
+        threshold = slo["threshold_ms"]
+        to_ms = _LATENCY_SCALE[latency_unit] / 1e3
+        started = time.perf_counter()
+        with source:
+            if rx is None:
+                rows = csv.reader(source)
+                first = next(rows, None)
+                if first is None:
+                    return {"error": "Input is empty"}
+                names = [c.strip().lower() for c in first]
+                cols = {key: next((names.index(a) for a in aliases if a in names), None) for key, aliases in _SLO_COLUMNS.items()}
+                if cols["timestamp"] is None:
+                    cols = {"timestamp": 0, "latency": 1, "status": 2}
+                    rows = itertools.chain([first], rows)
+
+                def fields():
+                    t, l, s = cols["timestamp"], cols["latency"], cols["status"]
+                    for row in rows:
+                        if len(row) <= t:
+                            yield None, None, None, row
+                            continue
+                        yield (row[t], row[l] if l is not None and l < len(row) else None,
+                               row[s] if s is not None and s < len(row) else None, row)
+            else:
+                has_ts = "ts" in rx.groupindex
+                groups = rx.groupindex
+
+                def fields():
+                    for line in source:
+                        m = rx.search(line)
+                        if m is None:
+                            yield None, None, None, line
+                            continue
+                        yield (m.group("ts") if has_ts else line,
+                               m.group("latency") if "latency" in groups else None,
+                               m.group("status") if "status" in groups else None, line)
+
+            stream = fields()
+            head = list(itertools.islice(stream, 200))
+            fmt, _ = detect_timestamp_format([ts for ts, _, _, _ in head if ts])
+            if fmt is None:
+                return {"error": "No known timestamp format found in the first rows"}
+            parse = _ts_parser(fmt, default_tz)
+
+            counters = [_SlidingCounter(span * 1e9) for _, span, _ in windows]
+            period = _SlidingCounter(slo["period_s"] * 1e9, slots=720)
+            state = [{"max": 0.0, "max_at": None, "firing": None, "episodes": [], "firing_ns": 0} for _ in windows]
+            eval_ns = int(eval_s * 1e9)
+            step_ns = eval_ns * 5
+            series = []
+            events = bad_events = slow = errors = skipped = 0
+            first_ns = last_ns = next_eval = next_point = None
+            exhausted_at = None
+            skipped_samples = []
+
+            def allowed_now(now):
+                return budget * period.total * slo["period_s"] / min(slo["period_s"], max(eval_s, (now - first_ns) / 1e9))
+
+            def evaluate(now):
+                nonlocal exhausted_at
+                for (label, span, limit), counter, st in zip(windows, counters, state):
+                    if now - first_ns < span * 1e9:
+                        continue
+                    burn = counter.burn(budget)
+                    if burn > st["max"]:
+                        st["max"], st["max_at"] = burn, now
+                    if burn >= limit and st["firing"] is None:
+                        st["firing"] = [now, burn]
+                    elif st["firing"] is not None:
+                        if burn >= limit:
+                            st["firing"][1] = max(st["firing"][1], burn)
+                        else:
+                            st["episodes"].append({"start": st["firing"][0], "end": now, "peak": st["firing"][1]})
+                            st["firing_ns"] += now - st["firing"][0]
+                            st["firing"] = None
+                if exhausted_at is None and period.bad > allowed_now(now):
+                    exhausted_at = now
+
+            for ts, latency, status, raw in itertools.chain(head, stream):
+                hit = parse(ts) if ts else None
+                if hit is None:
+                    skipped += 1
+                    if len(skipped_samples) < 10:
+                        skipped_samples.append(raw if isinstance(raw, str) else ",".join(raw))
+                    continue
+                ns = hit[2]
+                is_bad = False
+                if status:
+                    status = status.strip()
+                    if status.isdigit():
+                        is_bad = int(status) >= 500
+                    else:
+                        is_bad = status.lower() in _SLO_BAD_WORDS
+                    errors += is_bad
+                if threshold is not None and latency and not is_bad:
+                    try:
+                        if float(latency) * to_ms > threshold:
+                            is_bad = True
+                            slow += 1
+                    except ValueError:
+                        pass
+                if next_eval is None:
+                    first_ns = ns
+                    next_eval = ns - ns % eval_ns + eval_ns
+                    next_point = ns - ns % step_ns + step_ns
+                elif ns >= next_eval:
+                    # the rule engine runs on the data seen up to each tick
+                    evaluate(next_eval)
+                    next_eval = ns - ns % eval_ns + eval_ns
+                    if ns >= next_point:
+                        series.append({"ns": next_point, **{label: c.burn(budget) for (label, _, _), c in zip(windows, counters)},
+                                       "budget": 1 - period.bad / allowed_now(ns)})
+                        next_point = ns - ns % step_ns + step_ns
+                        if len(series) > max_points:
+                            series = series[1::2]
+                            step_ns *= 2
+                bad = 1 if is_bad else 0
+                for c in counters:
+                    c.add(ns, bad)
+                period.add(ns, bad)
+                events += 1
+                bad_events += bad
+                last_ns = ns if last_ns is None or ns > last_ns else last_ns
+        if not events:
+            return {"error": "No rows with a readable timestamp"}
+        evaluate(last_ns)
+
+        iso = lambda ns: None if ns is None else datetime.datetime.fromtimestamp(ns / 1e9, tz=datetime.timezone.utc).isoformat()
+        allowed = allowed_now(last_ns)
+        remaining = 1 - period.bad / allowed if allowed else 1.0
+        report = []
+        for (label, span, limit), counter, st in zip(windows, counters, state):
+            burn = counter.burn(budget)
+            if st["firing"] is not None:
+                st["episodes"].append({"start": st["firing"][0], "end": None, "peak": st["firing"][1]})
+                st["firing_ns"] += last_ns - st["firing"][0]
+            # at this window's burn rate the budget drains period / burn seconds per 100%
+            exhausts_in = remaining * slo["period_s"] / burn if burn > 0 and remaining > 0 else None
+            report.append({
+                "window": label,
+                "threshold": limit,
+                "covered": last_ns - first_ns >= span * 1e9,
+                "burn": burn,
+                "events": counter.total,
+                "bad": counter.bad,
+                "max_burn": st["max"],
+                "max_at": iso(st["max_at"]),
+                "firing": st["firing"] is not None,
+                "firing_s": st["firing_ns"] / 1e9,
+                "episodes": [{"start": iso(e["start"]), "end": iso(e["end"]), "peak": e["peak"]} for e in st["episodes"]],
+                "exhausts_in_s": exhausts_in,
+                "exhausts_at": iso(last_ns + exhausts_in * 1e9) if exhausts_in is not None else None,
+            })
+        span_s = (last_ns - first_ns) / 1e9
+        return {
+            "slo": slo,
+            "format": fmt,
+            "events": events,
+            "bad": bad_events,
+            "errors": errors,
+            "slow": slow,
+            "skipped": skipped,
+            "skipped_samples": skipped_samples,
+            "start": iso(first_ns),
+            "end": iso(last_ns),
+            "span_s": span_s,
+            "budget": {
+                "events": period.total,
+                "allowed": allowed,
+                "consumed": period.bad,
+                "remaining": remaining,
+                "exhausted_at": iso(exhausted_at),
+                "coverage": min(1.0, span_s / slo["period_s"]),
+            },
+            "windows": report,
+            "series": [{"time": iso(p.pop("ns")), **p} for p in series],
+            "step_s": step_ns / 1e9,
+            "elapsed": time.perf_counter() - started,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
 def simulate_iam_policy(policy_json, action, resource):
     """Simulates a basic IAM policy evaluation (Allow/Deny with wildcards)."""
     import fnmatch